@@ -1,5 +1,22 @@
+from . import dependencies, instrument_types, constants, functions, aio, models, registry, discovery, monitor
 from .dependencies import *
-from .models import *
 from .instrument_types import *
 from .constants import *
-from .functions import *
\ No newline at end of file
+from .functions import *
+from .aio import *
+from .registry import *
+from .discovery import *
+from .monitor import *
+
+# model classes are not imported here but at their first access, see models
+__all__ = [i for i in globals() if not i.startswith('_')] + models.__all__
+
+
+def __getattr__(name):
+    if name in models.__all__:
+        return getattr(models, name)
+    raise AttributeError('module %r has no attribute %r' % (__name__, name))
+
+
+def __dir__():
+    return sorted(set(globals()) | set(models.__all__))
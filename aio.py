@@ -0,0 +1,131 @@
+"""
+asyncio front-end of instrument models.
+"""
+import asyncio
+import functools
+import inspect
+import threading
+import weakref
+from .models._VisaInstrument import SessionLock
+
+__all__ = ['AsyncInstrument']
+
+# locks of non-visa instruments, resource_name => lock
+_locks = {}
+_locks_lock = threading.Lock()
+# asyncio locks of sessions in each event loop, loop => {session lock: asyncio.Lock}, both weak so that the locks of
+# closed loops and sessions are dropped
+_async_locks = weakref.WeakKeyDictionary()
+# methods bound to the calling thread, such as write_query, which keeps the session locked by its thread until the
+# reply is read. They can not run one at a time in executor threads, use run_blocking for the whole sequence instead.
+_thread_bound_methods = frozenset(['write_query', 'read', 'read_binary', 'locked', 'batch'])
+
+
+def _get_session_lock(instrument):
+    """
+    Get the lock which serializes the access to the session of an instrument.
+    Visa instruments use the lock of their shared session, others share a lock per resource name.
+    """
+    session = getattr(instrument, 'session', None)
+    if session is not None:
+        return session.lock
+    with _locks_lock:
+        return _locks.setdefault(instrument.resource_name, SessionLock())
+
+
+def _get_async_lock(lock):
+    """
+    Get the asyncio lock of a session lock in the running event loop. Calls to the same session wait for it in the
+    loop, so that they do not hold executor threads while waiting for the session lock.
+    """
+    loop = asyncio.get_running_loop()
+    with _locks_lock:
+        locks = _async_locks.get(loop)
+        if locks is None:
+            locks = _async_locks[loop] = weakref.WeakKeyDictionary()
+        if lock not in locks:
+            locks[lock] = asyncio.Lock()
+        return locks[lock]
+
+
+class AsyncInstrument(object):
+    """
+    asyncio facade of a model object, such as:
+
+        opm = AsyncInstrument(ModelN7744A('GPIB0::20::INSTR', 1))
+        power = await opm.get_dbm_value()
+        idn = await opm.idn
+
+    Methods of the model are exposed as coroutine functions, and properties as awaitables. The blocking call runs
+    in an executor thread, so the event loop is not blocked. Calls to the same session (same resource name) are
+    serialized in the event loop before they are submitted to the executor, while calls to independent instruments
+    run concurrently.
+    Plain data attributes are returned directly.
+    Methods bound to the calling thread (write_query, read, read_binary, locked, batch) are not exposed, as each call
+    may run in another executor thread. Run the whole sequence in one call instead, such as:
+
+        inst = opm.instrument
+        idn = await opm.run_blocking(lambda: (inst.write_query('*IDN?'), inst.read())[1])
+    """
+
+    def __init__(self, instrument, executor=None):
+        """
+        :param instrument: (BaseInstrument) model object
+        :param executor: (concurrent.futures.Executor) executor to run blocking calls, default executor of the loop if None
+        """
+        self.__inst = instrument
+        self.__executor = executor
+        self.__lock = _get_session_lock(instrument)
+
+    @property
+    def instrument(self):
+        """
+        The wrapped (blocking) model object.
+        """
+        return self.__inst
+
+    def __getattr__(self, name):
+        if name.startswith('_AsyncInstrument__'):
+            raise AttributeError(name)
+        if name in _thread_bound_methods:
+            raise AttributeError('{name!r} is bound to the calling thread, call it in run_blocking instead'.format(
+                name=name))
+        static_attr = inspect.getattr_static(self.__inst, name)
+        if isinstance(static_attr, property):
+            return self.run_blocking(getattr, self.__inst, name)
+        attr = getattr(self.__inst, name)
+        if not callable(attr):
+            return attr
+
+        @functools.wraps(attr)
+        async def method(*args, **kwargs):
+            return await self.run_blocking(attr, *args, **kwargs)
+        # cache the coroutine function for later calls
+        self.__dict__[name] = method
+        return method
+
+    def __dir__(self):
+        return sorted(set(super(AsyncInstrument, self).__dir__()) | (set(dir(self.__inst)) - _thread_bound_methods))
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.run_blocking(self.__inst.close)
+
+    async def run_blocking(self, func, *args, **kwargs):
+        """
+        Run a blocking call in the executor while holding the session lock of the instrument.
+        Useful to run a sequence of calls atomically, such as: await ainst.run_blocking(lambda: (inst.command(a), inst.read()))
+        :param func: (callable) blocking function
+        :return: return value of func
+        """
+        loop = asyncio.get_running_loop()
+        call = functools.partial(self.__call_locked, func, args, kwargs)
+        async with _get_async_lock(self.__lock):
+            return await loop.run_in_executor(self.__executor, call)
+
+    def __call_locked(self, func, args, kwargs):
+        # the session lock is still needed against blocking calls from other threads
+        with self.__lock:
+            return func(*args, **kwargs)
@@ -0,0 +1,4 @@
+"""
+Host side analysis of data acquired from instruments.
+"""
+from . import spectrum
@@ -0,0 +1,273 @@
+"""
+Vectorized analysis of optical spectrum traces on the host, for traces of any TypeOSA model (such as
+ModelAQ6370.get_trace). One sweep can feed many analyses without round trips to the instrument, and traces can be
+analysed in parallel in a process pool with analyze_traces.
+
+x is a monotonically increasing axis of the trace, in any unit (such as wavelength in nm or m, frequency in THz), and
+all the widths, offsets and bandwidths in parameters are in the same unit. y is the level in dBm.
+"""
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+import numpy as np
+from ..constants import LIGHT_SPEED
+
+__all__ = ['find_peaks', 'channel_power', 'osnr', 'smsr', 'bandwidth', 'itu_channels', 'analyze_wdm',
+           'analyze_traces']
+
+ITU_ANCHOR = 193.1  # anchor frequency of ITU-T G.694.1 DWDM grid in THz
+
+
+def _check_trace(x, y):
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    if x.ndim != 1 or x.shape != y.shape:
+        raise ValueError('x and y should be 1-D arrays of the same length')
+    if len(x) < 3:
+        raise ValueError('trace should have at least 3 sampling points')
+    return x, y
+
+
+def _to_linear(y):
+    return 10**(y/10)
+
+
+def _to_dbm(linear):
+    with np.errstate(divide='ignore'):
+        return 10*np.log10(linear)
+
+
+def find_peaks(x, y, threshold=-50.0, mdiff=3.0, min_distance=None):
+    """
+    Find peaks of trace. A peak is a local maximum above threshold, which is at least mdiff dB above the valleys
+    to the neighbouring peaks (the same as the mode difference of instrument analysis). Of two peaks separated by a
+    shallower valley, the lower one is dropped.
+    :param x: (numpy.ndarray) x axis of trace
+    :param y: (numpy.ndarray) level in dBm
+    :param threshold: (float) minimum peak level in dBm
+    :param mdiff: (float) minimum level difference in dB between a peak and the valleys around it
+    :param min_distance: (float|None) minimum distance between peaks in x unit, the lower one of two close peaks is
+        dropped
+    :return: (numpy.ndarray) indexes of peaks in ascending order
+    """
+    x, y = _check_trace(x, y)
+    inner = y[1:-1]
+    peaks = np.flatnonzero((inner > y[:-2]) & (inner >= y[2:]) & (inner >= threshold)) + 1
+    # drop peaks on shallow valleys pass by pass, as dropping a peak merges the valleys around it
+    while len(peaks) > 1:
+        # valleys[i]: minimum level between peaks[i] and peaks[i+1]
+        valleys = np.minimum.reduceat(y, peaks)[:-1]
+        levels = y[peaks]
+        left = np.concatenate(([y[:peaks[0]].min()], valleys))
+        right = np.concatenate((valleys, [y[peaks[-1]:].min()]))
+        higher = np.maximum(left, right)
+        # the limiting valley is shared with the neighbouring peak on the higher valley side, or with the trace edge
+        index = np.arange(len(peaks))
+        neighbour = np.where(left >= right, index - 1, index + 1)
+        at_edge = (neighbour < 0) | (neighbour >= len(peaks))
+        neighbour = np.clip(neighbour, 0, len(peaks) - 1)
+        lower = (levels < levels[neighbour]) | ((levels == levels[neighbour]) & (neighbour < index))
+        drop = (levels - higher < mdiff) & (at_edge | lower)
+        if not drop.any():
+            break
+        peaks = peaks[~drop]
+    if len(peaks) == 1 and y[peaks[0]] - max(y[:peaks[0]].min(), y[peaks[0]:].min()) < mdiff:
+        peaks = peaks[:0]
+    if min_distance is not None and len(peaks) > 1:
+        keep = []
+        for i in peaks[np.argsort(-y[peaks], kind='stable')].tolist():
+            if all(abs(x[i] - x[j]) >= min_distance for j in keep):
+                keep.append(i)
+        peaks = np.sort(np.array(keep, dtype=peaks.dtype))
+    return peaks
+
+
+def channel_power(x, y, centers, width, resolution):
+    """
+    Integrate power of channels in windows.
+    :param x: (numpy.ndarray) x axis of trace
+    :param y: (numpy.ndarray) level in dBm
+    :param centers: (float|numpy.ndarray) center of each channel in x unit
+    :param width: (float|numpy.ndarray) width of the integration window of channels in x unit
+    :param resolution: (float) resolution bandwidth of trace in x unit
+    :return: (numpy.ndarray) power of each channel in dBm
+    """
+    x, y = _check_trace(x, y)
+    centers = np.atleast_1d(np.asarray(centers, dtype=float))
+    # power density integrated over the x span of each sampling point
+    density = _to_linear(y)*np.gradient(x)/resolution
+    cumulative = np.concatenate(([0.0], np.cumsum(density)))
+    start = np.searchsorted(x, centers - np.asarray(width)/2, side='left')
+    stop = np.searchsorted(x, centers + np.asarray(width)/2, side='right')
+    return _to_dbm(cumulative[stop] - cumulative[start])
+
+
+def osnr(x, y, centers, noise_offset, resolution, ref_bw=None, signal_levels=None):
+    """
+    Calculate OSNR of channels, with noise interpolated from the levels at both sides of channels.
+    :param x: (numpy.ndarray) x axis of trace
+    :param y: (numpy.ndarray) level in dBm
+    :param centers: (float|numpy.ndarray) center of each channel in x unit
+    :param noise_offset: (float) offset in x unit from the center to the noise measuring points
+    :param resolution: (float) resolution bandwidth of trace in x unit
+    :param ref_bw: (float|None) noise reference bandwidth in x unit (such as 0.1 nm), None for resolution
+    :param signal_levels: (numpy.ndarray|None) peak level of each channel in dBm, interpolated at centers if None
+    :return: (dict) {"osnr": dB, "signal": dBm, "noise": dBm in resolution} numpy.ndarray of each channel
+    """
+    x, y = _check_trace(x, y)
+    centers = np.atleast_1d(np.asarray(centers, dtype=float))
+    linear = _to_linear(y)
+    # linear interpolation between the noise at both sides
+    noise = (np.interp(centers - noise_offset, x, linear) + np.interp(centers + noise_offset, x, linear))/2
+    if signal_levels is None:
+        total = np.interp(centers, x, linear)
+    else:
+        total = _to_linear(np.asarray(signal_levels, dtype=float))
+    signal = np.maximum(total - noise, 0)
+    ref_bw = resolution if ref_bw is None else ref_bw
+    with np.errstate(divide='ignore'):
+        ratio = 10*np.log10(signal/(noise*ref_bw/resolution))
+    return {"osnr": ratio, "signal": _to_dbm(signal), "noise": _to_dbm(noise)}
+
+
+def smsr(x, y, peaks=None, mask=0.0, **kwargs):
+    """
+    Calculate side mode suppression ratio: level difference between the highest peak and the highest side mode.
+    :param x: (numpy.ndarray) x axis of trace
+    :param y: (numpy.ndarray) level in dBm
+    :param peaks: (numpy.ndarray|None) indexes of modes, found by find_peaks with kwargs if None
+    :param mask: (float) side modes within mask in x unit from the main mode are ignored
+    :return: (dict) {"smsr": dB, "peak_idx": int, "side_idx": int} of main mode and side mode, smsr is nan and
+        side_idx is None if there is no side mode
+    """
+    x, y = _check_trace(x, y)
+    if peaks is None:
+        peaks = find_peaks(x, y, **kwargs)
+    peaks = np.asarray(peaks, dtype=int)
+    if not len(peaks):
+        raise ValueError('No peak in trace')
+    main = int(peaks[np.argmax(y[peaks])])
+    sides = peaks[(peaks != main) & (np.abs(x[peaks] - x[main]) > mask)]
+    if not len(sides):
+        return {"smsr": float('nan'), "peak_idx": main, "side_idx": None}
+    side = int(sides[np.argmax(y[sides])])
+    return {"smsr": float(y[main] - y[side]), "peak_idx": main, "side_idx": side}
+
+
+def _crossings(x, y, peaks, levels, direction):
+    """
+    x of the nearest crossing of levels from each peak in direction (-1 left, 1 right), interpolated linearly.
+    """
+    result = np.empty(len(peaks))
+    last = len(y) - 1
+    for n, (i, level) in enumerate(zip(peaks.tolist(), levels.tolist())):
+        if direction < 0:
+            below = np.flatnonzero(y[:i] < level)
+            j = below[-1] if len(below) else None
+        else:
+            below = np.flatnonzero(y[i + 1:] < level)
+            j = i + 1 + below[0] if len(below) else None
+        if j is None:
+            result[n] = x[0] if direction < 0 else x[last]
+            continue
+        # crossing between j and its neighbour toward the peak
+        k = j - direction
+        result[n] = x[j] + (level - y[j])*(x[k] - x[j])/(y[k] - y[j])
+    return result
+
+
+def bandwidth(x, y, peaks, level=3.0):
+    """
+    Calculate -level dB bandwidth of peaks, such as -3 dB or -20 dB bandwidth.
+    :param x: (numpy.ndarray) x axis of trace
+    :param y: (numpy.ndarray) level in dBm
+    :param peaks: (int|numpy.ndarray) indexes of peaks
+    :param level: (float) level in dB below the peak
+    :return: (dict) {"bandwidth", "left", "right", "center"}: numpy.ndarray in x unit of each peak. Crossings out of
+        the trace are limited to the trace edges.
+    """
+    x, y = _check_trace(x, y)
+    peaks = np.atleast_1d(np.asarray(peaks, dtype=int))
+    levels = y[peaks] - level
+    left = _crossings(x, y, peaks, levels, -1)
+    right = _crossings(x, y, peaks, levels, 1)
+    return {"bandwidth": right - left, "left": left, "right": right, "center": (left + right)/2}
+
+
+def itu_channels(frequency, spacing=50.0, anchor=ITU_ANCHOR):
+    """
+    Assign frequencies to the nearest channels of ITU-T G.694.1 DWDM grid.
+    :param frequency: (float|numpy.ndarray) frequency in THz. For wavelength in nm, use LIGHT_SPEED/wavelength.
+    :param spacing: (float) channel spacing in GHz, such as 100, 50, 25, 12.5
+    :param anchor: (float) anchor frequency in THz
+    :return: (dict) {"channel": int n of f = anchor + n*spacing, "grid": grid frequency in THz,
+        "offset": frequency - grid in GHz} numpy.ndarray of each frequency
+    """
+    frequency = np.atleast_1d(np.asarray(frequency, dtype=float))
+    channel = np.rint((frequency - anchor)*1000/spacing).astype(int)
+    grid = anchor + channel*spacing/1000
+    return {"channel": channel, "grid": grid, "offset": (frequency - grid)*1000}
+
+
+def analyze_wdm(x, y, resolution, noise_offset, threshold=-50.0, mdiff=3.0, ch_width=None, ref_bw=None,
+                wavelength_unit=None, spacing=50.0):
+    """
+    Analyse a WDM trace on the host: find channels, then measure power, OSNR, -3 dB / -20 dB bandwidth, and assign
+    ITU channels.
+    :param x: (numpy.ndarray) x axis of trace
+    :param y: (numpy.ndarray) level in dBm
+    :param resolution: (float) resolution bandwidth of trace in x unit
+    :param noise_offset: (float) offset in x unit from channel center to noise measuring points
+    :param threshold: (float) minimum peak level in dBm of channels
+    :param mdiff: (float) minimum level difference in dB between channel peak and valleys
+    :param ch_width: (float|None) integration width of channel power in x unit, 2*noise_offset if None
+    :param ref_bw: (float|None) noise reference bandwidth of OSNR in x unit, None for resolution
+    :param wavelength_unit: (float|None) x unit in m if x is wavelength (such as 1e-9 for nm), for ITU channel
+        assignment. None to skip it.
+    :param spacing: (float) ITU grid spacing in GHz
+    :return: (dict) {"ch_num": int, field: numpy.ndarray of each channel}, fields are "center", "peak_lvl", "power",
+        "noise", "osnr", "bw_3db", "bw_20db", and "itu_ch", "itu_offset" (GHz) if wavelength_unit is given.
+    """
+    x, y = _check_trace(x, y)
+    peaks = find_peaks(x, y, threshold=threshold, mdiff=mdiff)
+    peak_lvl = y[peaks]
+    bw_3db = bandwidth(x, y, peaks, 3.0)
+    ch_width = 2*noise_offset if ch_width is None else ch_width
+    noise = osnr(x, y, x[peaks], noise_offset, resolution, ref_bw, signal_levels=peak_lvl)
+    r_data = {
+        "ch_num": len(peaks),
+        "center": x[peaks],
+        "peak_lvl": peak_lvl,
+        "power": channel_power(x, y, x[peaks], ch_width, resolution) if len(peaks) else np.empty(0),
+        "noise": noise["noise"],
+        "osnr": noise["osnr"],
+        "bw_3db": bw_3db["bandwidth"],
+        "bw_20db": bandwidth(x, y, peaks, 20.0)["bandwidth"],
+    }
+    if wavelength_unit is not None:
+        # LIGHT_SPEED in km/s, over wavelength in nm is frequency in THz
+        itu = itu_channels(LIGHT_SPEED/(x[peaks]*wavelength_unit*1e9), spacing)
+        r_data["itu_ch"] = itu["channel"]
+        r_data["itu_offset"] = itu["offset"]
+    return r_data
+
+
+def analyze_traces(traces, func=analyze_wdm, max_workers=None, **kwargs):
+    """
+    Analyse traces in parallel in a process pool.
+    :param traces: (list of tuple) (x, y) of each trace
+    :param func: (callable) module level analysis function func(x, y, **kwargs), such as analyze_wdm
+    :param max_workers: (int|None) number of processes, None for the number of processors. Traces are analysed in
+        this process if it is 1 or there is only one trace.
+    :return: (list) result of func of each trace
+    """
+    traces = list(traces)
+    task = partial(_analyze_trace, func, kwargs)
+    if max_workers == 1 or len(traces) <= 1:
+        return [task(trace) for trace in traces]
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(task, traces))
+
+
+def _analyze_trace(func, kwargs, trace):
+    x, y = trace
+    return func(x, y, **kwargs)
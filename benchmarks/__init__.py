@@ -0,0 +1,14 @@
+"""
+Benchmarks of Type* interface methods against simulated instruments (see simulator).
+
+For each case, the number of I/O round trips, messages, bytes, wall time and allocations per call are measured,
+and compared with a baseline json file to catch regressions:
+
+    python -m pyinst.benchmarks --save baseline.json
+    python -m pyinst.benchmarks --compare baseline.json
+
+The baseline only keeps the counters (round trips, messages, bytes) by default, which do not depend on the host.
+Use --timing to also save wall time and allocations in a baseline of the local machine.
+"""
+from .cases import Case, CASES
+from .runner import COUNTERS, TIMING, THRESHOLDS, measure, run, compare, save_baseline, load_baseline, format_results
@@ -0,0 +1,38 @@
+import os
+import sys
+import argparse
+from .runner import run, compare, save_baseline, load_baseline, format_results
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), 'baseline.json')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m pyinst.benchmarks',
+                                     description='Benchmark Type* methods against simulated instruments.')
+    parser.add_argument('-k', dest='pattern', help='only run cases whose name contains PATTERN')
+    parser.add_argument('--repeat', type=int, default=20, help='calls to time per case')
+    parser.add_argument('--latency', type=float, default=0.0005, help='simulated latency of each message in s')
+    parser.add_argument('--save', nargs='?', const=DEFAULT_BASELINE, metavar='FILE', help='save results as baseline')
+    parser.add_argument('--timing', action='store_true',
+                        help='also save wall time and allocations in the baseline, only for the local machine')
+    parser.add_argument('--compare', nargs='?', const=DEFAULT_BASELINE, metavar='FILE',
+                        help='compare results with baseline, exit with 1 if any regression')
+    args = parser.parse_args(argv)
+
+    results = run(args.pattern, args.repeat, args.latency)
+    print(format_results(results))
+    if args.save:
+        save_baseline(results, args.save, timing=args.timing)
+        print('Baseline saved to %s' % args.save)
+    if args.compare:
+        regressions = compare(results, load_baseline(args.compare))
+        for r in regressions:
+            print('REGRESSION {case}: {metric} {value} > {limit} (baseline {baseline})'.format(**r))
+        if regressions:
+            return 1
+        print('No regression against %s' % args.compare)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,110 @@
+"""
+Benchmark cases: Type* interface methods of models, run against simulated instruments.
+"""
+from ..models import ModelN7744A, ModelN7752A, ModelAQ2200_215, ModelAQ2200_311A, ModelAQ6370, ModelAQ6150, \
+    ModelE3633A, ModelOTF970, ModelN4392A, ModelATS535
+
+
+class Case(object):
+    """
+    A benchmark case: call method of an instrument object.
+    """
+
+    def __init__(self, name, factory, method, *args):
+        """
+        :param name: (str) case name, such as 'TypeOPM.get_dbm_value[N7744A]'
+        :param factory: (callable) create the instrument object
+        :param method: (str) method name
+        :param args: arguments of method
+        """
+        self.name = name
+        self.factory = factory
+        self.method = method
+        self.args = args
+
+    def create(self):
+        return self.factory()
+
+    def call(self, instrument):
+        return getattr(instrument, self.method)(*self.args)
+
+
+def _cases(type_name, model_name, factory, *calls):
+    """
+    :param calls: (tuple) (method, arg1, arg2...)
+    """
+    return [Case('%s.%s[%s]' % (type_name, call[0], model_name), factory, *call) for call in calls]
+
+
+def _n7744a():
+    return ModelN7744A('SIM::N7744A::1', 1)
+
+
+def _n7752a():
+    return ModelN7752A('SIM::N7752A::1', 1)
+
+
+def _aq2200_215():
+    return ModelAQ2200_215('SIM::AQ2211::1', 1)
+
+
+def _aq2200_311a():
+    return ModelAQ2200_311A('SIM::AQ2211::1', 2)
+
+
+def _aq6370():
+    return ModelAQ6370('SIM::AQ6370D::1')
+
+
+def _aq6150():
+    return ModelAQ6150('SIM::AQ6150::1')
+
+
+def _e3633a():
+    return ModelE3633A('SIM::E3633A::1', 'HIGH')
+
+
+def _otf970():
+    return ModelOTF970('SIM::OTF970::1')
+
+
+def _n4392a():
+    return ModelN4392A('SIM::N4392A::1')
+
+
+def _ats535():
+    return ModelATS535('SIM::ATS535::1')
+
+
+CASES = (
+    _cases('TypeOPM', 'N7744A', _n7744a,
+           ('get_power_value',), ('get_power_unit',), ('get_power',), ('get_dbm_value',), ('get_w_value',),
+           ('get_wavelength',), ('get_frequency',), ('get_avg_time',), ('get_cal',), ('set_wavelength', 1550),
+           ('set_frequency', 193.1), ('set_avg_time', 100), ('set_cal', 0), ('set_power_unit', 0),
+           ('set_to_reference',)) +
+    _cases('TypeOPM', 'AQ2200-215', _aq2200_215,
+           ('get_power_value',), ('get_dbm_value',), ('get_w_value',), ('set_wavelength', 1550),
+           ('set_to_reference',)) +
+    _cases('TypeVOA', 'N7752A', _n7752a,
+           ('get_att',), ('set_att', 10), ('get_offset',), ('set_offset', 0), ('enable', True), ('is_enabled',),
+           ('get_wavelength',), ('set_wavelength', 1550)) +
+    _cases('TypeVOA', 'AQ2200-311A', _aq2200_311a,
+           ('get_att',), ('set_att', 10), ('is_enabled',)) +
+    _cases('TypeOSA', 'AQ6370', _aq6370,
+           ('get_trace_data_x', 'TRA'), ('get_trace_data_y', 'TRA'), ('get_trace_array_x', 'TRA'),
+           ('get_trace_array_y', 'TRA'), ('sweep', 'SINGLE'), ('get_analysis_data',),
+           ('get_analysis_results', 'WDM'), ('get_trace', 'TRA', 450, 550), ('get_traces', ('TRA', 'TRB', 'TRC')),
+           ('capture_screen',)) +
+    _cases('TypeWM', 'AQ6150', _aq6150,
+           ('get_frequency',), ('get_wavelength',), ('is_running',)) +
+    _cases('TypePS', 'E3633A', _e3633a,
+           ('set_voltage', 5), ('get_voltage',), ('measure_voltage',), ('measure_current',), ('enable', True),
+           ('is_enabled',)) +
+    _cases('TypeOTF', 'OTF970', _otf970,
+           ('get_wavelength',), ('set_wavelength', 1550), ('get_frequency',), ('get_bandwidth_in_nm',),
+           ('set_bandwidth_in_nm', 1)) +
+    _cases('TypeOMA', 'N4392A', _n4392a,
+           ('get_trace_values', 1), ('get_trace_units', 1), ('get_trace_data', 1)) +
+    _cases('TypeTS', 'ATS535', _ats535,
+           ('get_current_temp',), ('get_target_temp',), ('set_target_temp', 25))
+)
@@ -0,0 +1,191 @@
+import os
+import json
+import time
+import platform
+import statistics
+import tracemalloc
+from .. import profiling, simulator
+from .cases import CASES
+
+# metrics which do not depend on the host, saved in the baseline by default
+COUNTERS = ("round_trips", "writes", "bytes")
+# metrics which depend on the host, only saved in a baseline of the local machine
+TIMING = ("wall_time", "wall_time_min", "allocations")
+
+# allowed increase of each metric over the baseline: (relative, absolute)
+THRESHOLDS = {
+    "round_trips": (0.0, 0),
+    "writes": (0.0, 0),
+    "bytes": (0.0, 0),
+    "wall_time": (0.5, 0.0005),
+    "allocations": (0.5, 4096),
+}
+
+
+def measure(case, repeat=20):
+    """
+    Run a benchmark case.
+    :param case: (Case) benchmark case
+    :param repeat: (int) number of calls to time
+    :return: (dict) {"round_trips", "writes", "bytes", "wall_time", "wall_time_min", "allocations"}, per call.
+        round_trips is the number of queries and reads, writes the number of messages without reply, wall_time
+        the median time in s, allocations the peak memory in bytes allocated by the call.
+    """
+    instrument = case.create()
+    try:
+        case.call(instrument)  # warm up
+
+        # count I/O
+        events = []
+        was_enabled = profiling.enabled
+        profiling.add_hook(events.append)
+        profiling.enable()
+        try:
+            case.call(instrument)
+        finally:
+            profiling.remove_hook(events.append)
+            if not was_enabled:
+                profiling.disable()
+
+        # time
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            case.call(instrument)
+            times.append(time.perf_counter() - start)
+
+        # allocations
+        tracing = tracemalloc.is_tracing()
+        if not tracing:
+            tracemalloc.start()
+        try:
+            if hasattr(tracemalloc, 'reset_peak'):
+                tracemalloc.reset_peak()
+            elif tracing:
+                # python < 3.9 cannot reset the peak, restart tracing (the traces of the caller are lost)
+                tracemalloc.stop()
+                tracemalloc.start()
+            base, _ = tracemalloc.get_traced_memory()
+            case.call(instrument)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            if not tracing:
+                tracemalloc.stop()
+    finally:
+        instrument.close()
+    return {
+        "round_trips": sum(1 for e in events if e["kind"] in ('query', 'read')),
+        "writes": sum(1 for e in events if e["kind"] == 'write'),
+        "bytes": sum(e["bytes"] for e in events),
+        "wall_time": statistics.median(times),
+        "wall_time_min": min(times),
+        "allocations": peak - base,
+    }
+
+
+def run(pattern=None, repeat=20, latency=0.0005, jitter=0.0, transfer_rate=None):
+    """
+    Run benchmark cases against simulated instruments.
+    :param pattern: (str) only run the cases whose name contains pattern, all if None
+    :param repeat: (int) number of calls to time per case
+    :param latency: (float) simulated latency in s of each message
+    :param jitter: (float) simulated jitter in s
+    :param transfer_rate: (float|None) simulated bus transfer rate in bytes/s
+    :return: (dict) {"meta": dict, "cases": {name: result}}, see measure for result
+    """
+    simulator.reset()
+    simulator.configure(latency=latency, jitter=jitter, transfer_rate=transfer_rate)
+    results = {}
+    for case in CASES:
+        if pattern is None or pattern in case.name:
+            results[case.name] = measure(case, repeat)
+    simulator.reset()
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "repeat": repeat,
+            "latency": latency,
+            "jitter": jitter,
+            "transfer_rate": transfer_rate,
+        },
+        "cases": results
+    }
+
+
+def compare(results, baseline, thresholds=None):
+    """
+    Compare results with a baseline.
+    :param results: (dict) return value of run
+    :param baseline: (dict) results saved by save_baseline, its "thresholds" override the default THRESHOLDS. Only
+        the metrics saved in the baseline are compared, which are the counters of a default baseline.
+    :param thresholds: (dict) metric => (relative, absolute) allowed increase, override the baseline's
+    :return: (list of dict) regressions: {"case", "metric", "baseline", "value", "limit"}
+    """
+    limits = dict(THRESHOLDS)
+    limits.update({k: tuple(v) for k, v in baseline.get("thresholds", {}).items()})
+    limits.update(thresholds or {})
+    regressions = []
+    for name, result in results["cases"].items():
+        base = baseline["cases"].get(name)
+        if base is None:
+            continue
+        for metric, (relative, absolute) in limits.items():
+            if metric not in base or metric not in result:
+                continue
+            limit = base[metric]*(1 + relative) + absolute
+            if result[metric] > limit:
+                regressions.append({
+                    "case": name,
+                    "metric": metric,
+                    "baseline": base[metric],
+                    "value": result[metric],
+                    "limit": limit
+                })
+    return regressions
+
+
+def save_baseline(results, filepath, thresholds=None, timing=False):
+    """
+    Save results as baseline json file, with the regression thresholds.
+    Only the counters are saved by default, so that the baseline does not depend on the host and is only compared
+    on them. If the file exists, it is updated: cases whose saved metrics are unchanged keep their entry, and cases
+    not in results are kept.
+    :param timing: (bool) also save wall time and allocations, for a baseline of the local machine
+    """
+    metrics = COUNTERS + TIMING if timing else COUNTERS
+    data = load_baseline(filepath) if os.path.exists(filepath) else {}
+    cases = data.get("cases", {})
+    for name, result in results["cases"].items():
+        entry = {metric: result[metric] for metric in metrics}
+        if not timing and cases.get(name) == entry:
+            continue
+        cases[name] = entry
+    data["cases"] = cases
+    meta = dict(results["meta"])
+    if not timing:
+        # the host is not part of a counters only baseline
+        meta.pop("python", None)
+        meta.pop("platform", None)
+    data["meta"] = meta
+    data["thresholds"] = dict(THRESHOLDS, **(thresholds or {}))
+    with open(filepath, 'w') as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+        f.write('\n')
+
+
+def load_baseline(filepath):
+    with open(filepath) as f:
+        return json.load(f)
+
+
+def format_results(results):
+    """
+    :return: (str) results as a text table
+    """
+    lines = ['{:<48} {:>6} {:>6} {:>8} {:>10} {:>10}'.format(
+        'case', 'rtrips', 'writes', 'bytes', 'time(ms)', 'alloc(B)')]
+    for name, r in results["cases"].items():
+        lines.append('{:<48} {:>6d} {:>6d} {:>8d} {:>10.3f} {:>10d}'.format(
+            name, r["round_trips"], r["writes"], r["bytes"], r["wall_time"]*1e3, r["allocations"]))
+    return '\n'.join(lines)
@@ -1,21 +1,33 @@
 """
-Load dlls and other dependencies at the beginning of module importing
+Load dlls and other native dependencies. They are loaded when the model which needs them is instantiated,
+not at module importing.
 """
-from os import add_dll_directory
+import os
+import threading
 
 __all__ = []
 
+_dll_directory = None
+_lock = threading.Lock()
+
+
 def add_dll_dependencies():
+    """
+    Add the DLLs folder of the current architecture to the dll search path. Only once, and only on Windows.
+    """
+    global _dll_directory
+    if not hasattr(os, 'add_dll_directory'):
+        return
     import platform
     import os.path
-    arch = platform.architecture()[0]
-    arch_mapping = {
-        '32bit': 'x86',
-        '64bit': 'x64'
-    }
-    dlls_folder = arch_mapping[arch]
-    dlls_dir = os.path.join(os.path.dirname(__file__), 'DLLs', dlls_folder)
-    add_dll_directory(dlls_dir)
-
-# ==========
-add_dll_dependencies()
\ No newline at end of file
+    with _lock:
+        if _dll_directory is not None:
+            return
+        arch = platform.architecture()[0]
+        arch_mapping = {
+            '32bit': 'x86',
+            '64bit': 'x64'
+        }
+        dlls_folder = arch_mapping[arch]
+        dlls_dir = os.path.join(os.path.dirname(__file__), 'DLLs', dlls_folder)
+        _dll_directory = os.add_dll_directory(dlls_dir)
@@ -0,0 +1,209 @@
+"""
+Discover connected visa instruments: probe resources with *IDN? concurrently and identify their model classes.
+"""
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from . import registry
+from .models._VisaInstrument import VisaSession, get_resource_manager, open_resource
+
+__all__ = ['discover', 'ResourceDescriptor']
+
+# IDN signatures: (manufacturer pattern, model pattern, class names), patterns are case insensitive full matches.
+# Models not listed here are matched by their model string in the registry.
+SIGNATURES = [
+    (r'YOKOGAWA|ANDO', r'AQ221[12]|AQ2200', ('ModelAQ2200_215', 'ModelAQ2200_221', 'ModelAQ2200_311A',
+                                            'ModelAQ2200_331', 'ModelAQ2200_342')),
+    (r'YOKOGAWA', r'AQ615[01]', ('ModelAQ6150',)),
+    (r'YOKOGAWA', r'AQ637\d[A-Z]?', ('ModelAQ6370',)),
+    (r'TEMPTRONIC|INTEST', r'ATS-?535', ('ModelATS535',)),
+    (r'KEYSIGHT.*|AGILENT.*|HEWLETT-PACKARD', r'E3631A', ('ModelE3631A',)),
+    (r'KEYSIGHT.*|AGILENT.*|HEWLETT-PACKARD', r'E3633A', ('ModelE3633A',)),
+    (r'KEYSIGHT.*|AGILENT.*|HEWLETT-PACKARD', r'816[34][AB]?', ('Model81635A', 'Model81571A')),
+    (r'KEYSIGHT.*|AGILENT.*', r'N7744[AC]', ('ModelN7744A',)),
+    (r'KEYSIGHT.*|AGILENT.*', r'N7752[AC]', ('ModelN7752A',)),
+    (r'KEYSIGHT.*|AGILENT.*', r'N7764[AC]', ('ModelN7764A',)),
+    (r'KEYSIGHT.*|AGILENT.*', r'N4392A', ('ModelN4392A',)),
+    (r'KEYSIGHT.*|AGILENT.*', r'M8292A', ('ModelM8292A',)),
+    (r'KEYSIGHT.*|AGILENT.*', r'MSO-?X6\d{3}A?', ('ModelMSOX6000',)),
+    (r'TEKTRONIX', r'(MSO|DPO)5\d{3}B?', ('ModelMSO5000',)),
+    (r'JDSU|VIAVI.*', r'MAP-?2\d\d.*', ('ModelMAP200_mVoaC1',)),
+    (r'SANTEC.*', r'OTF-?930', ('ModelOTF930',)),
+    (r'SANTEC.*', r'OTF-?970', ('ModelOTF970',)),
+    (r'SANTEC.*', r'OTF-?980', ('ModelOTF980',)),
+    (r'EXFO.*', r'XTA-?50', ('ModelXTA50',)),
+    (r'GENERAL PHOTONICS.*', r'MPC-?202', ('ModelMPC202',)),
+    (r'GENERAL PHOTONICS.*', r'PDLE-?101', ('ModelPDLE101',)),
+    (r'GENERAL PHOTONICS.*', r'PMD-?1000', ('ModelPMD1000',)),
+    (r'GENERAL PHOTONICS.*', r'PSY-?101', ('ModelPSY101',)),
+    (r'GENERAL PHOTONICS.*', r'PSY-?201', ('ModelPSY201',)),
+    (r'APPLENT', r'AT5524', ('ModelAT5524',)),
+]
+
+PROBE_TIMEOUT = 500  # default timeout in ms of probing a resource
+CACHE_TTL = 60.0  # default time in s that discovered results are valid
+
+_cache = {}  # resource name => ResourceDescriptor
+_cache_lock = threading.Lock()
+
+
+class ResourceDescriptor(object):
+    """
+    A discovered resource: its IDN and the model classes which can be constructed with it.
+    """
+
+    def __init__(self, resource_name, idn=None, class_names=(), error=None):
+        """
+        :param resource_name: (str) visa resource name
+        :param idn: (str|None) reply of *IDN?, None if the probe failed
+        :param class_names: (tuple of str) names of matched model classes, the most likely first
+        :param error: (str|None) error message if the probe failed
+        """
+        self.resource_name = resource_name
+        self.idn = idn
+        self.class_names = tuple(class_names)
+        self.error = error
+        self.timestamp = time.monotonic()
+        fields = [i.strip() for i in idn.split(',')] if idn else []
+        fields += [''] * (4 - len(fields))
+        self.manufacturer, self.model, self.serial_number, self.firmware = fields[:4]
+
+    def __repr__(self):
+        return '<ResourceDescriptor {name!r} idn={idn!r} class_names={cls!r}>'.format(
+            name=self.resource_name, idn=self.idn, cls=self.class_names)
+
+    @property
+    def class_name(self):
+        """
+        :return: (str|None) the most likely model class name, None if not identified
+        """
+        return self.class_names[0] if self.class_names else None
+
+    @property
+    def identified(self):
+        return bool(self.class_names)
+
+    def get_params(self, class_name=None):
+        """
+        :param class_name: (str) one of class_names, the most likely one if None
+        :return: (list of dict) params of the model class besides resource_name, see BaseInstrument.params
+        """
+        return registry.get_model_info(self.__get_class_name(class_name))["params"]
+
+    def create(self, *args, class_name=None, **kwargs):
+        """
+        Construct the model object of this resource.
+        :param args: params of the model class besides resource_name, such as slot
+        :param class_name: (str) one of class_names, the most likely one if None
+        :param kwargs: keyword arguments of the model class
+        :return: model object
+        """
+        model_cls = registry.get_model_class(self.__get_class_name(class_name))
+        return model_cls(self.resource_name, *args, **kwargs)
+
+    def __get_class_name(self, class_name):
+        if class_name is None:
+            if not self.class_names:
+                raise ValueError('Resource {name!r} is not identified as any model.'.format(name=self.resource_name))
+            return self.class_names[0]
+        return class_name
+
+
+def match_idn(idn):
+    """
+    Match an IDN string to model classes.
+    :param idn: (str) reply of *IDN?, such as 'Keysight Technologies,N7744A,MY12345678,1.0'
+    :return: (tuple of str) matched class names, empty if not identified
+    """
+    fields = [i.strip() for i in idn.split(',')]
+    if len(fields) < 2:
+        return ()
+    manufacturer, model = fields[:2]
+    for manufacturer_pattern, model_pattern, class_names in SIGNATURES:
+        if re.fullmatch(manufacturer_pattern, manufacturer, re.I) and re.fullmatch(model_pattern, model, re.I):
+            return class_names
+    return registry.find_models(model=model)
+
+
+def _probe(resource_name, timeout):
+    """
+    Query *IDN? of a resource. An opened session is used with its own timeout and termination, if its lock can be
+    acquired within timeout; otherwise the resource is opened temporarily with the probe timeout and termination.
+    :return: (ResourceDescriptor|None) None if the opened session is busy
+    """
+    try:
+        session = VisaSession.get_opened(resource_name)
+        if session is not None:
+            if not session.lock.acquire(timeout=timeout/1000):
+                return None
+            try:
+                idn = session.resource.query('*IDN?')
+            finally:
+                session.lock.release()
+        else:
+            resource = open_resource(resource_name, open_timeout=timeout, timeout=timeout, read_termination='\n',
+                                     write_termination='\n')
+            try:
+                idn = resource.query('*IDN?')
+            finally:
+                resource.close()
+    except Exception as e:
+        return ResourceDescriptor(resource_name, error='{}: {}'.format(type(e).__name__, e))
+    idn = idn.strip()
+    return ResourceDescriptor(resource_name, idn, match_idn(idn))
+
+
+def discover(resources=None, query='?*::INSTR', skip_serial=True, max_workers=8, timeout=PROBE_TIMEOUT,
+             ttl=CACHE_TTL, refresh=False):
+    """
+    Find connected instruments and identify their models. Resources are probed with *IDN? concurrently, and the
+    results are cached for ttl seconds, including failed probes. A resource whose opened session stays locked by
+    other threads for timeout is not probed, its previous result is returned if any.
+
+    :param resources: (list of str) resource names to probe, all the resources matching query if None
+    :param query: (str) query of list_resources, used if resources is None
+    :param skip_serial: (bool) skip ASRL resources if resources is None, because writing to unknown serial
+        devices may upset them
+    :param max_workers: (int) maximum number of concurrent probes
+    :param timeout: (int) open and I/O timeout in ms of each probe
+    :param ttl: (float) time in s that cached results are valid
+    :param refresh: (bool) probe all resources again, ignore the cache
+    :return: (list of ResourceDescriptor) in the order of resources
+    """
+    if not isinstance(max_workers, int) or max_workers < 1:
+        raise ValueError('max_workers should be a positive int')
+    if resources is None:
+        resources = get_resource_manager().list_resources(query)
+        if skip_serial:
+            resources = [i for i in resources if not i.upper().startswith('ASRL')]
+    resources = list(resources)
+
+    now = time.monotonic()
+    results = {}
+    with _cache_lock:
+        for name in resources:
+            cached = _cache.get(name)
+            if not refresh and cached is not None and now - cached.timestamp < ttl:
+                results[name] = cached
+    to_probe = [i for i in dict.fromkeys(resources) if i not in results]
+    if to_probe:
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(to_probe))) as executor:
+            probed = list(executor.map(lambda name: _probe(name, timeout), to_probe))
+        with _cache_lock:
+            for name, descriptor in zip(to_probe, probed):
+                if descriptor is None:
+                    # the opened session stays busy, keep the previous result and probe it again next time
+                    descriptor = _cache.get(name) or ResourceDescriptor(name, error='Session is busy')
+                else:
+                    _cache[name] = descriptor
+                results[name] = descriptor
+    return [results[i] for i in resources]
+
+
+def clear_cache():
+    """
+    Clear cached discovery results.
+    """
+    with _cache_lock:
+        _cache.clear()
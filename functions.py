@@ -1,28 +1,16 @@
-from pyvisa import ResourceManager
-from .constants import InstrumentType
-from . import models
+from . import registry
+from .models._VisaInstrument import VisaSession, get_resource_manager, close_resource_manager
 
 
-__all__ = ['get_resource_manager', 'close_resource_manager', 'list_resources', 'list_resources_info', 'resource_info', 'get_instrument_lib']
+__all__ = ['get_resource_manager', 'close_resource_manager', 'list_resources', 'list_resources_info', 'resource_info', 'get_instrument_lib',
+           'get_session_stats']
 
 
-rm = ResourceManager()
-
-
-def get_resource_manager():
-    """
-    Get the pyvisa.ResourceManager instance that is used globally by PyInst.
-
-    :Return type: pyvisa.ResourceManager
-    """
-    return rm
-
-
-def close_resource_manager():
-    """
-    Close the global resource manager session.
-    """
-    rm.close()
+def __getattr__(name):
+    # rm was created at import, it is now created at its first access
+    if name == 'rm':
+        return get_resource_manager()
+    raise AttributeError('module %r has no attribute %r' % (__name__, name))
 
 
 def list_resources():
@@ -31,7 +19,7 @@ def list_resources():
 
     :Return type: tuple(str)
     """
-    return rm.list_resources()
+    return get_resource_manager().list_resources()
 
 
 def list_resources_info():
@@ -42,7 +30,7 @@ def list_resources_info():
 
     :Return type: dict{str => pyvisa.highlevel.ResourceInfo}
     """
-    return rm.list_resources_info()
+    return get_resource_manager().list_resources_info()
 
 
 def resource_info(resource_name, extended=True):
@@ -53,11 +41,12 @@ def resource_info(resource_name, extended=True):
 
     :Return type: pyvisa.highlevel.ResourceInfo
     """
-    return rm.resource_info(resource_name, extended)
+    return get_resource_manager().resource_info(resource_name, extended)
 
 def get_instrument_lib(detailed=True):
     """
-    Get instrument model lib classified by type.
+    Get instrument model lib classified by type. It is built once from the model registry, without importing
+    the models.
 
     :Returns: (Detailed) model information classified by its type.
 
@@ -65,26 +54,13 @@ def get_instrument_lib(detailed=True):
         - **details = True** - ``dict{instrument_type => list[{"model" => str, "brand" => str, "class_name" => str, "params" => list, "details" => dict}]}``
         - **details = False** - ``dict{instrument_type => list[model_name]}``
     """
-    model_lib = {}
-    model_dict = models.__dict__
-    for i in InstrumentType:
-        model_lib[i.name] = []
-    for i in model_dict:
-        if i.startswith('Model'):
-            model_cls = model_dict[i]
-            model_str = model_cls.model
-            if isinstance(model_str, (tuple, list)):
-                model_str = '/'.join(model_cls.model)
-            brand = model_cls.brand
-            class_name = i
-            params = model_cls.params
-            details = model_cls.details
-            type_str_list = [m.__name__.replace('Type', '') for m in model_cls.mro() if m.__name__.startswith('Type')]
-            for type_str in type_str_list:
-                if detailed:
-                    model_lib[type_str].append({'model': model_str, 'brand': brand, 'class_name': class_name,
-                                                'params': params, 'details': details})
-                else:
-                    model_lib[type_str].append(model_str)
-    return model_lib
+    return registry.get_instrument_lib(detailed)
+
+
+def get_session_stats():
+    """
+    Get lock contention statistics of all the opened visa sessions.
 
+    :Return type: dict{str resource_name => dict{"acquisitions" => int, "contentions" => int, "wait_time" => float, "max_wait_time" => float}}
+    """
+    return VisaSession.get_all_stats()
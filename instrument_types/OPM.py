@@ -134,7 +134,7 @@ class TypeOPM(BaseInstrumentType):
 
     def get_power(self):
         """
-        Get the measured power value and unit.
+        Get the measured power value and unit. Models may override it to read both in one query.
 
         :Return Type: tuple(float value, int unit)
         """
@@ -146,8 +146,7 @@ class TypeOPM(BaseInstrumentType):
         
         :Returns: float, optical power in dBm
         """
-        unit = self.get_power_unit()
-        value = self.get_power_value()
+        value, unit = self.get_power()
         if unit == 0:
             return value
         elif unit == 1:
@@ -159,13 +158,66 @@ class TypeOPM(BaseInstrumentType):
         
         :Returns: float, optical power in Watt
         """
-        unit = self.get_power_unit()
-        value = self.get_power_value()
+        value, unit = self.get_power()
         if unit == 1:
             return value
         elif unit == 0:
             return dbm_to_w(value)
 
+    def read_all_powers(self, slots=None, unit=0):
+        """
+        Read the power of several channels of the same frame in one query, so that the readings are taken at
+        (almost) the same time. Models implementing it have slot and channel attributes.
+
+        :Parameters:
+            - **slots** - list[int|tuple]|None, channels to read, as slot numbers (channel 1) or (slot, channel)
+              tuples. None for all the OPM channels of the frame.
+            - **unit** - int|None, value of <enum 'OpticalUnit'> to convert the values to, None to return the values
+              in the power unit of each channel without querying the units.
+
+        :Returns: tuple, (float timestamp, numpy.ndarray power values in the order of slots), timestamp is the
+            time.time() at the middle of the query
+        """
+        self._raise_not_implemented()
+
+    @staticmethod
+    def _frame_channels(slots):
+        """
+        Normalize the slots param of read_all_powers.
+
+        :Parameters: **slots** - list[int|tuple], slot numbers (channel 1) or (slot, channel) tuples
+
+        :Returns: list[tuple], (slot, channel) of each channel
+        """
+        if not len(slots):
+            raise ValueError('No channel to read.')
+        return [(i, 1) if isinstance(i, int) else tuple(i) for i in slots]
+
+    @staticmethod
+    def _convert_power_values(values, units, unit):
+        """
+        Convert optical power values read in different units to one unit.
+
+        :Parameters:
+            - **values** - list[float], power values
+            - **units** - list[int], value of <enum 'OpticalUnit'> of each value
+            - **unit** - int, value of <enum 'OpticalUnit'>, unit to convert to
+
+        :Returns: numpy.ndarray, power values in unit
+        """
+        import numpy as np
+        values = np.array(values, dtype=float)
+        units = np.asarray(units)
+        if unit == 0:
+            converted = units == 1
+            values[converted] = w_to_dbm(values[converted])
+        elif unit == 1:
+            converted = units == 0
+            values[converted] = dbm_to_w(values[converted])
+        else:
+            raise ValueError('Invalid optical unit: %r' % unit)
+        return values
+
     def get_cal(self):
         """
         :Returns: float, calibration offset in dB
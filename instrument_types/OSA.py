@@ -5,9 +5,18 @@ class TypeOSA(BaseInstrumentType):
     """
     Optical Spectrum Analyser.
 
-    The operating logic is different between different vendors/models, so no general methods is defined here.
+    The operating logic is different between different vendors/models, so only the spectrum of the current
+    measurement is defined here, for host side analysis (see analysis.spectrum).
     """
     def __init__(self, *args, **kwargs):
         super(TypeOSA, self).__init__()
         self._append_ins_type(InstrumentType.OSA)
 
+
+    def get_spectrum(self, x_unit='NM'):
+        """
+        Get the spectrum of the current measurement.
+        :param x_unit: (str) 'NM'|'THZ'
+        :return: (tuple) (numpy.ndarray ascending wavelength in nm or frequency in THz, numpy.ndarray level in dBm)
+        """
+        self._raise_not_implemented()
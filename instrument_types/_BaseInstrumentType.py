@@ -1,10 +1,12 @@
 from ..constants import InstrumentType
+from ._StateCache import StateCache, _MISSING
 
 
 class BaseInstrumentType(object):
     # Base Class of Instrument Types
     def __init__(self):
         self._ins_type = []
+        self._state_cache = None
         super(BaseInstrumentType, self).__init__()
 
     # param encapsulation
@@ -27,4 +29,61 @@ class BaseInstrumentType(object):
             self._ins_type.append(i_type)
 
     def _raise_not_implemented(self):
-        raise NotImplementedError('This attribute is not implemented.')
\ No newline at end of file
+        raise NotImplementedError('This attribute is not implemented.')
+
+    # state cache
+    def enable_state_cache(self, ttl=None):
+        """
+        Enable the write-through state cache. Setters skip writing a value equal to the cached one, and getters
+        return the cached value instead of querying the instrument.
+        Only use it when settings are not changed by others (front panel, other programs).
+
+        :Parameters: **ttl** - float|None, seconds to trust a cached value, None to trust it until invalidated.
+        """
+        self._state_cache = StateCache(ttl)
+
+    def disable_state_cache(self):
+        """
+        Disable and drop the state cache.
+        """
+        self._state_cache = None
+
+    def invalidate(self, *keys):
+        """
+        Drop cached settings, such as 'wavelength', 'att'. All the settings are dropped if no key is given.
+        """
+        if self._state_cache is not None:
+            self._state_cache.invalidate(*keys)
+
+    def get_state_cache_info(self):
+        """
+        :Returns: dict|None, {"ttl", "hits", "misses", "hit_rate", "keys"}, None if state cache is disabled.
+        """
+        if self._state_cache is None:
+            return None
+        return self._state_cache.info()
+
+    def _get_cached_state(self, key, default=None):
+        """
+        Get the trusted cached value of a setting, for methods which can skip a query with it.
+        :param key: (str) setting name
+        :param default: returned if state cache is disabled or the value is not cached. Pass a sentinel (such as
+            _StateCache._MISSING) to tell a cached None from a missing value.
+        :return: cached value, or default.
+        """
+        cache = self._state_cache
+        if cache is None:
+            return default
+        value = cache.get(key, _MISSING)
+        if value is _MISSING:
+            cache.misses += 1
+            return default
+        cache.hits += 1
+        return value
+
+    def _set_cached_state(self, key, value):
+        """
+        Cache the value of a setting read back as a side effect, if state cache is enabled.
+        """
+        if self._state_cache is not None:
+            self._state_cache.set(key, value)
@@ -0,0 +1,123 @@
+import time
+import inspect
+from functools import wraps
+
+_MISSING = object()
+
+
+class StateCache(object):
+    """
+    Write-through cache of instrument settings, keyed by setting name, such as 'wavelength', 'att'.
+    A cached value is trusted for ttl seconds after it is written or read back, or forever if ttl is None.
+    """
+
+    def __init__(self, ttl=None):
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.__values = {}  # key => (value, time stamp)
+
+    def get(self, key, default=_MISSING):
+        """
+        Get the cached value of a setting if it is still trusted.
+        :param key: (str) setting name
+        :return: cached value, or default if not cached or expired.
+        """
+        try:
+            value, stamp = self.__values[key]
+        except KeyError:
+            return default
+        if self.ttl is not None and time.monotonic() - stamp > self.ttl:
+            del self.__values[key]
+            return default
+        return value
+
+    def set(self, key, value):
+        self.__values[key] = (value, time.monotonic())
+
+    def invalidate(self, *keys):
+        """
+        Drop cached settings. All the settings are dropped if no key is given.
+        """
+        if not keys:
+            self.__values.clear()
+        for key in keys:
+            self.__values.pop(key, None)
+
+    def info(self):
+        """
+        :return: (dict) {"ttl": float|None, "hits": int, "misses": int, "hit_rate": float, "keys": list}
+        """
+        total = self.hits + self.misses
+        return {
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits/total if total else 0.0,
+            "keys": list(self.__values.keys())
+        }
+
+
+def cached_setter(key, invalidates=(), normalize=None):
+    """
+    Decorator for set_xxx(self, value, ...) methods. When the state cache is enabled, the write is skipped if
+    value equals the trusted cached value, otherwise the value is cached after a successful write.
+    :param key: (str) setting name
+    :param invalidates: (tuple of str) settings changed as a side effect of this setter
+    :param normalize: (callable|None) normalize(value) returns the value actually written to the instrument, for
+        setters rounding or formatting the value, such as lambda value: round(value, 1). The normalized value is
+        compared and cached.
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+        value_param = list(signature.parameters)[1]
+
+        @wraps(func)
+        def wrapper(self, *args, **kwargs):
+            cache = self._state_cache
+            if cache is None:
+                return func(self, *args, **kwargs)
+            bound = signature.bind(self, *args, **kwargs)
+            bound.apply_defaults()
+            value = bound.arguments[value_param]
+            if normalize is not None:
+                try:
+                    value = normalize(value)
+                except (TypeError, ValueError):
+                    # invalid value, let the setter raise its own error
+                    cache.invalidate(key, *invalidates)
+                    return func(self, *args, **kwargs)
+            if cache.get(key) == value:
+                cache.hits += 1
+                return None
+            cache.misses += 1
+            cache.invalidate(key, *invalidates)
+            result = func(self, *args, **kwargs)
+            cache.set(key, value)
+            return result
+        return wrapper
+    return decorator
+
+
+def cached_getter(key):
+    """
+    Decorator for get_xxx(self) methods. When the state cache is enabled, the trusted cached value is returned
+    without querying the instrument, otherwise the value read back is cached.
+    :param key: (str) setting name
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(self):
+            cache = self._state_cache
+            if cache is None:
+                return func(self)
+            value = cache.get(key)
+            if value is not _MISSING:
+                cache.hits += 1
+                return value
+            cache.misses += 1
+            value = func(self)
+            cache.set(key, value)
+            return value
+        return wrapper
+    return decorator
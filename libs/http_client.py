@@ -0,0 +1,106 @@
+import threading
+import time
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+POOL_SIZE = 4  # max keep-alive connections to one host
+RETRIES = 2  # retries of connection errors
+BACKOFF_FACTOR = 0.1  # sleep backoff_factor * 2**(retry - 1) s between retries
+
+
+class HttpClient(object):
+    """
+    HTTP client of an instrument with a REST interface. Requests share a keep-alive session with a bounded connection
+    pool, so that the TCP connection is reused instead of being set up for each request. Failed connections are
+    retried, and the time of each request is counted.
+    """
+
+    def __init__(self, base_url, timeout=5, pool_size=POOL_SIZE, retries=RETRIES, backoff_factor=BACKOFF_FACTOR):
+        """
+        :param base_url: (str) such as 'http://192.168.1.10'
+        :param timeout: (float) default timeout of requests in s
+        :param pool_size: (int) max connections kept alive in the pool
+        :param retries: (int) max retries of a failed connection, 0 to disable retrying
+        :param backoff_factor: (float) backoff factor of sleep between retries
+        """
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        # only connection errors are retried, as the request is not sent yet. Requests failing after being sent (read
+        # timeout, error status) are not retried, since instrument requests such as a scan are not idempotent.
+        retry = Retry(total=retries, connect=retries, read=0, status=0, backoff_factor=backoff_factor,
+                      raise_on_status=False)
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry, pool_block=True)
+        self.__session = requests.Session()
+        self.__session.mount('http://', adapter)
+        self.__session.mount('https://', adapter)
+        self.__lock = threading.Lock()
+        self.requests = 0
+        self.errors = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self.last_time = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def url(self, route):
+        """
+        :param route: (str) route relative to base_url, such as 'waveshaper/devinfo'
+        :return: (str) full url
+        """
+        return '%s/%s' % (self.base_url, route.lstrip('/'))
+
+    def request(self, method, route, **kwargs):
+        """
+        Send a request in the session.
+        :param method: (str) 'GET'|'POST'...
+        :param route: (str) route relative to base_url
+        :param kwargs: keyword arguments of requests.Session.request, such as data, json, timeout
+        :return: (requests.Response) response
+        """
+        kwargs.setdefault('timeout', self.timeout)
+        start = time.perf_counter()
+        try:
+            return self.__session.request(method, self.url(route), **kwargs)
+        except Exception:
+            with self.__lock:
+                self.errors += 1
+            raise
+        finally:
+            duration = time.perf_counter() - start
+            with self.__lock:
+                self.requests += 1
+                self.total_time += duration
+                self.max_time = max(self.max_time, duration)
+                self.last_time = duration
+
+    def get(self, route, **kwargs):
+        return self.request('GET', route, **kwargs)
+
+    def post(self, route, data=None, **kwargs):
+        return self.request('POST', route, data=data, **kwargs)
+
+    def stats(self):
+        """
+        :return: (dict) {"requests": int, "errors": int, "total_time": float, "mean_time": float, "max_time": float,
+            "last_time": float|None}, time in s, errors are requests failed without a response.
+        """
+        with self.__lock:
+            return {
+                "requests": self.requests,
+                "errors": self.errors,
+                "total_time": self.total_time,
+                "mean_time": self.total_time/self.requests if self.requests else 0.0,
+                "max_time": self.max_time,
+                "last_time": self.last_time
+            }
+
+    def close(self):
+        """
+        Close the kept-alive connections. The client can still be used, and connects again at the next request.
+        """
+        self.__session.close()
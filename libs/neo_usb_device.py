@@ -10,9 +10,26 @@ def _dec_open_close(function):
             self.close()
     return wrapper
 
+class _LazyLibrary(object):
+    """
+    Load a dll at the first access of its functions, instead of at importing.
+    """
+
+    def __init__(self, name):
+        self.__name = name
+        self.__dll = None
+
+    def __get__(self, instance, owner):
+        if self.__dll is None:
+            from ..dependencies import add_dll_dependencies
+            add_dll_dependencies()
+            self.__dll = ctypes.cdll.LoadLibrary(self.__name)
+        return self.__dll
+
+
 class NeoUsbDevice:
 
-    dll_si_usb = ctypes.cdll.LoadLibrary('SiUSBXp.dll')
+    dll_si_usb = _LazyLibrary('SiUSBXp.dll')
 
     @classmethod
     def check_si_status(cls, si_status):
@@ -1,7 +1,34 @@
 from ._VisaInstrument import VisaInstrument
 from ..instrument_types import TypeOSA
 import time
+import numbers
+import operator
+import re
+import numpy as np
 from ..constants import LIGHT_SPEED
+from .. import profiling
+
+SWEEP_TIMEOUT = 300  # default timeout in s of waiting for a sweep
+
+# fields of each channel in WDM analysis data, by display type (and relation for ABSolute)
+_WDM_FIELDS = {
+    (0, 0): ("center_wl", "peak_lvl", "offset_wl", "offset_lvl", "noise", "snr"),
+    (0, 1): ("center_wl", "peak_lvl", "spacing", "lvl_diff", "noise", "snr"),
+    1: ("grid_wl", "center_wl", "rel_wl", "peak_lvl", "noise", "snr"),
+    2: ("grid_wl", "center_wl", "wl_diff_max", "wl_diff_min", "ref_lvl", "peak_lvl", "lvl_diff_max",
+        "lvl_diff_min"),
+    3: ("ref_wl", "center_wl", "wl_diff_max", "wl_diff_min", "ref_lvl", "peak_lvl", "lvl_diff_max",
+        "lvl_diff_min"),
+}
+
+# headers of commands which may change the WDM display type
+_WDM_DISPLAY_TYPE_HEADER = re.compile(r':?(CALC(ULATE)?:PAR(AMETER)?:WDM|\*RST|SYST(EM)?:PRES(ET)?)', re.IGNORECASE)
+
+_ANALYSIS_FIELDS = {
+    "DFBLD": ("spec_wd", "peak_wl", "peak_lvl", "mode_ofst", "smsr"),
+    "FPLD": ("spec_wd", "peak_wl", "peak_lvl", "center_wl", "total_pow", "mode_num"),
+    "SMSR": ("peak_wl", "peak_lvl", "side_wl", "side_lvl", "wl_diff", "smsr"),
+}
 
 
 class ModelAQ6370(VisaInstrument, TypeOSA):
@@ -14,6 +41,7 @@ class ModelAQ6370(VisaInstrument, TypeOSA):
 
     def __init__(self, resource_name, username="anonymous", password="empty", **kwargs):
         super(ModelAQ6370, self).__init__(resource_name, **kwargs)
+        self.__index_ramp = None  # float64 indexes of sampling points, to rebuild x data in place
         self._analysis_cat = ["WDM", "DFBLD", "FPLD", "SMSR"]
         self._analysis_setting_map = {
             "WDM": ["TH", "MDIFF", "DMASK", "NALGO", "NAREA", "MAREA", "FALGO", "NBW"],
@@ -33,12 +61,42 @@ class ModelAQ6370(VisaInstrument, TypeOSA):
             "SMSR": ["MASK", "MODE"]
         }
         self._setup_map = ["BWIDTH:RES"]
-        # init LAN if connection method is TCPIP
+        # init LAN if connection method is TCPIP, only once for a shared session
         if self.resource_name.upper().startswith('TCPIP'):
-            self.open_lan_port(username, password)
+            try:
+                with self.session.lock:
+                    if not self.session.state.get('lan_opened'):
+                        self.open_lan_port(username, password)
+                        self.session.state['lan_opened'] = True
+            except Exception:
+                VisaInstrument.close(self)
+                raise
 
     # param encapsulation
     # Method
+    def command(self, cmd):
+        with self.session.lock:
+            self._check_wdm_display_type(cmd)
+            return super(ModelAQ6370, self).command(cmd)
+
+    def query(self, cmd, bin=False):
+        with self.session.lock:
+            self._check_wdm_display_type(cmd)
+            return super(ModelAQ6370, self).query(cmd, bin)
+
+    def _check_wdm_display_type(self, message):
+        """
+        Drop the WDM display type cached in the session, if message sets WDM analysis parameters or resets the
+        instrument.
+        """
+        if 'wdm_display_type' not in self.session.state:
+            return
+        for cmd in message.split(';'):
+            header = cmd.split(None, 1)[0] if cmd.strip() else ''
+            if not header.endswith('?') and _WDM_DISPLAY_TYPE_HEADER.match(header):
+                del self.session.state['wdm_display_type']
+                return
+
     def open_lan_port(self, user="anonymous", password="empty"):
         usr_rsp = self.query('OPEN "%s"' % user)
         if usr_rsp.strip() == "AUTHENTICATE CRAM-MD5.":
@@ -48,23 +106,71 @@ class ModelAQ6370(VisaInstrument, TypeOSA):
         raise PermissionError("Uncorrect LAN username or password for %s" % self.model)
 
     def close(self):
+        if self.session is None:
+            return
         if self.resource_name.upper().startswith('TCPIP'):
-            self.command('CLOSE')
+            # the last instrument of the session logs out
+            with self.session.lock:
+                if self.session.ref_count == 1 and self.session.state.get('lan_opened'):
+                    self.command('CLOSE')
+                    self.session.state['lan_opened'] = False
         VisaInstrument.close(self)
 
-    def sweep(self, mode="REPEAT"):
+    def sweep(self, mode="REPEAT", wait=False, timeout=SWEEP_TIMEOUT, use_srq=False):
         """
         Set OSA sweep mode. mode = "AUTO"|"REPEAT"|"SINGLE"|"STOP"
+        A SINGLE sweep with wait clears the sweep completed event first, so that it waits for this sweep. To wait
+        later with await_sweep, call is_sweep_completed before the sweep to clear the event.
         :param mode: (str) "AUTO"|"REPEAT"|"SINGLE"|"STOP"
+        :param wait: (bool) wait for a SINGLE sweep to complete, see await_sweep
+        :param timeout: (float|None) timeout in s of waiting, None to wait forever
+        :param use_srq: (bool) wait for the service request event instead of polling, see await_sweep
         """
         selection = ["AUTO", "REPEAT", "SINGLE", "STOP"]
         if mode not in selection:
             raise ValueError('Invalid seeep mode: %r' % mode)
-        if mode != "STOP":
+        if wait and mode != "SINGLE":
+            raise ValueError('Only SINGLE sweep can be waited.')
+        if wait:
+            # read (clear) the operation event register and start the sweep in one message
+            self.query(':STAT:OPER:EVEN?;:INIT:SMOD SINGLE;:INIT')
+            self.await_sweep(timeout, use_srq=use_srq)
+        elif mode != "STOP":
             return self.command(':INIT:SMOD '+mode+';:INIT')
         else:
             return self.command(':ABOR')
 
+    def is_sweep_completed(self):
+        """
+        Read and clear the sweep completed event (bit 0 of the operation event register).
+        :return: (bool) if the sweep is completed since the last read
+        """
+        return bool(int(self.query(':STAT:OPER:EVEN?')) & 1)
+
+    def await_sweep(self, timeout=SWEEP_TIMEOUT, interval=0.05, use_srq=False):
+        """
+        Wait for the SINGLE sweep started by sweep to complete.
+        :param timeout: (float|None) timeout in s, None to wait forever
+        :param interval: (float) polling interval in s of the operation event register
+        :param use_srq: (bool) enable the sweep completed event as service request, and wait for the visa SRQ
+            event instead of polling. The interface should support service requests (such as GPIB).
+        :raise TimeoutError: if the sweep is not completed in timeout
+        """
+        if use_srq:
+            # bit 0 of operation event -> bit 7 of status byte -> service request
+            self.command(':STAT:OPER:ENAB 1;*SRE 128')
+            try:
+                self.wait_for_srq(timeout)
+            finally:
+                self.command('*SRE 0')
+            self.is_sweep_completed()
+            return
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not self.is_sweep_completed():
+            if deadline is not None and time.monotonic() > deadline:
+                raise TimeoutError('Sweep of {model} is not completed in {t} s.'.format(model=self.model, t=timeout))
+            profiling.sleep(self, interval)
+
     def set_auto_zero(self, is_on):
         """
         Enable or disable auto zero
@@ -326,95 +432,88 @@ class ModelAQ6370(VisaInstrument, TypeOSA):
     def get_setup(self, param):
         return self.query(':SENS:%s?' % param)
 
+    def get_wdm_display_type(self):
+        """
+        Get display type and relation of WDM analysis, which decide the fields of WDM analysis data.
+        The result is cached in the session until a :CALC:PAR:WDM command (or a reset) is sent through a
+        ModelAQ6370 object. Call clear_wdm_display_type if it is changed otherwise, such as on the front panel.
+        :return: (tuple) (int display type: ABSolute|0, RELative|1, MDRift|2, GDRift|3,
+            int relation: OFFSET|0, SPACING|1)
+        """
+        with self.session.lock:
+            display_type = self.session.state.get('wdm_display_type')
+            if display_type is None:
+                d_type, relation = self.query(':CALC:PAR:WDM:DTYP?;:CALC:PAR:WDM:REL?').split(';')
+                display_type = self.session.state['wdm_display_type'] = (int(d_type), int(relation))
+            return display_type
+
+    def clear_wdm_display_type(self):
+        """
+        Drop the cached WDM display type, so that it is queried again at next get_wdm_display_type.
+        """
+        with self.session.lock:
+            self.session.state.pop('wdm_display_type', None)
+
+    def get_analysis_fields(self, cat):
+        """
+        Get field names of each channel (WDM) or of the result (other categories) in analysis data.
+        :param cat: (str) "WDM"|"DFBLD"|"FPLD"|"SMSR"
+        :return: (tuple of str) field names
+        """
+        if cat not in self._analysis_cat:
+            raise ValueError('Invalid cat: %r' % cat)
+        if cat != 'WDM':
+            return _ANALYSIS_FIELDS[cat]
+        d_type, relation = self.get_wdm_display_type()
+        if d_type == 0:
+            return _WDM_FIELDS[(0, relation)]
+        return _WDM_FIELDS[d_type]
+
+    def parse_analysis_data(self, cat, data):
+        """
+        Decode data of analysis item into numbers.
+        For WDM, all the channels are decoded into columns: {"ch_num": int, field: numpy.ndarray of each channel},
+        for other categories: {field: float}. Wavelengths are in m, levels in dBm or dB.
+        :param cat: (str) "WDM"|"DFBLD"|"FPLD"|"SMSR"
+        :param data: (str) data returned by method: get_analysis_data
+        :return: (dict) field => value
+        """
+        fields = self.get_analysis_fields(cat)
+        values = np.array(data.split(','), dtype=float)
+        if cat != 'WDM':
+            if len(values) < len(fields):
+                raise ValueError('Invalid %s analysis data: %r' % (cat, data))
+            return dict(zip(fields, values.tolist()))
+        ch_num = int(values[0])
+        if len(values) - 1 != ch_num*len(fields):
+            raise ValueError('Invalid WDM analysis data of %d channels, with %d values' % (ch_num, len(values)))
+        columns = values[1:].reshape(ch_num, len(fields)).T.copy()
+        r_data = {"ch_num": ch_num}
+        r_data.update(zip(fields, columns))
+        return r_data
+
+    def get_analysis_results(self, cat=None):
+        """
+        Get and decode data of analysis item, see parse_analysis_data.
+        :param cat: (str|None) current analysis item, it is queried if None
+        :return: (dict) field => value
+        """
+        if cat is None:
+            cat = self.get_analysis_cat()
+        return self.parse_analysis_data(cat, self.get_analysis_data())
+
     def format_data(self, cat, data):
         """
         Format data into dict, depends on calculate category (Anasis Category)
-        :param cat: (str) "DFB"|"FP"|"WDM"
+        Only the first channel is formatted for WDM, use parse_analysis_data for all the channels.
+        :param cat: (str) "DFBLD"|"FPLD"|"WDM"|"SMSR"
         :param data: (str) data retruned by method: get_analysis_data
         :return: (dict) a dict of test_item=>value
         """
-        if cat not in self._analysis_cat:
-            raise ValueError('Invalid cat: %r' % cat)
-        data_list = data.split(',')
-        r_data = None
-        if cat == 'DFBLD':
-            r_data = {
-                "spec_wd": data_list[0],
-                "peak_wl": data_list[1],
-                "peak_lvl": data_list[2],
-                "mode_ofst": data_list[3],
-                "smsr": data_list[4]
-            }
-        elif cat == 'FPLD':
-            r_data = {
-                "spec_wd": data_list[0],
-                "peak_wl": data_list[1],
-                "peak_lvl": data_list[2],
-                "center_wl": data_list[3],
-                "total_pow": data_list[4],
-                "mode_num": data_list[5]
-            }
-        elif cat == 'WDM':
-            #  <display type> = ABSolute|0, RELative|1, MDRift|2, GDRift|3
-            d_type = int(self.query(':CALC:PAR:WDM:DTYP?'))
-            # 0 = OFFSET, 1 = SPACING
-            relation = int(self.query(':CALC:PAR:WDM:REL?'))
-            if d_type == 0:
-                if relation == 0:
-                    r_data = {
-                        "ch_num": data_list[0],
-                        "center_wl": data_list[1],
-                        "peak_lvl": data_list[2],
-                        "offset_wl": data_list[3],
-                        "offset_lvl": data_list[4],
-                        "noise": data_list[5],
-                        "snr": data_list[6]
-                    }
-                elif relation == 1:
-                    r_data = {
-                        "ch_num": data_list[0],
-                        "center_wl": data_list[1],
-                        "peak_lvl": data_list[2],
-                        "spacing": data_list[3],
-                        "lvl_diff": data_list[4],
-                        "noise": data_list[5],
-                        "snr": data_list[6]
-                    }
-            elif d_type == 1:
-                r_data = {
-                    "ch_num": data_list[0],
-                    "grid_wl": data_list[1],
-                    "center_wl": data_list[2],
-                    "rel_wl": data_list[3],
-                    "peak_lvl": data_list[4],
-                    "noise": data_list[5],
-                    "snr": data_list[6]
-                }
-            elif d_type == 2:
-                r_data = {
-                    "ch_num": data_list[0],
-                    "grid_wl": data_list[1],
-                    "center_wl": data_list[2],
-                    "wl_diff_max": data_list[3],
-                    "wl_diff_min": data_list[4],
-                    "ref_lvl": data_list[5],
-                    "peak_lvl": data_list[6],
-                    "lvl_diff_max": data_list[7],
-                    "lvl_diff_min": data_list[8]
-                }
-            elif d_type == 3:
-                r_data = {
-                    "ch_num": data_list[0],
-                    "ref_wl": data_list[1],
-                    "center_wl": data_list[2],
-                    "wl_diff_max": data_list[3],
-                    "wl_diff_min": data_list[4],
-                    "ref_lvl": data_list[5],
-                    "peak_lvl": data_list[6],
-                    "lvl_diff_max": data_list[7],
-                    "lvl_diff_min": data_list[8]
-                }
-        return r_data
+        fields = self.get_analysis_fields(cat)
+        if cat == 'WDM':
+            fields = ('ch_num',) + fields
+        return dict(zip(fields, data.split(',')))
 
     def clear_all_markers(self):
         """
@@ -449,19 +548,228 @@ class ModelAQ6370(VisaInstrument, TypeOSA):
     def clear_all_traces(self):
         return self.command(':TRAC:DEL:ALL')
 
-    def get_trace_data_x(self, trace_name):
+    def get_trace_array_x(self, trace_name, dtype='float64'):
+        """
+        Get x data of trace (wavelength in m) in binary (REAL,64) transfer.
+        :param trace_name: (str) 'TRA'|'TRB'|'TRC'|'TRD'|'TRE'|'TRF'|'TRG'
+        :param dtype: (str|numpy.dtype) 'float64' or 'float32'
+        :return: (numpy.ndarray) x data of trace
+        """
+        return self._query_trace_array('X', trace_name, dtype)
+
+    def get_trace_array_y(self, trace_name, dtype='float64'):
+        """
+        Get y data of trace (level) in binary (REAL,64) transfer.
+        :param trace_name: (str) 'TRA'|'TRB'|'TRC'|'TRD'|'TRE'|'TRF'|'TRG'
+        :param dtype: (str|numpy.dtype) 'float64' or 'float32'
+        :return: (numpy.ndarray) y data of trace
+        """
+        return self._query_trace_array('Y', trace_name, dtype)
+
+    def _query_trace_array(self, axis, trace_name, dtype='float64', start_idx=None, stop_idx=None):
         if trace_name not in ['TRA', 'TRB', 'TRC', 'TRD', 'TRE', 'TRF', 'TRG']:
             raise ValueError('Invalid trace_name: %r' % trace_name)
-        result_str = self.query(':TRACE:X? %s' % trace_name)
-        result_list = [float(i) for i in result_str.split(',')]
-        return result_list
+        trace_param = trace_name
+        if start_idx is not None:
+            # sampling points of instrument are 1 based and inclusive
+            trace_param += ',%d,%d' % (start_idx + 1, stop_idx)
+        # switch to binary format only for this query, and restore ASCII format in the same message
+        cmd = ':FORM:DATA REAL,64;:TRACE:%s? %s;:FORM:DATA ASC' % (axis, trace_param)
+        values = self.query_binary_values(cmd, 'd', is_big_endian=False, container=np.array)
+        return values.astype(dtype, copy=False)
+
+    def get_trace_data_x(self, trace_name):
+        """
+        Get x data of trace (wavelength in m).
+        :return: (list of float) x data of trace
+        """
+        return self.get_trace_array_x(trace_name).tolist()
 
     def get_trace_data_y(self, trace_name):
+        """
+        Get y data of trace (level).
+        :return: (list of float) y data of trace
+        """
+        return self.get_trace_array_y(trace_name).tolist()
+
+    def get_trace_axis(self, trace_name):
+        """
+        Get the x axis of trace in one query: wavelength range of the sweep, and sampling points of the trace.
+        :param trace_name: (str) 'TRA'|'TRB'|'TRC'|'TRD'|'TRE'|'TRF'|'TRG'
+        :return: (tuple) (float start wavelength in m, float stop wavelength in m, int sampling points)
+        """
+        if trace_name not in ['TRA', 'TRB', 'TRC', 'TRD', 'TRE', 'TRF', 'TRG']:
+            raise ValueError('Invalid trace_name: %r' % trace_name)
+        start, stop, points = self.query(':SENS:WAV:STAR?;:SENS:WAV:STOP?;:TRAC:SNUM? %s' % trace_name).split(';')
+        return float(start), float(stop), int(points)
+
+    def _get_trace_sampling(self, trace_names):
+        """
+        Get the x axis of traces in one query, see get_trace_axis, and the way to get the x data.
+        The x data can be rebuilt from the wavelength range only if the X-axis is in wavelength (sampling points are
+        linear in wavelength) and no trace is fixed (held with the data of a former sweep).
+        :param trace_names: (list of str) traces sharing the x axis
+        :return: (tuple) (float start wavelength in m, float stop wavelength in m, int sampling points of the first
+            trace, bool if x data can be rebuilt, int X-axis unit: 0 wavelength, 1 frequency)
+        """
+        cmd = ':SENS:WAV:STAR?;:SENS:WAV:STOP?;:TRAC:SNUM? %s;:UNIT:X?;%s' % (
+            trace_names[0], ';'.join(':TRAC:ATTR:%s?' % i for i in trace_names))
+        reply = self.query(cmd).split(';')
+        start, stop, points, x_unit = float(reply[0]), float(reply[1]), int(reply[2]), int(reply[3])
+        if x_unit not in (0, 1):
+            raise ValueError('X-axis unit of %s is not wavelength or frequency: %d' % (self.model, x_unit))
+        # trace attribute 1: FIX
+        rebuild = x_unit == 0 and all(int(i) != 1 for i in reply[4:])
+        return start, stop, points, rebuild, x_unit
+
+    def _get_trace_x(self, trace_name, sampling, dtype, start_idx=0, stop_idx=None, out=None):
+        """
+        x data (wavelength in m) of trace in window [start_idx, stop_idx) of sampling points, rebuilt from the
+        wavelength range or queried, see _get_trace_sampling. If out is given, x data is written in it, and the
+        rebuilt x data does not allocate new arrays.
+        """
+        start, stop, points, rebuild, x_unit = sampling
+        stop_idx = points if stop_idx is None else stop_idx
+        if rebuild:
+            step = (stop - start)/(points - 1) if points > 1 else 0.0
+            if out is None:
+                return (start + step*np.arange(start_idx, stop_idx)).astype(dtype, copy=False)
+            # index ramp kept across calls
+            if self.__index_ramp is None or len(self.__index_ramp) < stop_idx:
+                self.__index_ramp = np.arange(stop_idx, dtype='float64')
+            np.multiply(self.__index_ramp[start_idx:stop_idx], step, out=out)
+            out += start
+            return out
+        if start_idx == 0 and stop_idx == points:
+            x = self._query_trace_array('X', trace_name)
+        else:
+            x = self._query_trace_array('X', trace_name, 'float64', start_idx, stop_idx)
+        if x_unit == 1:
+            # frequency in Hz to wavelength in m
+            x = LIGHT_SPEED*10**3/x
+        if out is None:
+            return x.astype(dtype, copy=False)
+        out[:] = x
+        return out
+
+    def get_trace(self, trace_name, start_idx=None, stop_idx=None, dtype='float64'):
+        """
+        Get x and y data of trace, or of a window of sampling points. Only y data of the window is transferred, and
+        x data is rebuilt from the wavelength range, so the trace should be measured with the current settings. If
+        the X-axis is in frequency, or the trace is fixed, x data is queried as well.
+        :param trace_name: (str) 'TRA'|'TRB'|'TRC'|'TRD'|'TRE'|'TRF'|'TRG'
+        :param start_idx: (int|None) 0 based index of the first sampling point, None for 0
+        :param stop_idx: (int|None) index after the last sampling point (exclusive), None for the end of trace
+        :param dtype: (str|numpy.dtype) 'float64' or 'float32'
+        :return: (tuple) (numpy.ndarray x data in m, numpy.ndarray y data), in the order of sampling points, which
+            is descending in wavelength if the X-axis is in frequency.
+        """
+        if trace_name not in ['TRA', 'TRB', 'TRC', 'TRD', 'TRE', 'TRF', 'TRG']:
+            raise ValueError('Invalid trace_name: %r' % trace_name)
+        try:
+            start_idx = 0 if start_idx is None else operator.index(start_idx)
+            stop_idx = None if stop_idx is None else operator.index(stop_idx)
+        except TypeError:
+            raise TypeError('Param start_idx and stop_idx should be int')
+        sampling = self._get_trace_sampling([trace_name])
+        points = sampling[2]
+        stop_idx = points if stop_idx is None else stop_idx
+        if not 0 <= start_idx < stop_idx <= points:
+            raise ValueError('Invalid sampling point window [%d, %d) of %d points' % (start_idx, stop_idx, points))
+        x = self._get_trace_x(trace_name, sampling, dtype, start_idx, stop_idx)
+        if start_idx == 0 and stop_idx == points:
+            y = self._query_trace_array('Y', trace_name, dtype)
+        else:
+            y = self._query_trace_array('Y', trace_name, dtype, start_idx, stop_idx)
+        return x, y
+
+    def get_spectrum(self, x_unit='NM', trace_name='TRA'):
+        """
+        Get the spectrum of a trace, see get_trace.
+        :param x_unit: (str) 'NM'|'THZ'
+        :param trace_name: (str) 'TRA'|'TRB'|'TRC'|'TRD'|'TRE'|'TRF'|'TRG'
+        :return: (tuple) (numpy.ndarray ascending wavelength in nm or frequency in THz, numpy.ndarray level in dBm)
+        """
+        if x_unit not in ['NM', 'THZ']:
+            raise ValueError('Invalid x_unit: %r' % x_unit)
+        x, y = self.get_trace(trace_name)
+        # ascending in wavelength
+        if len(x) > 1 and x[0] > x[-1]:
+            x, y = x[::-1], y[::-1]
+        if x_unit == 'NM':
+            return x*10**9, y
+        return LIGHT_SPEED/(x[::-1]*10**9), y[::-1]
+
+    def get_trace_in_window(self, trace_name, start_wl, stop_wl, dtype='float64'):
+        """
+        Get x and y data of the sampling points of trace in a wavelength window, see get_trace.
+        :param trace_name: (str) 'TRA'|'TRB'|'TRC'|'TRD'|'TRE'|'TRF'|'TRG'
+        :param start_wl: (float|int) start wavelength in nm
+        :param stop_wl: (float|int) stop wavelength in nm
+        :param dtype: (str|numpy.dtype) 'float64' or 'float32'
+        :return: (tuple) (numpy.ndarray x data in m, numpy.ndarray y data)
+        """
         if trace_name not in ['TRA', 'TRB', 'TRC', 'TRD', 'TRE', 'TRF', 'TRG']:
             raise ValueError('Invalid trace_name: %r' % trace_name)
-        result_str = self.query(':TRACE:Y? %s' % trace_name)
-        result_list = [float(i) for i in result_str.split(',')]
-        return result_list
+        for i in start_wl, stop_wl:
+            if not isinstance(i, numbers.Real):
+                raise TypeError('Param start_wl and stop_wl should be number')
+        if not 0 < start_wl < stop_wl:
+            raise ValueError('Invalid start and stop value. Start and stop should be positive number, and start < stop')
+        sampling = self._get_trace_sampling([trace_name])
+        start, stop, points = sampling[:3]
+        # x data of all the sampling points, rebuilt on the host if possible
+        x = self._get_trace_x(trace_name, sampling, 'float64')
+        # tolerance of rounding errors, in m
+        tolerance = 1e-6*(stop - start)/(points - 1) if points > 1 else 0.0
+        inside = np.flatnonzero((x >= start_wl*1e-9 - tolerance) & (x <= stop_wl*1e-9 + tolerance))
+        if not len(inside):
+            raise ValueError('No sampling point in wavelength window %s ~ %s nm' % (start_wl, stop_wl))
+        start_idx, stop_idx = int(inside[0]), int(inside[-1]) + 1
+        return (x[start_idx:stop_idx].astype(dtype, copy=False),
+                self._query_trace_array('Y', trace_name, dtype, start_idx, stop_idx))
+
+    def get_traces(self, trace_names, dtype='float64', out=None, x_out=None):
+        """
+        Get y data of several traces in one compound binary query, sharing one x axis rebuilt from the wavelength
+        range (see get_trace). All the traces should have the same sampling points.
+        With out and x_out, such as the arrays returned by the previous call, memory is reused across calls: for
+        float64, y data is read from the instrument straight into the rows of out.
+        :param trace_names: (list of str) 'TRA'|'TRB'|'TRC'|'TRD'|'TRE'|'TRF'|'TRG'
+        :param dtype: (str|numpy.dtype) 'float64' or 'float32'
+        :param out: (numpy.ndarray|None) C-contiguous array of shape (traces, sampling points) and dtype to write y
+            data in. None to allocate a new one.
+        :param x_out: (numpy.ndarray|None) array of shape (sampling points,) and dtype to write x data in. None to
+            allocate a new one.
+        :return: (tuple) (numpy.ndarray x data in m, numpy.ndarray y data of shape (traces, sampling points))
+        """
+        trace_names = list(trace_names)
+        if not trace_names:
+            raise ValueError('trace_names should not be empty')
+        for trace_name in trace_names:
+            if trace_name not in ['TRA', 'TRB', 'TRC', 'TRD', 'TRE', 'TRF', 'TRG']:
+                raise ValueError('Invalid trace_name: %r' % trace_name)
+        dtype = np.dtype(dtype)
+        sampling = self._get_trace_sampling(trace_names)
+        points = sampling[2]
+        shape = (len(trace_names), points)
+        if out is None:
+            out = np.empty(shape, dtype=dtype)
+        elif out.shape != shape or out.dtype != dtype or not out.flags.c_contiguous:
+            raise ValueError('out should be a C-contiguous array of shape %r and dtype %s' % (shape, dtype))
+        if x_out is not None and (x_out.shape != (points,) or x_out.dtype != dtype):
+            raise ValueError('x_out should be an array of shape %r and dtype %s' % ((points,), dtype))
+        # REAL,64 data is little endian, read it into out directly if the dtype is the same
+        direct = dtype == np.dtype('<f8')
+        buffer = out if direct else np.empty(shape, dtype='<f8')
+        cmd = ':FORM:DATA REAL,64;%s;:FORM:DATA ASC' % ';'.join(':TRACE:Y? %s' % i for i in trace_names)
+        lengths = self.query_binary_blocks(cmd, len(trace_names), out=list(buffer))
+        for length, trace_name in zip(lengths, trace_names):
+            if length != points*8:
+                raise ValueError('Sampling points of %s are different from %s' % (trace_name, trace_names[0]))
+        if not direct:
+            out[:] = buffer
+        return self._get_trace_x(trace_names[0], sampling, dtype, out=x_out), out
 
     def capture_screen(self):
         """
@@ -473,8 +781,7 @@ class ModelAQ6370(VisaInstrument, TypeOSA):
         self.command(':MMEMORY:STORE:GRAPHICS COLOR,BMP,"{filename}",INTERNAL'.format(filename=temp_filename))
         self.opc
         # save data to PC
-        bin_data = self.query(':MMEMORY:DATA? "{filename}.BMP",internal'.format(filename=temp_filename), bin=True)
-        bytes_data = bytes(bin_data)
+        bytes_data = self.query_binary(':MMEMORY:DATA? "{filename}.BMP",internal'.format(filename=temp_filename))
         # delete temp file from internal memory
         self.command(':MMEMORY:DELETE "{filename}.BMP",internal'.format(filename=temp_filename))
         return bytes_data
@@ -2,7 +2,7 @@ from ._BaseInstrument import BaseInstrument
 from ._VisaInstrument import VisaInstrument
 from ..instrument_types import TypeSW
 from ..constants import LIGHT_SPEED
-import time
+from .. import profiling
 
 
 class ModelAT5524(VisaInstrument, TypeSW):
@@ -25,7 +25,7 @@ class ModelAT5524(VisaInstrument, TypeSW):
     def set_channel(self, channel):
         if channel in range(1, 5):
             self.command('SW {ch}'.format(ch=channel))
-            time.sleep(0.5)
+            profiling.sleep(self, 0.5)
         else:
             raise ValueError('Please choose channel 1~4!')
 
@@ -2,8 +2,8 @@ from ._VisaInstrument import VisaInstrument
 from ..instrument_types import TypeTS
 from ..utils import int_to_complement, complement_to_int, calc_check_sum
 from ..constants import TemperatureUnit
+from .. import profiling
 import serial
-import time
 
 
 class ModelATS535(VisaInstrument, TypeTS):
@@ -37,7 +37,7 @@ class ModelATS535(VisaInstrument, TypeTS):
         Reset the system to the Operator screen
         """
         self.command('RSTO')
-        time.sleep(0.3)
+        profiling.sleep(self, 0.3)
 
     def set_n(self, n):
         return self.command('SETN %d' % n)
@@ -3,6 +3,8 @@ from ..instrument_types import TypeOTF
 from ..constants import LIGHT_SPEED
 import serial
 import re
+from .. import profiling
+from ..instrument_types._StateCache import cached_setter, cached_getter
 
 
 class ModelBTF10011(BaseInstrument, TypeOTF):
@@ -51,13 +53,16 @@ class ModelBTF10011(BaseInstrument, TypeOTF):
     def __clear_input_buffer(self):
         self.__serial.reset_input_buffer()
 
+    @profiling.profiled('serial', 'write')
     def __write(self, cmd):
         self.__clear_input_buffer()
         self.__serial.write(('%s%s' % (cmd, self.__write_termination)).encode())
 
+    @profiling.profiled('serial', 'read')
     def __readline(self):
         return self.__serial.readline()
 
+    @cached_getter('wavelength')
     def get_wavelength(self):
         """
         Reads out the setting value of the filter center wavelength.
@@ -80,6 +85,7 @@ class ModelBTF10011(BaseInstrument, TypeOTF):
         else:
             return float(re.search('.*WL\((.*?)\).*', data).group(1))
 
+    @cached_setter('wavelength', normalize=lambda value: round(value, 2))
     def set_wavelength(self, value):
         """
         Sets the filter center wavelength.
@@ -3,8 +3,10 @@ from ..instrument_types import TypePOLC
 from ..constants import LIGHT_SPEED
 import math
 import time
-import ftd2xx as ftd
 import ctypes
+from .. import profiling
+from ..dependencies import add_dll_dependencies
+from ..instrument_types._StateCache import cached_setter, cached_getter
 
 
 class ModelEPS1000(BaseInstrument, TypePOLC):
@@ -29,6 +31,9 @@ class ModelEPS1000(BaseInstrument, TypePOLC):
         self.__device_num = None
         self.__device = None
 
+        # optional native dependency, loaded when the model is instantiated
+        add_dll_dependencies()
+        import ftd2xx as ftd
         device_list = ftd.listDevices()
 
         for i in range(len(device_list)):
@@ -60,6 +65,7 @@ class ModelEPS1000(BaseInstrument, TypePOLC):
     def check_connection(self):
         return self.__connected
 
+    @profiling.profiled('usb', 'write')
     def write_register(self, addr, data):
         if not self.__connected:
             raise ValueError('Device is closed. Please connect first.')
@@ -68,6 +74,7 @@ class ModelEPS1000(BaseInstrument, TypePOLC):
         write_str_c = ctypes.create_string_buffer(write_str.encode('utf-8'), 9)
         self.__device.write(write_str_c)
 
+    @profiling.profiled('usb', 'read')
     def read_register(self, addr):
         if not self.__connected:
             raise ValueError('Device is closed. Please connect first.')
@@ -149,15 +156,17 @@ class ModelEPS1000(BaseInstrument, TypePOLC):
         self.write_register(speed_reg_addr0, speed_lsb)
         self.write_register(speed_reg_addr1, speed_msb)
 
+    @cached_getter('frequency')
     def get_frequency(self):
         value = int(self.read_register(addr=25))
         freq = (value + 1828)/10
         return freq
 
+    @cached_setter('frequency', normalize=lambda value: (round(value*10 - 1828) + 1828)/10)
     def set_frequency(self, frequency):
         value = round(frequency*10 - 1828)
         self.write_register(addr=25, data=value)
-        time.sleep(0.1)
+        profiling.sleep(self, 0.1)
 
     def get_wavelength(self):
         freq = self.get_frequency()
@@ -200,7 +209,7 @@ class ModelEPS1000(BaseInstrument, TypePOLC):
             self.stop_scrambling()
             self.write_register(addr=23, data=0)
             self.write_register(addr=24, data=0)
-            time.sleep(0.1)
+            profiling.sleep(self, 0.1)
 
             qwp_speed = speed / 6
             offset = 0.02
@@ -2,6 +2,7 @@ from ._VisaInstrument import VisaInstrument
 from ..instrument_types import TypeVOA
 from ..constants import LIGHT_SPEED
 import math
+from ..instrument_types._StateCache import cached_setter, cached_getter
 
 class Model81571A(VisaInstrument, TypeVOA):
     model = "81571A"
@@ -41,6 +42,7 @@ class Model81571A(VisaInstrument, TypeVOA):
 
     # Methods
 
+    @cached_setter('enabled')
     def enable(self, status=True):
         """
         Set VOA output enabled/disabled.
@@ -51,6 +53,7 @@ class Model81571A(VisaInstrument, TypeVOA):
         status_str = str(int(status))
         return self.command(":OUTP" + str(self.slot) + " " + status_str)
 
+    @cached_getter('enabled')
     def is_enabled(self):
         """
         Get enable status of VOA.
@@ -61,6 +64,7 @@ class Model81571A(VisaInstrument, TypeVOA):
             status = bool(int(status))
         return status
 
+    @cached_getter('att')
     def get_att(self):
         """
         Get att value in dB.
@@ -70,6 +74,7 @@ class Model81571A(VisaInstrument, TypeVOA):
         att = float(att_str)
         return att
 
+    @cached_getter('offset')
     def get_offset(self):
         """
         Get att offset value in dB.
@@ -79,6 +84,7 @@ class Model81571A(VisaInstrument, TypeVOA):
         offset = float(offset_str)
         return offset
 
+    @cached_getter('wavelength')
     def get_wavelength(self):
         """
         :return: (float) optical wavelength in nm
@@ -90,6 +96,7 @@ class Model81571A(VisaInstrument, TypeVOA):
     def get_frequency(self):
         return LIGHT_SPEED/self.get_wavelength()
 
+    @cached_getter('cal')
     def get_cal(self):
         """
         :return: (float) power monitor calibration offset in dB
@@ -98,6 +105,7 @@ class Model81571A(VisaInstrument, TypeVOA):
         cal = float(cal_str)
         return cal
 
+    @cached_setter('att')
     def set_att(self, value):
         """
         Set att value in dB.
@@ -109,6 +117,7 @@ class Model81571A(VisaInstrument, TypeVOA):
             raise ValueError('Att value out of range')
         return self.command("INP" + str(self.slot) + ":ATT " + str(value) + "dB")
 
+    @cached_setter('offset', invalidates=('att',))
     def set_offset(self, value):
         """
         Set att offset value in dB.
@@ -116,6 +125,7 @@ class Model81571A(VisaInstrument, TypeVOA):
         """
         return self.command("INP"+str(self.slot)+":OFFS "+str(value)+"dB")
 
+    @cached_setter('wavelength')
     def set_wavelength(self, value):
         """
         Set wavelength value in nm.
@@ -130,6 +140,7 @@ class Model81571A(VisaInstrument, TypeVOA):
     def set_frequency(self, value):
         return self.set_wavelength(round(LIGHT_SPEED/value, 4))
 
+    @cached_setter('cal')
     def set_cal(self, value):
         """
         Set calibration offset in dB
@@ -2,6 +2,7 @@ from ._VisaInstrument import VisaInstrument
 from ..instrument_types import TypeOPM
 from ..constants import OpticalUnit, LIGHT_SPEED
 import math
+from ..instrument_types._StateCache import cached_setter, cached_getter, _MISSING
 
 class Model81635A(VisaInstrument, TypeOPM):
     brand = "Keysight"
@@ -67,6 +68,7 @@ class Model81635A(VisaInstrument, TypeOPM):
         value = float(value_str)
         return value
 
+    @cached_getter('power_unit')
     def get_power_unit(self):
         """
         OpticalUnit.DBM.value = 0, OpticalUnit.W.value = 1
@@ -81,6 +83,22 @@ class Model81635A(VisaInstrument, TypeOPM):
             unit = None
         return unit
 
+    def get_power(self):
+        """
+        Get power value and unit in one compound query, or only the value if the unit is in the state cache.
+        :return: (tuple) (float value, int unit), unit is value of (enum 'OpticalUnit')
+        """
+        unit = self._get_cached_state('power_unit', _MISSING)
+        if unit is not _MISSING:
+            return self.get_power_value(), unit
+        reply = self.query(":SENS%d:CHAN%d:POW:UNIT?;:FETC%d:CHAN%d:POW?" % (self.slot, self.channel, self.slot,
+                                                                            self.channel))
+        unit_str, value_str = reply.split(';')
+        unit = {0: OpticalUnit.DBM.value, 1: OpticalUnit.W.value}.get(int(unit_str))
+        self._set_cached_state('power_unit', unit)
+        return float(value_str), unit
+
+    @cached_getter('avg_time')
     def get_avg_time(self):
         """
         Get averaging time in ms.
@@ -89,6 +107,7 @@ class Model81635A(VisaInstrument, TypeOPM):
         avg_in_ms = avg_in_s*1E+3
         return avg_in_ms
 
+    @cached_getter('cal')
     def get_cal(self):
         """
         :return: (float) calibration offset in dB
@@ -97,6 +116,7 @@ class Model81635A(VisaInstrument, TypeOPM):
         cal = float(cal_str)
         return cal
 
+    @cached_getter('wavelength')
     def get_wavelength(self):
         """
         :return: (float) optical wavelength in nm
@@ -108,6 +128,7 @@ class Model81635A(VisaInstrument, TypeOPM):
     def get_frequency(self):
         return LIGHT_SPEED/self.get_wavelength()
 
+    @cached_setter('power_unit')
     def set_power_unit(self, unit):
         """
         Set optical power unit
@@ -115,6 +136,7 @@ class Model81635A(VisaInstrument, TypeOPM):
         OpticalUnit(unit)  # check if unit is a valid value
         return self.command(":SENS%d:CHAN%d:POW:UNIT %d" % (self.slot, self.channel, unit))
 
+    @cached_setter('cal')
     def set_cal(self, value):
         """
         Set calibration offset in dB
@@ -123,6 +145,7 @@ class Model81635A(VisaInstrument, TypeOPM):
             raise TypeError('Calibration value should be number')
         return self.command(':sens%d:chan%d:corr %sDB' % (self.slot, self.channel, value))
 
+    @cached_setter('wavelength')
     def set_wavelength(self, value):
         """
         Set optical wavelength in nm
@@ -143,6 +166,7 @@ class Model81635A(VisaInstrument, TypeOPM):
         """
         return self._min_wl, self._max_wl
 
+    @cached_setter('avg_time')
     def set_avg_time(self, value):
         """
         set avg time in ms
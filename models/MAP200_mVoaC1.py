@@ -3,6 +3,7 @@ from ._VisaInstrument import VisaInstrument
 from ..constants import LIGHT_SPEED, OpticalUnit
 from ..utils import dbm_to_w
 import math
+from ..instrument_types._StateCache import cached_setter, cached_getter
 
 
 class ModelMAP200_mVoaC1(VisaInstrument, TypeVOA, TypeOPM):
@@ -47,6 +48,7 @@ class ModelMAP200_mVoaC1(VisaInstrument, TypeVOA, TypeOPM):
         self._max_cal = 200
 
     # -- methods --
+    @cached_setter('enabled')
     def enable(self, status=True):
         """
         Enable/disable VOA output.
@@ -57,6 +59,7 @@ class ModelMAP200_mVoaC1(VisaInstrument, TypeVOA, TypeOPM):
         cmd = ':OUTPut:BBLock {device},{state:d}'.format(device=self.__device, state=beam_block)
         self.command(cmd)
 
+    @cached_getter('enabled')
     def is_enabled(self):
         """
         If VOA output is enabled.
@@ -68,6 +71,7 @@ class ModelMAP200_mVoaC1(VisaInstrument, TypeVOA, TypeOPM):
         enabled = not beam_block
         return enabled
 
+    @cached_getter('att')
     def get_att(self):
         """
         Get ATT setting value in dB.
@@ -78,6 +82,7 @@ class ModelMAP200_mVoaC1(VisaInstrument, TypeVOA, TypeOPM):
         att = float(self.query(cmd))
         return att
 
+    @cached_getter('offset')
     def get_offset(self):
         """
         Get ATT offset value in dB.
@@ -88,6 +93,7 @@ class ModelMAP200_mVoaC1(VisaInstrument, TypeVOA, TypeOPM):
         offset = float(self.query(cmd))
         return offset
 
+    @cached_getter('wavelength')
     def get_wavelength(self):
         """
         :Returns: float, optical wavelength in nm
@@ -99,6 +105,7 @@ class ModelMAP200_mVoaC1(VisaInstrument, TypeVOA, TypeOPM):
     def get_frequency(self):
         return LIGHT_SPEED/self.get_wavelength()
 
+    @cached_setter('att', normalize=lambda value: round(value, 4))
     def set_att(self, value):
         """
         Set att value in dB.
@@ -110,6 +117,7 @@ class ModelMAP200_mVoaC1(VisaInstrument, TypeVOA, TypeOPM):
         cmd = ':OUTPut:ATTenuation {device},{att:.4f}'.format(device=self.__device, att=value)
         self.command(cmd)
 
+    @cached_setter('offset', invalidates=('att',), normalize=lambda value: round(value, 4))
     def set_offset(self, value):
         """
         Set ATT offset value in dB.
@@ -121,6 +129,7 @@ class ModelMAP200_mVoaC1(VisaInstrument, TypeVOA, TypeOPM):
         cmd = ':OUTPut:POWer:OFFSet {device},{offset:.4f}'.format(device=self.__device, offset=value)
         self.command(cmd)
 
+    @cached_setter('wavelength', normalize=lambda value: round(value, 4))
     def set_wavelength(self, value):
         """
         Set wavelength value in nm.
@@ -160,6 +169,15 @@ class ModelMAP200_mVoaC1(VisaInstrument, TypeVOA, TypeOPM):
         """
         return OpticalUnit.DBM.value
 
+    def get_power(self):
+        """
+        The unit is fixed as dBm, so only the value is queried.
+
+        :Return Type: tuple(float value, int unit)
+        """
+        return self.get_power_value(), OpticalUnit.DBM.value
+
+    @cached_getter('cal')
     def get_cal(self):
         """
         :Returns: float, calibration offset in dB
@@ -168,6 +186,7 @@ class ModelMAP200_mVoaC1(VisaInstrument, TypeVOA, TypeOPM):
         cal = float(self.query(cmd))
         return cal
 
+    @cached_getter('avg_time')
     def get_avg_time(self):
         """
         Get averaging time in ms.
@@ -187,6 +206,7 @@ class ModelMAP200_mVoaC1(VisaInstrument, TypeVOA, TypeOPM):
         else:
             raise ValueError('Optical Unit of mVoaC1 is fixed as dBm.')
 
+    @cached_setter('cal', normalize=lambda value: round(value, 4))
     def set_cal(self, value): 
         """
         Set calibration offset in dB.
@@ -198,6 +218,7 @@ class ModelMAP200_mVoaC1(VisaInstrument, TypeVOA, TypeOPM):
         cmd = ':SENSe:POWer:OFFSet {device},{offset:.4f}'.format(device=self.__device, offset=value)
         self.command(cmd)
 
+    @cached_setter('avg_time', normalize=lambda value: round(value, 4))
     def set_avg_time(self, value):
         """
         Set averaging time in ms.
@@ -1,6 +1,7 @@
 from ._BaseInstrument import BaseInstrument
 from ..instrument_types import TypeTS
 from ..constants import TemperatureUnit
+from .. import profiling
 import serial
 
 class ModelMC811(BaseInstrument, TypeTS):
@@ -19,11 +20,13 @@ class ModelMC811(BaseInstrument, TypeTS):
     def resource_name(self):
         return self.__resource_name
 
+    @profiling.profiled('serial', 'write')
     def write_cmd(self, cmd):
         full_cmd = '{cmd}{termination}'.format(cmd=cmd, termination=self.__termination)
         self.__serial.reset_input_buffer()
         self.__serial.write(full_cmd.encode())
 
+    @profiling.profiled('serial', 'read')
     def read_reply(self):
         r = ''
         while True:
@@ -2,6 +2,7 @@ from ._VisaInstrument import VisaInstrument
 from ..instrument_types import TypePOLC
 from ..constants import LIGHT_SPEED
 import math
+from ..instrument_types._StateCache import cached_setter, cached_getter
 
 
 class ModelMPC202(VisaInstrument, TypePOLC):
@@ -26,6 +27,7 @@ class ModelMPC202(VisaInstrument, TypePOLC):
         self._min_freq = math.floor(LIGHT_SPEED*1000/self._max_wl)/1000 + 0.001
         self._max_freq = math.floor(LIGHT_SPEED*1000/self._min_wl)/1000
     
+    @cached_getter('wavelength')
     def get_wavelength(self):
         """
         Get current wavelength setting (nm)
@@ -36,6 +38,7 @@ class ModelMPC202(VisaInstrument, TypePOLC):
     def get_frequency(self):
         return LIGHT_SPEED/self.get_wavelength()
 
+    @cached_setter('wavelength', normalize=lambda value: round(value, 1))
     def set_wavelength(self, wavelength):
         """
         Set wavelength setting (nm)
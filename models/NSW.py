@@ -1,7 +1,7 @@
 from ._BaseInstrument import BaseInstrument
 from ..instrument_types import TypeSW
-import time
 from ..libs.neo_usb_device import NeoUsbDevice
+from .. import profiling
 
 
 class ModelNSW(BaseInstrument, TypeSW):
@@ -65,14 +65,22 @@ class ModelNSW(BaseInstrument, TypeSW):
             connected = False
         return connected
 
+    @profiling.profiled('usb', 'write')
+    def __write_registers(self, reg_addr, data):
+        self.__usb_dev.write_registers(0xC2, reg_addr, data)
+
+    @profiling.profiled('usb', 'read')
+    def __read_registers(self, reg_addr, length):
+        return self.__usb_dev.read_registers(0xC2, reg_addr, length)
+
     def set_channel(self, channel:int):
-        self.__usb_dev.write_registers(0xC2, self.__reg_ch_sel, channel.to_bytes(1, 'big'))
-        time.sleep(0.4)
+        self.__write_registers(self.__reg_ch_sel, channel.to_bytes(1, 'big'))
+        profiling.sleep(self, 0.4)
         if self.get_channel() != channel:
             raise ValueError('Set switch channel failed.')
 
     def get_channel(self):
-        channel = int.from_bytes(self.__usb_dev.read_registers(0xC2, self.__reg_ch_sel, 1), 'big')
+        channel = int.from_bytes(self.__read_registers(self.__reg_ch_sel, 1), 'big')
         print(f'GET->{channel}')
         return channel
 
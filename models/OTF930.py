@@ -3,6 +3,7 @@ from ..instrument_types import TypeOTF
 from ..constants import OpticalUnit, LIGHT_SPEED
 from time import sleep
 import math
+from ..instrument_types._StateCache import cached_setter, cached_getter
 
 class ModelOTF930(VisaInstrument, TypeOTF):
     model = "OTF-930"
@@ -24,6 +25,7 @@ class ModelOTF930(VisaInstrument, TypeOTF):
         self.__unit = OpticalUnit.DBM
 
     # Methods
+    @cached_getter('wavelength')
     def get_wavelength(self):
         """
         Reads out the setting value of the filter center wavelength.
@@ -33,6 +35,7 @@ class ModelOTF930(VisaInstrument, TypeOTF):
         wl = float(wl_str)
         return wl
 
+    @cached_setter('wavelength')
     def set_wavelength(self, value):
         """
         Sets the filter center wavelength.
@@ -75,7 +78,9 @@ class ModelOTF930(VisaInstrument, TypeOTF):
         """
         if not isinstance(value, (float, int)):
             raise TypeError('Wavelength offset value should be number')
-        return self.command('CW %s' % str(round(value, 3)))
+        self.command('CW %s' % str(round(value, 3)))
+        # the reported wavelength includes the offset
+        self.invalidate('wavelength')
 
     def get_power_unit(self):
         """
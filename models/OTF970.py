@@ -3,6 +3,7 @@ from ..instrument_types import TypeOTF
 from ..constants import OpticalUnit
 from time import sleep
 from ..utils import bw_in_ghz_to_nm, bw_in_nm_to_ghz
+from ..instrument_types._StateCache import cached_setter, cached_getter
 
 
 class ModelOTF970(VisaInstrument, TypeOTF):
@@ -42,6 +43,7 @@ class ModelOTF970(VisaInstrument, TypeOTF):
         self._min_bw_offs = float(self.query(':OFFS:Band? MIN'))*10**9
         self._max_bw_offs = float(self.query(':OFFS:Band? MAX'))*10**9
 
+    @cached_getter('wavelength')
     def get_wavelength(self):
         """
         Reads out the setting value of the filter center wavelength.
@@ -51,6 +53,7 @@ class ModelOTF970(VisaInstrument, TypeOTF):
         wl = float(wl_str)*10**9
         return wl
 
+    @cached_setter('wavelength', invalidates=('frequency',))
     def set_wavelength(self, value):
         """
         Sets the filter center wavelength.
@@ -71,6 +74,7 @@ class ModelOTF970(VisaInstrument, TypeOTF):
         state = bool(int(state_str))
         return state
 
+    @cached_getter('frequency')
     def get_frequency(self):
         """
         Reads out the filter center wavelength in optical frequency.
@@ -80,6 +84,7 @@ class ModelOTF970(VisaInstrument, TypeOTF):
         freq = float(freq_str)/(10**12)
         return freq
 
+    @cached_setter('frequency', invalidates=('wavelength',))
     def set_frequency(self, value):
         """
         Sets the filter center wavelength in frequency(THz).
@@ -109,8 +114,11 @@ class ModelOTF970(VisaInstrument, TypeOTF):
             raise TypeError('Wavelength offset value should be number.')
         if not self._min_wl_offs <= value <= self._max_wl_offs:
             raise ValueError('Wavelength offset value out of range')
-        return self.command(':OFFS '+str(value)+'nm')
+        self.command(':OFFS '+str(value)+'nm')
+        # the reported center wavelength includes the offset
+        self.invalidate('wavelength', 'frequency')
 
+    @cached_getter('bandwidth_in_nm')
     def get_bandwidth_in_nm(self):
         """
         Reads out the filter bandwidth.
@@ -120,6 +128,7 @@ class ModelOTF970(VisaInstrument, TypeOTF):
         bw = float(bw_str)*10**9
         return bw
 
+    @cached_setter('bandwidth_in_nm')
     def set_bandwidth_in_nm(self, value):
         """
         Sets the filter bandwidth.
@@ -160,6 +169,7 @@ class ModelOTF970(VisaInstrument, TypeOTF):
             raise ValueError('Bandwidth offset value out of range')
         return self.command(':OFFS:Band '+str(value)+'nm')
 
+    @cached_getter('power_unit')
     def get_power_unit(self):
         """
         Get optical power unit of power monitor.
@@ -169,6 +179,7 @@ class ModelOTF970(VisaInstrument, TypeOTF):
         unit = int(unit_str.strip())
         return unit
 
+    @cached_setter('power_unit')
     def set_power_unit(self, unit):
         """
         Set optical power unit of power monitor.
@@ -227,10 +238,14 @@ class ModelOTF970(VisaInstrument, TypeOTF):
         return status
 
     def peak_search(self, center, span):
-        self._set_peak_search_center(center)
-        self._set_peak_search_span(span)
-        self._run_peak_search(True)
-        while True:
-            sleep(0.5)
-            if self._is_peak_search_complete():
-                return
\ No newline at end of file
+        try:
+            self._set_peak_search_center(center)
+            self._set_peak_search_span(span)
+            self._run_peak_search(True)
+            while True:
+                sleep(0.5)
+                if self._is_peak_search_complete():
+                    return
+        finally:
+            # the filter center is tuned to the peak
+            self.invalidate('wavelength', 'frequency')
\ No newline at end of file
@@ -2,6 +2,7 @@ from ._BaseInstrument import BaseInstrument
 from ..instrument_types import TypeTS
 from ..utils import int_to_complement, complement_to_int, calc_check_sum
 from ..constants import TemperatureUnit
+from .. import profiling
 import serial
 
 
@@ -21,11 +22,13 @@ class ModelTC3625(BaseInstrument, TypeTS):
     def resource_name(self):
         return self.__resource_name
 
+    @profiling.profiled('serial', 'write')
     def command(self, cmd):
         cmd_str = '{cmd}{write_termination}'.format(cmd=cmd, write_termination = self.__write_termination)
         self.__serial.write(cmd_str.encode())
         return self  # reserved for chained calling
 
+    @profiling.profiled('serial', 'read')
     def read(self):
         result_bytes = b''
         while True:
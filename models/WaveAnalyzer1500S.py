@@ -1,8 +1,80 @@
 from ..instrument_types import TypeOSA
-import requests
+import json
+import numpy as np
 import subprocess
 import threading
 import time
+import warnings
+from .. import profiling
+from ..libs.http_client import HttpClient, RETRIES
+from ..constants import LIGHT_SPEED
+
+# leading characters of a data line in scan data
+_NUMBER_START = b'+-.0123456789'
+# separators of values in scan data
+_SEPARATORS = b' \t\r\n\x0b\x0c,;'
+_IS_SEPARATOR = np.zeros(256, dtype=bool)
+_IS_SEPARATOR[np.frombuffer(_SEPARATORS, dtype=np.uint8)] = True
+
+
+def _count_tokens(data):
+    """
+    Count the values in text scan data, as the number of runs of non separator characters.
+    :param data: (bytes) text data
+    :return: (int) number of values
+    """
+    is_separator = _IS_SEPARATOR[np.frombuffer(data, dtype=np.uint8)]
+    if not is_separator.size:
+        return 0
+    return int(not is_separator[0]) + int(np.count_nonzero(is_separator[:-1] & ~is_separator[1:]))
+
+
+def decode_scan_data(content):
+    """
+    Decode scan data of the analysis server into numpy arrays.
+    Text data has a line of frequency in MHz and power in mdBm for each point, separated by whitespace, ',' or ';'.
+    Header lines (not starting with a number) are skipped. Text data is parsed by numpy in C, without intermediate
+    Python lists. JSON data should be an object with the arrays in
+    "frequency"|"freq" and "power", or a list of [frequency, power] pairs, in the same units.
+    :param content: (bytes|str) response content
+    :return: (tuple) (numpy.ndarray ascending frequency in THz, numpy.ndarray power in dBm)
+    :raise ValueError: if a value in data is not a number
+    """
+    if isinstance(content, str):
+        content = content.encode()
+    content = content.strip()
+    if content[:1] in (b'{', b'['):
+        data = json.loads(content.decode())
+        if isinstance(data, dict):
+            freq = data.get('frequency', data.get('freq'))
+            power = data.get('power')
+            if freq is None or power is None:
+                raise ValueError('Unknown scan data with keys: %r' % list(data.keys()))
+            values = np.column_stack((np.asarray(freq, dtype=float), np.asarray(power, dtype=float)))
+        else:
+            values = np.asarray(data, dtype=float)
+    else:
+        # skip header lines
+        while content and content[:1] not in _NUMBER_START:
+            end = content.find(b'\n')
+            content = content[end + 1:].lstrip() if end >= 0 else b''
+        text = content.translate(bytes.maketrans(b',;', b'  '))
+        count = _count_tokens(text)
+        try:
+            with warnings.catch_warnings():
+                # older numpy warns and stops at the first invalid value, which is caught by the count below
+                warnings.simplefilter('ignore', DeprecationWarning)
+                values = np.fromstring(text.decode(), sep=' ') if count else np.empty(0)
+        except ValueError as e:
+            raise ValueError('Invalid scan data: %s' % e)
+        if values.size != count:
+            raise ValueError('Invalid scan data: value %d of %d is not a number' % (values.size + 1, count))
+    if values.size % 2:
+        raise ValueError('Scan data should have pairs of frequency and power, got %d values' % values.size)
+    values = values.reshape(-1, 2)
+    if len(values) > 1 and values[0, 0] > values[-1, 0]:
+        values = values[::-1]
+    return values[:, 0]/10**6, values[:, 1]/1000
 
 
 class ModelWaveAnalyzer1500S(TypeOSA):
@@ -16,7 +88,7 @@ class ModelWaveAnalyzer1500S(TypeOSA):
     }
     params = []
 
-    def __init__(self, resource_name, analysis_port = 8002, analysis_exe_path = 'C:/Program Files (x86)/Finisar/WaveAnalyzer/AnalysisServer/WA-AnalysisServer.exe', timeout=5, **kwargs):
+    def __init__(self, resource_name, analysis_port = 8002, analysis_exe_path = 'C:/Program Files (x86)/Finisar/WaveAnalyzer/AnalysisServer/WA-AnalysisServer.exe', timeout=5, retries=RETRIES, **kwargs):
         super(ModelWaveAnalyzer1500S, self).__init__()
         self._min_wl = 1526.9
         self._max_wl = 1568.5
@@ -26,7 +98,9 @@ class ModelWaveAnalyzer1500S(TypeOSA):
         self.__analysis_addr = '127.0.0.1'
         self.__analysis_port = analysis_port
         self.__analysis_exe_path = analysis_exe_path
-        self.__timeout = timeout
+        self.__http = HttpClient('http://%s' % resource_name, timeout=timeout, retries=retries)
+        self.__analysis_http = HttpClient('http://%s:%d/analysis' % (self.__analysis_addr, analysis_port),
+                                          timeout=timeout, retries=retries)
 
      # param encapsulation
     @property
@@ -37,9 +111,10 @@ class ModelWaveAnalyzer1500S(TypeOSA):
     def resource_name(self, value):
         raise AttributeError('Param "resource_name" is read-only')
 
+    @profiling.profiled('http', 'get')
     def __get(self, route, parseJson=True):
-        url = 'http://%s/%s' % (self.resource_name, route)
-        m = requests.get(url, timeout=self.__timeout)
+        url = self.__http.url(route)
+        m = self.__http.get(route)
         status_code = m.status_code
         if status_code != 200:
             raise ConnectionError('Request Responsed Error Code %d. URL = %s' % (status_code, url))
@@ -48,9 +123,10 @@ class ModelWaveAnalyzer1500S(TypeOSA):
         else:
             return m.content
 
+    @profiling.profiled('http', 'get')
     def __analysis(self, route, parseJson=True):
-        url = 'http://%s:%d/analysis/%s' % (self.__analysis_addr, self.__analysis_port, route)
-        m = requests.get(url, timeout=self.__timeout)
+        url = self.__analysis_http.url(route)
+        m = self.__analysis_http.get(route)
         status_code = m.status_code
         if status_code != 200:
             raise ConnectionError('Request Responsed Error Code %d. URL = %s' % (status_code, url))
@@ -66,8 +142,16 @@ class ModelWaveAnalyzer1500S(TypeOSA):
         self.close()
     
     def close(self):
-        pass
-    
+        self.__http.close()
+        self.__analysis_http.close()
+
+    def get_http_stats(self):
+        """
+        Get statistics of HTTP requests to the instrument and to the analysis server.
+        :return: (dict) {"instrument": dict, "analysis": dict}, see HttpClient.stats
+        """
+        return {"instrument": self.__http.stats(), "analysis": self.__analysis_http.stats()}
+
     def check_connection(self):
         try:
             self.__get('wanl/info')
@@ -116,6 +200,7 @@ class ModelWaveAnalyzer1500S(TypeOSA):
     def analysis_scan(self, rbw, shape='flattop', averages=1, scantype='measure'):
         """
         rbw: MHz
+        :return: (bytes) scan data from the analysis server, see get_scan_data for the decoded data
         """
         if not isinstance(rbw, (int, float)):
             raise TypeError('Parameter rbw should be number')
@@ -126,6 +211,37 @@ class ModelWaveAnalyzer1500S(TypeOSA):
         msg = self.__analysis('data?ip=%s&averages=%d&scantype=%s&rbw=%d&shape=%s' % (self.resource_name, averages, scantype, rbw, shape), False)
         return msg
 
+    def get_scan_data(self, rbw, shape='flattop', averages=1, scantype='measure'):
+        """
+        Scan and get the spectrum from the analysis server, decoded into numpy arrays, see analysis_scan.
+        :param rbw: (int|float) resolution bandwidth in MHz
+        :return: (dict) {"frequency": numpy.ndarray in THz, "power": numpy.ndarray in dBm, "rbw": MHz, "shape": str,
+            "averages": int, "scantype": str}, frequency is ascending.
+        """
+        frequency, power = decode_scan_data(self.analysis_scan(rbw, shape, averages, scantype))
+        return {
+            "frequency": frequency,
+            "power": power,
+            "rbw": rbw,
+            "shape": shape,
+            "averages": averages,
+            "scantype": scantype
+        }
+
+    def get_spectrum(self, x_unit='NM', rbw=1, shape='flattop', averages=1):
+        """
+        Scan and get the spectrum, see get_scan_data.
+        :param x_unit: (str) 'NM'|'THZ'
+        :param rbw: (int|float) resolution bandwidth in MHz
+        :return: (tuple) (numpy.ndarray ascending wavelength in nm or frequency in THz, numpy.ndarray level in dBm)
+        """
+        if x_unit not in ['NM', 'THZ']:
+            raise ValueError('Invalid x_unit: %r' % x_unit)
+        scan = self.get_scan_data(rbw, shape, averages)
+        if x_unit == 'THZ':
+            return scan["frequency"], scan["power"]
+        return LIGHT_SPEED/scan["frequency"][::-1], scan["power"][::-1]
+
     def measure_osnr(self, *frequencies, averages=1, scantype='measure'):
         """
         3 or 6 ints, MHz
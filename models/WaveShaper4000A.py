@@ -1,8 +1,9 @@
 from ..instrument_types import TypeOTF
 from ._BaseInstrument import BaseInstrument
-import requests
 import json
+from ..libs.http_client import HttpClient, RETRIES
 from ..constants import LIGHT_SPEED
+from .. import profiling
 
 
 class ModelWaveShaper4000A(BaseInstrument, TypeOTF):
@@ -28,10 +29,10 @@ class ModelWaveShaper4000A(BaseInstrument, TypeOTF):
         }
     ]
 
-    def __init__(self, resource_name, port, profile, timeout=5, **kwargs):
+    def __init__(self, resource_name, port, profile, timeout=5, retries=RETRIES, **kwargs):
         super(ModelWaveShaper4000A, self).__init__()
         self.__resource_name = resource_name
-        self.__timeout = timeout
+        self.__http = HttpClient('http://{ip}'.format(ip=resource_name), timeout=timeout, retries=retries)
         self.__port = port
         self.__profile = profile
         self._min_freq = 191.1
@@ -46,15 +47,23 @@ class ModelWaveShaper4000A(BaseInstrument, TypeOTF):
         return self.__resource_name
 
     def close(self):
-        pass
-    
+        self.__http.close()
+
+    def get_http_stats(self):
+        """
+        Get statistics of HTTP requests to the instrument.
+        :return: (dict) see HttpClient.stats
+        """
+        return self.__http.stats()
+
     def check_connection(self):
         try:
-            requests.get('http://{ip}/waveshaper/devinfo'.format(ip=self.resource_name))
+            self.__http.get('waveshaper/devinfo')
             return True
         except Exception:
             return False
 
+    @profiling.profiled('http', 'post')
     def __upload_profile(self, center, bw_in_ghz):
         """
         center: THz
@@ -68,7 +77,7 @@ class ModelWaveShaper4000A(BaseInstrument, TypeOTF):
             'bandwidth': bw_in_thz,
             'attn': 0
         }
-        r = requests.post('http://{ip}/waveshaper/loadprofile'.format(ip=self.resource_name), json.dumps(data), timeout=self.__timeout)
+        r = self.__http.post('waveshaper/loadprofile', json.dumps(data))
         if not r.status_code == 200:
             raise ValueError('Error code: %d' % r.status_code)
 
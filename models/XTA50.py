@@ -2,6 +2,7 @@ from ._VisaInstrument import VisaInstrument
 from ..instrument_types import TypeOTF
 from ..constants import OpticalUnit, LIGHT_SPEED
 from pyvisa.constants import Parity, StopBits
+from ..instrument_types._StateCache import cached_setter, cached_getter
 
 
 class ModelXTA50(VisaInstrument, TypeOTF):
@@ -43,6 +44,7 @@ class ModelXTA50(VisaInstrument, TypeOTF):
         freq = LIGHT_SPEED/value
         self.set_frequency(freq)
 
+    @cached_getter('frequency')
     def get_frequency(self):
         """
         Reads out the filter center wavelength in optical frequency.
@@ -51,6 +53,7 @@ class ModelXTA50(VisaInstrument, TypeOTF):
         freq = float(self.query('FREQ?').split('=')[1])
         return freq
 
+    @cached_setter('frequency', normalize=lambda value: round(value, 5))
     def set_frequency(self, value):
         """
         Sets the filter center wavelength in frequency(THz).
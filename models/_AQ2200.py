@@ -1,6 +1,9 @@
 from ._VisaInstrument import VisaInstrument
 from ..constants import OpticalUnit, LIGHT_SPEED
 from enum import unique, Enum
+import time
+from functools import wraps
+from ..instrument_types._StateCache import cached_setter, cached_getter, _MISSING
 
 
 @unique
@@ -11,6 +14,7 @@ class ApplicationType(Enum):
 
 def checkAppType(*app_types):
     def decorator(func):
+        @wraps(func)
         def wrapper(self, *args, **kwargs):
             if self._app_type not in app_types:
                 raise AttributeError('This plugin module does not have this application.')
@@ -27,6 +31,9 @@ class ModelAQ2200(VisaInstrument):
         self._app_type = app_type
         self._slot = slot
         self._channel = channel
+        # the frame does not report its modules, the channels opened on the session are read by read_all_powers
+        with self.session.lock:
+            self.session.state.setdefault('aq2200_channels', []).append((app_type, slot, channel))
         # thresholds
         self._min_wl = None
         self._max_wl = None
@@ -40,6 +47,30 @@ class ModelAQ2200(VisaInstrument):
         self._min_offset = None
         self._max_offset = None
 
+    # param encapsulation
+    @property
+    def slot(self):
+        return self._slot
+
+    @slot.setter
+    def slot(self, value):
+        raise AttributeError('attr "slot" is read-only.')
+
+    @property
+    def channel(self):
+        return self._channel
+
+    @channel.setter
+    def channel(self, value):
+        raise AttributeError('attr "channel" is read-only.')
+
+    def close(self):
+        if self.session is None:
+            return
+        with self.session.lock:
+            self.session.state['aq2200_channels'].remove((self._app_type, self._slot, self._channel))
+        VisaInstrument.close(self)
+
     @ checkAppType(ApplicationType.Sensor, ApplicationType.ATTN)
     def get_power_value(self):
         '''
@@ -54,12 +85,57 @@ class ModelAQ2200(VisaInstrument):
         return float(pwr_str)
 
     @ checkAppType(ApplicationType.Sensor, ApplicationType.ATTN)
+    @ cached_getter('power_unit')
     def get_power_unit(self):
         if ApplicationType.ATTN == self._app_type:
             return self._get_outp_unit()
         elif ApplicationType.Sensor == self._app_type:
             return self._get_sens_unit()
 
+    @ checkAppType(ApplicationType.Sensor, ApplicationType.ATTN)
+    def get_power(self):
+        """
+        Get power value and unit in one compound query, or only the value if the unit is in the state cache.
+        :return: (tuple) (float value, int unit), unit is value of (enum 'OpticalUnit')
+        """
+        unit = self._get_cached_state('power_unit', _MISSING)
+        if unit is not _MISSING:
+            return self.get_power_value(), unit
+        subsystem = 'OUTP' if ApplicationType.ATTN == self._app_type else 'SENS'
+        reply = self.query(':%s%d:CHAN%d:POW:UNIT?;:FETC%d:CHAN%d:POW?' % (
+            subsystem, self._slot, self._channel, self._slot, self._channel))
+        unit_str, value_str = reply.strip().split(';')
+        unit = {0: OpticalUnit.DBM.value, 1: OpticalUnit.W.value}.get(int(unit_str))
+        self._set_cached_state('power_unit', unit)
+        return float(value_str), unit
+
+    def read_all_powers(self, slots=None, unit=OpticalUnit.DBM.value):
+        """
+        Read the power of several channels of the frame in one compound query, see TypeOPM.read_all_powers.
+        The frame does not report its modules, so slots None reads the channels opened on this session with the
+        application type of this object. Mixing sensor and attenuator modules is not supported: the units are read
+        from the OUTP (attenuator) or SENS (sensor) subsystem of the application type of this object.
+        """
+        import numpy as np
+        if slots is None:
+            with self.session.lock:
+                opened = self.session.state['aq2200_channels']
+                slots = sorted(set((slot, channel) for app_type, slot, channel in opened
+                                   if app_type == self._app_type))
+        channels = self._frame_channels(slots)
+        cmds = [':FETC%d:CHAN%d:POW?' % (slot, channel) for slot, channel in channels]
+        if unit is not None:
+            subsystem = 'OUTP' if ApplicationType.ATTN == self._app_type else 'SENS'
+            cmds += [':%s%d:CHAN%d:POW:UNIT?' % (subsystem, slot, channel) for slot, channel in channels]
+        start = time.time()
+        reply = self.query(';'.join(cmds))
+        timestamp = (start + time.time())/2
+        fields = reply.strip().split(';')
+        values = np.array(fields[:len(channels)], dtype=float)
+        if unit is not None:
+            values = self._convert_power_values(values, [int(i) for i in fields[len(channels):]], unit)
+        return timestamp, values
+
     def _get_sens_unit(self):
         """
         OpticalUnit.DBM.value = 0, OpticalUnit.W.value = 1
@@ -89,6 +165,7 @@ class ModelAQ2200(VisaInstrument):
         return unit
 
     @ checkAppType(ApplicationType.Sensor, ApplicationType.ATTN)
+    @ cached_getter('cal')
     def get_cal(self):
         if ApplicationType.ATTN == self._app_type:
             return self._get_outp_cal()
@@ -112,6 +189,7 @@ class ModelAQ2200(VisaInstrument):
         return cal
 
     @ checkAppType(ApplicationType.ATTN, ApplicationType.Sensor)
+    @ cached_getter('wavelength')
     def get_wavelength(self):
         if ApplicationType.ATTN == self._app_type:
             return self._get_inp_wavelength()
@@ -138,6 +216,7 @@ class ModelAQ2200(VisaInstrument):
         return wl
 
     @ checkAppType(ApplicationType.Sensor, ApplicationType.ATTN)
+    @ cached_getter('avg_time')
     def get_avg_time(self):
         if ApplicationType.ATTN == self._app_type:
             return self._get_outp_avg_time()
@@ -161,6 +240,7 @@ class ModelAQ2200(VisaInstrument):
         return value
 
     @ checkAppType(ApplicationType.Sensor, ApplicationType.ATTN)
+    @ cached_setter('power_unit')
     def set_power_unit(self, unit):
         if ApplicationType.ATTN == self._app_type:
             return self._set_outp_unit(unit)
@@ -182,6 +262,7 @@ class ModelAQ2200(VisaInstrument):
         return self.command(":SENS%d:CHAN%d:POW:UNIT " % (self._slot, self._channel) + str(unit))
 
     @ checkAppType(ApplicationType.Sensor, ApplicationType.ATTN)
+    @ cached_setter('cal', normalize=lambda value: round(value, 3))
     def set_cal(self, value):
         value = round(value, 3)
         if ApplicationType.ATTN == self._app_type:
@@ -206,6 +287,7 @@ class ModelAQ2200(VisaInstrument):
         return self.command(':sens%d:chan%d:corr ' % (self._slot, self._channel) + str(value) + 'DB')
     
     @ checkAppType(ApplicationType.Sensor, ApplicationType.ATTN)
+    @ cached_setter('wavelength', normalize=lambda value: round(value, 1))
     def set_wavelength(self, value):
         value = round(value, 1)
         if ApplicationType.ATTN == self._app_type:
@@ -238,6 +320,7 @@ class ModelAQ2200(VisaInstrument):
         return self.command(":INP%d:CHAN%d:WAV " % (self._slot, self._channel) + str(value) + "NM")
 
     @ checkAppType(ApplicationType.Sensor, ApplicationType.ATTN)
+    @ cached_setter('avg_time')
     def set_avg_time(self, value):
         if ApplicationType.ATTN == self._app_type:
             return self._set_outp_avg_time(value)
@@ -265,6 +348,7 @@ class ModelAQ2200(VisaInstrument):
         return self.command(":sens%d:CHAN%d:pow:atim " % (self._slot, self._channel) + str(value) + "MS")
 
     @ checkAppType(ApplicationType.ATTN)
+    @ cached_setter('enabled')
     def enable(self, status=True):
         """
         Set VOA output enabled/disabled.
@@ -283,6 +367,7 @@ class ModelAQ2200(VisaInstrument):
         return self.enable(False)
 
     @ checkAppType(ApplicationType.ATTN)
+    @ cached_getter('enabled')
     def is_enabled(self):
         """
         Get enable status of VOA.
@@ -294,6 +379,7 @@ class ModelAQ2200(VisaInstrument):
         return status
 
     @ checkAppType(ApplicationType.ATTN)
+    @ cached_getter('att')
     def get_att(self):
         """
         Get att value in dB.
@@ -304,6 +390,7 @@ class ModelAQ2200(VisaInstrument):
         return att
 
     @ checkAppType(ApplicationType.ATTN)
+    @ cached_getter('offset')
     def get_offset(self):
         """
         Get att offset value in dB.
@@ -314,6 +401,7 @@ class ModelAQ2200(VisaInstrument):
         return offset
 
     @ checkAppType(ApplicationType.ATTN)
+    @ cached_setter('att', normalize=lambda value: round(value, 3))
     def set_att(self, value):
         """
         Set att value in dB.
@@ -327,6 +415,7 @@ class ModelAQ2200(VisaInstrument):
         return self.command(":INP%d:CHAN%d:ATT " % (self._slot, self._channel) + str(value) + "dB")
 
     @ checkAppType(ApplicationType.ATTN)
+    @ cached_setter('offset', invalidates=('att',), normalize=lambda value: round(value, 3))
     def set_offset(self, value):
         """
         Set att offset value in dB.
@@ -1,8 +1,8 @@
 from ._BaseInstrument import BaseInstrument
 from ..instrument_types import TypeTS
 from ..constants import TemperatureUnit
+from .. import profiling
 import serial
-import time
 
 class ModelEspecOld(BaseInstrument, TypeTS):
     brand = "Espec"
@@ -31,6 +31,7 @@ class ModelEspecOld(BaseInstrument, TypeTS):
     def resource_name(self):
         return self.__resource_name
 
+    @profiling.profiled('serial', 'write')
     def write_cmd(self, cmd):
         pre = b'\x05'
         b_id = '{dev_id:02X}'.format(dev_id=self.__dev_id).encode()
@@ -40,6 +41,7 @@ class ModelEspecOld(BaseInstrument, TypeTS):
         self.__serial.reset_input_buffer()
         self.__serial.write(t)
 
+    @profiling.profiled('serial', 'read')
     def read_reply(self):
         r = self.__serial.read(10240)
         if not r:
@@ -66,7 +68,7 @@ class ModelEspecOld(BaseInstrument, TypeTS):
             value = 65536 + value
         cmd = 'FFWW0D119705{temp:04X}0000000000000000'.format(temp=value).encode()
         self.write_cmd(cmd)
-        time.sleep(0.5)
+        profiling.sleep(self, 0.5)
         r = self.read_reply()
         if not r.startswith(b'\x06'):
             raise ValueError('Unexpected reply: %r' % r)
@@ -78,7 +80,7 @@ class ModelEspecOld(BaseInstrument, TypeTS):
         """
         cmd = b'FFWR0D111401'
         self.write_cmd(cmd)
-        time.sleep(0.5)
+        profiling.sleep(self, 0.5)
         r = self.read_reply()
         if not r.startswith(b'\x02'):
             raise ValueError('Unexpected reply: %r' % r)
@@ -93,7 +95,7 @@ class ModelEspecOld(BaseInstrument, TypeTS):
         """
         cmd = b'FFWR0D111701'
         self.write_cmd(cmd)
-        time.sleep(0.5)
+        profiling.sleep(self, 0.5)
         r = self.read_reply()
         if not r.startswith(b'\x02'):
             raise ValueError('Unexpected reply: %r' % r)
@@ -2,8 +2,12 @@ from ._VisaInstrument import VisaInstrument
 from ..instrument_types import TypeOPM
 from ..constants import OpticalUnit, LIGHT_SPEED
 import math
+import time
+from ..instrument_types._StateCache import cached_setter, cached_getter, _MISSING
+from .. import profiling
 
 class ModelN77xx(VisaInstrument):
+    MAX_LOGGING_POINTS = 1000000  # max data points of the logging function
 
     def __init__(self, resource_name, slot, max_slot, slot_type_define, **kwargs):
         if not isinstance(slot, int):
@@ -19,6 +23,9 @@ class ModelN77xx(VisaInstrument):
         super(ModelN77xx, self).__init__(resource_name, **kwargs)
         self._is_pos_cal = False
         self.__slot = slot
+        self.__logging_duration = 0  # in s, see configure_logging
+        self.__opm_slots = sorted(i for slot_type, slots in slot_type_define.items()
+                                  if slot_type in ['voa_with_opm', 'opm'] for i in slots)
 
     # param encapsulation
     @property
@@ -29,6 +36,13 @@ class ModelN77xx(VisaInstrument):
     def slot(self, value):
         raise AttributeError('attr "slot" is read-only.')
 
+    @property
+    def channel(self):
+        """
+        Channel in the slot, always 1 as each slot has one channel.
+        """
+        return 1
+
     def __check_is_voa(self):
         if not self.__slot_type in ['voa', 'voa_with_opm']:
             raise AttributeError('Slot {slot} of {model} has no VOA function.'.format(slot=self.slot, model=self.model))
@@ -49,6 +63,7 @@ class ModelN77xx(VisaInstrument):
         value = float(value_str)
         return value
 
+    @cached_getter('power_unit')
     def get_power_unit(self):
         """
         OpticalUnit.DBM.value = 0, OpticalUnit.W.value = 1
@@ -64,6 +79,49 @@ class ModelN77xx(VisaInstrument):
             unit = None
         return unit
 
+    def get_power(self):
+        """
+        Get power value and unit in one compound query, or only the value if the unit is in the state cache.
+        :return: (tuple) (float value, int unit), unit is value of (enum 'OpticalUnit')
+        """
+        self.__check_is_opm()
+        unit = self._get_cached_state('power_unit', _MISSING)
+        if unit is not _MISSING:
+            return self.get_power_value(), unit
+        reply = self.query(":SENS{n}:POW:UNIT?;:FETC{n}:POW?".format(n=self.slot))
+        unit_str, value_str = reply.split(';')
+        unit = {0: OpticalUnit.DBM.value, 1: OpticalUnit.W.value}.get(int(unit_str))
+        self._set_cached_state('power_unit', unit)
+        return float(value_str), unit
+
+    def read_all_powers(self, slots=None, unit=OpticalUnit.DBM.value):
+        """
+        Read the power of several slots of the frame in one compound query, see TypeOPM.read_all_powers.
+        Each slot has one channel, so (slot, channel) tuples should have channel 1. All the slots with OPM function
+        are read if slots is None.
+        """
+        import numpy as np
+        if slots is None:
+            slots = self.__opm_slots
+        channels = self._frame_channels(slots)
+        for slot, channel in channels:
+            if slot not in self.__opm_slots or channel != 1:
+                raise ValueError('Slot {slot} channel {channel} of {model} has no OPM function.'.format(
+                    slot=slot, channel=channel, model=self.model))
+        slots = [slot for slot, _ in channels]
+        cmds = [':FETC{n}:POW?'.format(n=n) for n in slots]
+        if unit is not None:
+            cmds += [':SENS{n}:POW:UNIT?'.format(n=n) for n in slots]
+        start = time.time()
+        reply = self.query(';'.join(cmds))
+        timestamp = (start + time.time())/2
+        fields = reply.split(';')
+        values = np.array(fields[:len(slots)], dtype=float)
+        if unit is not None:
+            values = self._convert_power_values(values, [int(i) for i in fields[len(slots):]], unit)
+        return timestamp, values
+
+    @cached_getter('avg_time')
     def get_avg_time(self):
         """
         Get averaging time in ms.
@@ -73,6 +131,7 @@ class ModelN77xx(VisaInstrument):
         avg_in_ms = avg_in_s*1E+3
         return avg_in_ms
 
+    @cached_setter('power_unit')
     def set_power_unit(self, unit):
         """
         Set optical power unit
@@ -88,6 +147,7 @@ class ModelN77xx(VisaInstrument):
         """
         return self._min_wl, self._max_wl
 
+    @cached_setter('avg_time')
     def set_avg_time(self, value):
         """
         set avg time in ms
@@ -99,6 +159,7 @@ class ModelN77xx(VisaInstrument):
             raise ValueError('Averaging time out of range')
         return self.command(":sens" + str(self.slot) + ":pow:atim " + str(value) + "MS")
 
+    @cached_setter('enabled')
     def enable(self, status=True):
         """
         Set VOA output enabled/disabled.
@@ -110,6 +171,7 @@ class ModelN77xx(VisaInstrument):
         status_str = str(int(status))
         return self.command(":OUTP" + str(self.slot) + " " + status_str)
 
+    @cached_getter('enabled')
     def is_enabled(self):
         """
         Get enable status of VOA.
@@ -121,6 +183,7 @@ class ModelN77xx(VisaInstrument):
             status = bool(int(status))
         return status
 
+    @cached_getter('att')
     def get_att(self):
         """
         Get att value in dB.
@@ -131,6 +194,7 @@ class ModelN77xx(VisaInstrument):
         att = float(att_str)
         return att
 
+    @cached_getter('offset')
     def get_offset(self):
         """
         Get att offset value in dB.
@@ -141,6 +205,7 @@ class ModelN77xx(VisaInstrument):
         offset = float(offset_str)
         return offset
 
+    @cached_getter('wavelength')
     def get_wavelength(self):
         """
         :return: (float) optical wavelength in nm
@@ -156,6 +221,7 @@ class ModelN77xx(VisaInstrument):
     def get_frequency(self):
         return LIGHT_SPEED/self.get_wavelength()
 
+    @cached_getter('cal')
     def get_cal(self):
         """
         :return: (float) power monitor calibration offset in dB
@@ -169,6 +235,7 @@ class ModelN77xx(VisaInstrument):
             cal = float(cal_str)
         return cal
 
+    @cached_setter('att')
     def set_att(self, value):
         """
         Set att value in dB.
@@ -181,6 +248,7 @@ class ModelN77xx(VisaInstrument):
             raise ValueError('Att value out of range')
         return self.command("INP" + str(self.slot) + ":ATT " + str(value) + "dB")
 
+    @cached_setter('offset', invalidates=('att',))
     def set_offset(self, value):
         """
         Set att offset value in dB.
@@ -189,6 +257,7 @@ class ModelN77xx(VisaInstrument):
         self.__check_is_voa()
         return self.command("INP"+str(self.slot)+":OFFS "+str(value)+"dB")
 
+    @cached_setter('wavelength')
     def set_wavelength(self, value):
         """
         Set wavelength value in nm.
@@ -206,6 +275,7 @@ class ModelN77xx(VisaInstrument):
     def set_frequency(self, value):
         return self.set_wavelength(round(LIGHT_SPEED/value, 4))
 
+    @cached_setter('cal')
     def set_cal(self, value):
         """
         Set calibration offset in dB
@@ -217,3 +287,114 @@ class ModelN77xx(VisaInstrument):
             self.command(':sens' + str(self.slot) + ':corr ' + str(value) + 'DB')
         else:
             self.command("OUTP" + str(self.slot) + ":POW:OFFS " + str(value))
+
+    # logging function
+    def configure_logging(self, data_points, avg_time):
+        """
+        Configure the instrument-side logging function of this slot. Logged samples are taken at the interval of
+        the averaging time.
+        :param data_points: (int) number of samples, 1 ~ MAX_LOGGING_POINTS
+        :param avg_time: (float|int) averaging time of each sample in ms
+        """
+        self.__check_is_opm()
+        if not isinstance(data_points, int):
+            raise TypeError('data_points should be int')
+        if not 1 <= data_points <= self.MAX_LOGGING_POINTS:
+            raise ValueError('data_points out of range')
+        if not isinstance(avg_time, (float, int)):
+            raise TypeError('Averaging time should be number')
+        if not self.min_avg_time <= avg_time <= self.max_avg_time:
+            raise ValueError('Averaging time out of range')
+        self.command(':SENS{n}:FUNC:PAR:LOGG {points},{t}MS'.format(n=self.slot, points=data_points, t=avg_time))
+        # the averaging time of the slot is changed by the logging function
+        self.invalidate('avg_time')
+        self.__logging_duration = data_points*avg_time/1000
+
+    def start_logging(self):
+        """
+        Start (arm) the logging function configured by configure_logging.
+        """
+        self.__check_is_opm()
+        self.command(':SENS{n}:FUNC:STAT LOGG,STAR'.format(n=self.slot))
+
+    def stop_logging(self):
+        """
+        Stop the logging function.
+        """
+        self.__check_is_opm()
+        self.command(':SENS{n}:FUNC:STAT LOGG,STOP'.format(n=self.slot))
+
+    def get_logging_state(self):
+        """
+        :return: (tuple) (str function, str status), such as ('LOGGING_STABILITY', 'PROGRESS'), ('NONE', 'COMPLETE')
+        """
+        self.__check_is_opm()
+        function, status = self.query(':SENS{n}:FUNC:STAT?'.format(n=self.slot)).strip().split(',')
+        return function, status
+
+    def is_logging_completed(self):
+        """
+        :return: (bool) if the logging function is completed (or not started)
+        """
+        return self.get_logging_state()[1] == 'COMPLETE'
+
+    def wait_logging(self, timeout=None, interval=0.05):
+        """
+        Wait for the logging function to complete.
+        :param timeout: (float|None) timeout in s, the configured logging duration + 10 s if None
+        :param interval: (float) polling interval in s
+        """
+        if timeout is None:
+            timeout = self.__logging_duration + 10
+        deadline = time.monotonic() + timeout
+        while not self.is_logging_completed():
+            if time.monotonic() > deadline:
+                raise TimeoutError('Logging of slot {slot} is not completed in {t} s.'.format(slot=self.slot,
+                                                                                          t=timeout))
+            profiling.sleep(self, interval)
+
+    def fetch_logging_data(self):
+        """
+        Read the samples of the completed logging function.
+        :return: (numpy.ndarray) float32 samples in W
+        """
+        import numpy as np
+        self.__check_is_opm()
+        return self.query_binary_values(':SENS{n}:FUNC:RES?'.format(n=self.slot), 'f', is_big_endian=False,
+                                        container=np.array)
+
+    def log_powers(self, data_points, avg_time, timeout=None):
+        """
+        Configure, start and wait for the logging function, then read the samples.
+        :param data_points: (int) number of samples
+        :param avg_time: (float|int) averaging time of each sample in ms
+        :param timeout: (float|None) timeout in s of waiting, see wait_logging
+        :return: (numpy.ndarray) float32 samples in W
+        """
+        self.configure_logging(data_points, avg_time)
+        self.start_logging()
+        self.wait_logging(timeout)
+        return self.fetch_logging_data()
+
+    def stream_logging(self, data_points, avg_time, count=None, timeout=None):
+        """
+        Generator of logged blocks, the logging function is started again after each block is read. Samples taken
+        between two blocks (while reading) are lost. The logging function is stopped when the generator is closed.
+        :param data_points: (int) number of samples of each block
+        :param avg_time: (float|int) averaging time of each sample in ms
+        :param count: (int|None) number of blocks, endless if None
+        :param timeout: (float|None) timeout in s of waiting each block, see wait_logging
+        :return: (generator) yields (float timestamp, numpy.ndarray float32 samples in W), timestamp is the
+            time.time() when the block is started
+        """
+        self.configure_logging(data_points, avg_time)
+        n = 0
+        try:
+            while count is None or n < count:
+                timestamp = time.time()
+                self.start_logging()
+                self.wait_logging(timeout)
+                yield timestamp, self.fetch_logging_data()
+                n += 1
+        finally:
+            self.stop_logging()
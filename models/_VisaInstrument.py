@@ -1,5 +1,9 @@
-import pyvisa
+import threading
+import time
+from concurrent.futures import Future
+from contextlib import contextmanager
 from ._BaseInstrument import BaseInstrument
+from .. import profiling
 
 # define const
 OPEN_TIMEOUT = 0  # default open timeout for all instruments if not specified during init.
@@ -7,9 +11,347 @@ TIMEOUT = 2000  # default timeout of operation in ms for all instruments if not
 QUERY_DELAY = 0.001  # the default time in seconds to wait after each write operation for all if not specified.
 READ_TERMINATION = '\n'  # default read termination for all instruments if not specified during init.
 WRITE_TERMINATION = '\n'  # default write termination for all instruments if not specified during init.
+CHUNK_SIZE = 1024*1024  # bytes of each read when a binary block is written to a buffer or file
 
 # globals
-rm = pyvisa.ResourceManager()
+_rm = None  # pyvisa.ResourceManager, created at first use
+_rm_lock = threading.Lock()
+_sessions = {}  # resource_name => VisaSession
+_sessions_lock = threading.Lock()
+
+
+def get_resource_manager():
+    """
+    Get the pyvisa.ResourceManager shared by all the visa instruments, which is created at the first call.
+
+    :Return type: pyvisa.ResourceManager
+    """
+    global _rm
+    with _rm_lock:
+        if _rm is None:
+            # pyvisa is imported at first use, as it takes long to import
+            import pyvisa
+            _rm = pyvisa.ResourceManager()
+        return _rm
+
+
+def close_resource_manager():
+    """
+    Close the shared resource manager if it is created. A new one is created at the next get_resource_manager.
+    """
+    global _rm
+    with _rm_lock:
+        if _rm is not None:
+            _rm.close()
+            _rm = None
+
+
+def __getattr__(name):
+    # rm was created at import, it is now created at its first access
+    if name == 'rm':
+        return get_resource_manager()
+    raise AttributeError('module %r has no attribute %r' % (__name__, name))
+
+
+def open_resource(resource_name, **options):
+    """
+    Open a visa resource. Resource names starting with 'SIM::' are opened by the instrument simulator.
+    :param resource_name: (str) visa resource name or alias
+    :param options: kwargs passed to rm.open_resource
+    :return: visa resource
+    """
+    if resource_name.upper().startswith('SIM::'):
+        from .. import simulator
+        return simulator.open_resource(resource_name, **options)
+    return get_resource_manager().open_resource(resource_name, **options)
+
+
+class SessionLock(object):
+    """
+    Re-entrant lock of a visa session, which also counts how often and how long threads have to wait for it.
+    """
+
+    def __init__(self):
+        self.__lock = threading.RLock()
+        self.acquisitions = 0
+        self.contentions = 0
+        self.wait_time = 0.0
+        self.max_wait_time = 0.0
+
+    def acquire(self, blocking=True, timeout=-1):
+        if self.__lock.acquire(blocking=False):
+            self.acquisitions += 1
+            return True
+        if not blocking:
+            return False
+        start = time.perf_counter()
+        if not self.__lock.acquire(timeout=timeout):
+            return False
+        wait_time = time.perf_counter() - start
+        self.acquisitions += 1
+        self.contentions += 1
+        self.wait_time += wait_time
+        self.max_wait_time = max(self.max_wait_time, wait_time)
+        return True
+
+    def release(self):
+        self.__lock.release()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.release()
+
+    def stats(self):
+        """
+        :return: (dict) {"acquisitions": int, "contentions": int, "wait_time": float, "max_wait_time": float}, time in s.
+        """
+        return {
+            "acquisitions": self.acquisitions,
+            "contentions": self.contentions,
+            "wait_time": self.wait_time,
+            "max_wait_time": self.max_wait_time
+        }
+
+
+class VisaSession(object):
+    """
+    A visa session shared by all the instrument objects opened with the same resource name.
+    For example, all the slot objects of a N7744A frame talk through one session and one lock.
+    The session is closed when the last instrument object using it is closed.
+    """
+
+    def __init__(self, resource_name, options):
+        self.resource_name = resource_name
+        self.options = options
+        self.resource = None  # opened by acquire, outside the lock of the session registry
+        self.lock = SessionLock()
+        self.ref_count = 0
+        self.batch = None  # active CommandBatch
+        self.pending_reply = False  # the lock is held until the reply of a query sent by write_query is read
+        self.state = {}  # state shared by the instruments of the session, such as LAN login. Use it under lock.
+        self.__opened = threading.Event()
+        self.__open_error = None
+
+    @classmethod
+    def get_all_stats(cls):
+        """
+        :return: (dict) resource_name => lock stats of all the opened sessions, see SessionLock.stats.
+        """
+        with _sessions_lock:
+            return {name: session.lock.stats() for name, session in _sessions.items()}
+
+    @classmethod
+    def get_opened(cls, resource_name):
+        """
+        :return: (VisaSession|None) the opened session of resource_name, None if it is not opened. If the session
+            is being opened by another thread, wait until it is opened.
+        """
+        with _sessions_lock:
+            session = _sessions.get(resource_name)
+        if session is None or not session.wait_opened():
+            return None
+        return session
+
+    @classmethod
+    def acquire(cls, resource_name, **options):
+        """
+        Get the shared session of resource_name, open it if it is not opened yet.
+        The resource is opened outside the lock of the session registry, so that a slow open does not block other
+        resources. Threads acquiring the same resource meanwhile wait for the open.
+        :param resource_name: (str) visa resource name or alias
+        :param options: kwargs passed to rm.open_resource
+        :return: (VisaSession) the shared session
+        """
+        with _sessions_lock:
+            session = _sessions.get(resource_name)
+            opening = session is None
+            if opening:
+                session = cls(resource_name, options)
+                _sessions[resource_name] = session
+            elif session.options != options:
+                raise ValueError('Resource {name!r} is already opened with different settings: {options!r}'.format(
+                    name=resource_name, options=session.options))
+            session.ref_count += 1
+        if opening:
+            session.__open()
+        elif not session.wait_opened():
+            raise session.__open_error
+        return session
+
+    def __open(self):
+        try:
+            self.resource = open_resource(self.resource_name, **self.options)
+        except BaseException as e:
+            self.__open_error = e
+            with _sessions_lock:
+                if _sessions.get(self.resource_name) is self:
+                    del _sessions[self.resource_name]
+            raise
+        finally:
+            self.__opened.set()
+
+    def wait_opened(self):
+        """
+        Wait until the resource of the session is opened.
+        :return: (bool) if the resource is opened, False if the open failed.
+        """
+        self.__opened.wait()
+        return self.__open_error is None
+
+    def release(self):
+        """
+        Release one reference of the session. The visa resource is closed with the last reference.
+        """
+        with _sessions_lock:
+            self.ref_count -= 1
+            if self.ref_count > 0:
+                return
+            if _sessions.get(self.resource_name) is self:
+                del _sessions[self.resource_name]
+        with self.lock:
+            self.release_reply()
+            self.resource.close()
+
+    def hold_for_reply(self):
+        """
+        Keep the session locked by the current thread until the pending reply is read.
+        Should be called with the lock acquired.
+        """
+        if not self.pending_reply:
+            self.lock.acquire()
+            self.pending_reply = True
+
+    def release_reply(self):
+        """
+        Release the lock held for a pending reply. Should be called with the lock acquired.
+        """
+        if self.pending_reply:
+            self.pending_reply = False
+            self.lock.release()
+
+
+def join_commands(cmds, separator=';'):
+    """
+    Join SCPI commands into one compound message. Each command is made absolute (leading ':')
+    so that it is not parsed relative to the path of the previous one.
+    :param cmds: (list of str) SCPI commands
+    :return: (str) compound message
+    """
+    return separator.join(cmd if cmd.startswith((':', '*')) else ':' + cmd for cmd in cmds)
+
+
+def split_reply(reply, count, separator=';'):
+    """
+    Split the reply of a compound query into the replies of each query. Separators inside
+    quoted strings are ignored.
+    :param reply: (str) reply of compound query
+    :param count: (int) number of queries
+    :return: (list of str) replies
+    """
+    if count == 1:
+        return [reply]
+    replies = []
+    start = 0
+    quote = None
+    for i, c in enumerate(reply):
+        if quote:
+            if c == quote:
+                quote = None
+        elif c in '"\'':
+            quote = c
+        elif c == separator:
+            replies.append(reply[start:i])
+            start = i + 1
+    replies.append(reply[start:])
+    if len(replies) != count:
+        raise ValueError('Compound query expects {count} replies, got {n}: {reply!r}'.format(
+            count=count, n=len(replies), reply=reply))
+    return replies
+
+
+class CommandBatch(object):
+    """
+    Commands and queries buffered by VisaInstrument.batch, sent to the instrument in one compound message.
+    """
+
+    def __init__(self, resource, separator=';', instrument=None):
+        """
+        :param resource: visa resource to send the messages
+        :param separator: (str) separator of compound message
+        :param instrument: (VisaInstrument) instrument which opened the batch, for profiling
+        """
+        self.__resource = resource
+        self.__instrument = instrument
+        self.__separator = separator
+        self.__cmds = []
+        self.__futures = []  # futures of buffered queries, in order
+
+    def command(self, cmd):
+        """
+        Buffer a command.
+        :param cmd: (str) VISA command
+        """
+        self.__cmds.append(cmd)
+
+    def query(self, cmd):
+        """
+        Buffer a query. The reply is available from the returned future after the batch is flushed.
+        :param cmd: (str) VISA query
+        :return: (concurrent.futures.Future) future of the reply
+        """
+        future = Future()
+        self.__cmds.append(cmd)
+        self.__futures.append(future)
+        return future
+
+    def flush(self, query=None):
+        """
+        Send all the buffered messages in one write, and read back the replies of buffered queries in one read.
+        :param query: (str) optional query appended to the message, its reply is returned directly.
+        :return: (str|None) reply of param query
+        """
+        cmds, futures = self.__cmds, self.__futures
+        self.__cmds, self.__futures = [], []
+        if query is not None:
+            cmds = cmds + [query]
+        if not cmds:
+            return None
+        message = join_commands(cmds, self.__separator)
+        count = len(futures) + (query is not None)
+        try:
+            if count:
+                if profiling.enabled:
+                    reply = profiling.call(self.__instrument, 'visa', 'query', message, self.__resource.query, message,
+                                           delay=self.__resource.query_delay)
+                else:
+                    reply = self.__resource.query(message)
+                replies = split_reply(reply, count, self.__separator)
+            else:
+                if profiling.enabled:
+                    profiling.call(self.__instrument, 'visa', 'write', message, self.__resource.write, message)
+                else:
+                    self.__resource.write(message)
+                replies = []
+        except Exception as e:
+            for future in futures:
+                future.set_exception(e)
+            raise
+        for future, reply in zip(futures, replies):
+            future.set_result(reply)
+        if query is not None:
+            return replies[-1]
+
+    def discard(self):
+        """
+        Drop all the buffered messages without sending them.
+        """
+        for future in self.__futures:
+            future.cancel()
+        self.__cmds, self.__futures = [], []
+
 
 # base class of visa instruments
 class VisaInstrument(BaseInstrument):
@@ -17,13 +359,15 @@ class VisaInstrument(BaseInstrument):
     Base class of visa instruments.
     __init__(self, resource_name, read_termination=READ_TERMINATION, open_timeout=OPEN_TIMEOUT, **kwargs)
     kwargs are directly passed to rm.open_resource
+    Instruments with the same resource_name share one visa session (see VisaSession).
     """
 
     def __init__(self, resource_name, read_termination=READ_TERMINATION, write_termination=WRITE_TERMINATION,
                  timeout=TIMEOUT, open_timeout=OPEN_TIMEOUT, query_delay=QUERY_DELAY, **kwargs):
-        self.__inst = rm.open_resource(resource_name, read_termination=read_termination,
-                                       write_termination=write_termination, open_timeout=open_timeout,
-                                       timeout=timeout, query_delay=query_delay, **kwargs)
+        self.__session = VisaSession.acquire(resource_name, read_termination=read_termination,
+                                             write_termination=write_termination, open_timeout=open_timeout,
+                                             timeout=timeout, query_delay=query_delay, **kwargs)
+        self.__inst = self.__session.resource
         self.__resource_name = resource_name
         super(VisaInstrument, self).__init__()
 
@@ -31,6 +375,13 @@ class VisaInstrument(BaseInstrument):
     def resource_name(self):
         return self.__resource_name
 
+    @property
+    def session(self):
+        """
+        The shared visa session of this instrument.
+        """
+        return self.__session
+
     @property
     def resource_info(self):
         """
@@ -49,6 +400,43 @@ class VisaInstrument(BaseInstrument):
     def opc(self):
         return self.query('*OPC?')
 
+    def read_stb(self):
+        """
+        Read the status byte by serial poll (or *STB? for interfaces without it).
+        :return: (int) status byte
+        """
+        with self.__session.lock:
+            return self.__inst.read_stb()
+
+    def wait_for_srq(self, timeout=None):
+        """
+        Wait for a service request (SRQ) event of the instrument. The session is not locked while waiting.
+        The status byte is read after the event to clear the request.
+        :param timeout: (float|None) timeout in s, None to wait forever
+        :raise TimeoutError: if no service request in timeout
+        """
+        import pyvisa
+        timeout_ms = None if timeout is None else max(1, round(timeout*1000))
+        try:
+            if hasattr(self.__inst, 'wait_for_srq'):
+                self.__inst.wait_for_srq(timeout_ms)
+            else:
+                # interfaces other than GPIB: wait on the service request event queue
+                event_type = pyvisa.constants.EventType.service_request
+                self.__inst.enable_event(event_type, pyvisa.constants.EventMechanism.queue)
+                try:
+                    self.__inst.wait_on_event(event_type, pyvisa.constants.VI_TMO_INFINITE if timeout_ms is None
+                                              else timeout_ms)
+                finally:
+                    self.__inst.disable_event(event_type, pyvisa.constants.EventMechanism.queue)
+                    self.__inst.discard_events(event_type, pyvisa.constants.EventMechanism.queue)
+                self.read_stb()
+        except pyvisa.VisaIOError as e:
+            if e.error_code == pyvisa.constants.StatusCode.error_timeout:
+                raise TimeoutError('No service request from {name!r} in {t} s.'.format(name=self.resource_name,
+                                                                                       t=timeout))
+            raise
+
     def set_visa_attribute(self, *args, **kwargs):
         return self.__inst.set_visa_attribute(*args, **kwargs)
 
@@ -61,6 +449,7 @@ class VisaInstrument(BaseInstrument):
         Check if instrument is connected and able to communicate with.
         :return: <bool> if instrument is connected.
         """
+        import pyvisa
         try:
             idn = self.idn
             if idn:
@@ -73,32 +462,353 @@ class VisaInstrument(BaseInstrument):
     def command(self, cmd):
         """
         Write a VISA command without read back.
-        You can use chained calling, such as: instrument.command(cmd1).command(cmd2).command(cmd3)...
+        In batch mode, the command is buffered and sent when the batch is flushed.
+        To read the reply of a query later, use 'write_query' instead.
         :param cmd: (str) VISA command
-        :return: (BaseInstrument) self
         """
-        self.__inst.write(cmd)
+        session = self.__session
+        with session.lock:
+            session.release_reply()
+            if session.batch is not None:
+                session.batch.command(cmd)
+            elif profiling.enabled:
+                profiling.call(self, 'visa', 'write', cmd, self.__inst.write, cmd)
+            else:
+                self.__inst.write(cmd)
+
+    def write_query(self, cmd):
+        """
+        Write a VISA query whose reply is read later by 'read' or 'read_binary'.
+        The session stays locked by the current thread until the reply is read, so that no other thread can take the
+        reply. The lock is released by the read even if it fails, so the reply must always be read. Use 'query'
+        instead if the reply can be read immediately.
+        :param cmd: (str) VISA query
+        """
+        session = self.__session
+        with session.lock:
+            session.release_reply()
+            if session.batch is not None:
+                session.batch.flush()
+            if profiling.enabled:
+                profiling.call(self, 'visa', 'write', cmd, self.__inst.write, cmd)
+            else:
+                self.__inst.write(cmd)
+            session.hold_for_reply()
 
     def read(self, bin=False):
         """
-        Read VISA message from instrument.
-        Since it's always used after a 'command' method, it's better to use 'query' method instead of 2 separate 'command' and 'read'.
+        Read VISA message from instrument, such as the reply of a query sent by 'write_query'.
+        It's better to use 'query' method instead of 2 separate 'write_query' and 'read'.
+        :param bin: (bool) if true, get data in binary as list of int, see read_binary for bytes, numpy array, buffer
+            and file.
         :return: (str) message sent from instrument
         """
-        return self.__inst.read_binary_values('B') if bin else self.__inst.read()
+        session = self.__session
+        with session.lock:
+            if session.batch is not None:
+                session.batch.flush()
+            try:
+                read = self.__inst.read
+                args = ()
+                if bin:
+                    read = self.__inst.read_binary_values
+                    args = ('B',)
+                if profiling.enabled:
+                    return profiling.call(self, 'visa', 'read', None, read, *args)
+                return read(*args)
+            finally:
+                session.release_reply()
 
     def query(self, cmd, bin=False):
         """
         Send a command to instrument and read back immediately.
+        The write and read are done under the session lock, so replies will not be mixed up between
+        instruments sharing the same session.
+        In batch mode, the buffered messages are sent together with this query in one compound message.
         :param cmd: (str) VISA command
-        :param bin: (bool) if true, get data in binary.
+        :param bin: (bool) if true, get data in binary as list of int, see query_binary for bytes, numpy array, buffer
+            and file.
         :return: (str) message sent from instrument
         """
-        return self.__inst.query_binary_values(cmd, 'B') if bin else self.__inst.query(cmd)
+        with self.__session.lock:
+            self.__session.release_reply()
+            batch = self.__session.batch
+            if bin:
+                if batch is not None:
+                    batch.flush()
+                return self.__query_binary_values(cmd, 'B')
+            if batch is not None:
+                return batch.flush(cmd)
+            if profiling.enabled:
+                return profiling.call(self, 'visa', 'query', cmd, self.__inst.query, cmd,
+                                      delay=self.__inst.query_delay)
+            return self.__inst.query(cmd)
 
-    def close(self):
+    def read_binary(self, container=bytes, dtype='B', is_big_endian=False, out=None, file=None,
+                    chunk_size=CHUNK_SIZE):
+        """
+        Read an IEEE 488.2 definite length block sent by instrument, after a query sent by 'write_query'.
+        Without out or file, the block is read in one piece and returned without per-element conversion:
+            bytes: the data as it is,
+            memoryview: a read-only view of the data,
+            numpy.ndarray: a read-only array of dtype in the byte order, viewing the data.
+        With out or file, the block is read in chunks of chunk_size bytes, and the number of bytes read is returned.
+        :param container: (type) bytes|memoryview|numpy.ndarray
+        :param dtype: (str|numpy.dtype) data type of elements for numpy.ndarray, such as 'B', 'f4', 'f8'
+        :param is_big_endian: (bool) byte order of elements for numpy.ndarray
+        :param out: (writable bytes-like|None) buffer to write the data in, such as bytearray or a C-contiguous
+            numpy array. It should be large enough for the block.
+        :param file: (str|file object|None) path or binary file object to stream the data to
+        :param chunk_size: (int) bytes of each read for out or file
+        :return: data in container, or (int) number of bytes read for out or file
+        """
+        session = self.__session
+        with session.lock:
+            if session.batch is not None:
+                session.batch.flush()
+            try:
+                return self.__read_binary(None, container, dtype, is_big_endian, out, file, chunk_size)
+            finally:
+                session.release_reply()
+
+    def query_binary(self, cmd, container=bytes, dtype='B', is_big_endian=False, out=None, file=None,
+                     chunk_size=CHUNK_SIZE):
+        """
+        Send a query and read back an IEEE 488.2 definite length block, see read_binary for the options.
+        :param cmd: (str) VISA command
+        :return: data in container, or (int) number of bytes read for out or file
+        """
+        with self.__session.lock:
+            self.__session.release_reply()
+            if self.__session.batch is not None:
+                self.__session.batch.flush()
+            return self.__read_binary(cmd, container, dtype, is_big_endian, out, file, chunk_size)
+
+    def __read_binary(self, cmd, container, dtype, is_big_endian, out, file, chunk_size):
+        start = time.perf_counter()
+        delay = 0.0
+        if cmd is not None:
+            self.__inst.write(cmd)
+            delay = self.__inst.query_delay
+            if delay > 0:
+                time.sleep(delay)
+        if out is None and file is None:
+            data = self.__read_block()
+            nbytes = len(data)
+            if container is bytes:
+                result = data
+            elif container is memoryview:
+                result = memoryview(data)
+            else:
+                import numpy as np
+                dtype = np.dtype(dtype).newbyteorder('>' if is_big_endian else '<')
+                result = np.frombuffer(data, dtype=dtype)
+        elif file is not None and not hasattr(file, 'write'):
+            with open(file, 'wb') as f:
+                result = nbytes = self.__read_block(f.write, chunk_size=chunk_size)
+        elif file is not None:
+            result = nbytes = self.__read_block(file.write, chunk_size=chunk_size)
+        else:
+            write, size = self.__buffer_writer(out)
+            result = nbytes = self.__read_block(write, chunk_size=chunk_size, max_length=size)
+        self.__read_termination()
+        if profiling.enabled:
+            profiling.record(self, 'visa', 'read' if cmd is None else 'query', cmd,
+                             len(cmd or '') + nbytes, time.perf_counter() - start, delay)
+        return result
+
+    def query_binary_values(self, cmd, datatype='B', is_big_endian=False, container=list):
+        """
+        Send a query and read back an IEEE 488.2 binary block, decoded by pyvisa.
+        :param cmd: (str) VISA command
+        :param datatype: (str) format character of struct module, such as 'B', 'f', 'd'
+        :param is_big_endian: (bool) byte order of data
+        :param container: (type) container of the values, such as list, numpy.array
+        :return: decoded values in container
+        """
+        with self.__session.lock:
+            self.__session.release_reply()
+            if self.__session.batch is not None:
+                self.__session.batch.flush()
+            return self.__query_binary_values(cmd, datatype, is_big_endian, container)
+
+    def __query_binary_values(self, cmd, datatype, is_big_endian=False, container=list):
+        if profiling.enabled:
+            return profiling.call(self, 'visa', 'query', cmd, self.__inst.query_binary_values, cmd, datatype,
+                                  is_big_endian, container, delay=self.__inst.query_delay)
+        return self.__inst.query_binary_values(cmd, datatype, is_big_endian, container)
+
+    def query_binary_blocks(self, cmd, count, out=None, chunk_size=CHUNK_SIZE):
+        """
+        Send a query whose reply has several IEEE 488.2 definite length blocks, such as a compound query of binary
+        data, and read back all the blocks in one round trip.
+        :param cmd: (str) VISA command
+        :param count: (int) number of blocks in the reply
+        :param out: (list of writable bytes-like|None) buffers to write each block in, such as rows of a numpy
+            array, see read_binary. All the blocks are read even if a buffer is too small, then ValueError is raised.
+        :param chunk_size: (int) bytes of each read for out
+        :return: (list of bytes) data of each block, or (list of int) number of bytes of each block for out
+        """
+        if out is not None and len(out) != count:
+            raise ValueError('out should have %d buffers, got %d' % (count, len(out)))
+        with self.__session.lock:
+            self.__session.release_reply()
+            if self.__session.batch is not None:
+                self.__session.batch.flush()
+            if not profiling.enabled:
+                return self.__query_binary_blocks(cmd, count, out, chunk_size)
+            start = time.perf_counter()
+            blocks = self.__query_binary_blocks(cmd, count, out, chunk_size)
+            nbytes = sum(blocks) if out is not None else sum(len(block) for block in blocks)
+            profiling.record(self, 'visa', 'query', cmd, len(cmd) + nbytes, time.perf_counter() - start,
+                             self.__inst.query_delay)
+            return blocks
+
+    def __query_binary_blocks(self, cmd, count, out, chunk_size):
+        self.__inst.write(cmd)
+        if self.__inst.query_delay > 0:
+            time.sleep(self.__inst.query_delay)
+        blocks = []
+        error = None
+        for i in range(count):
+            if i:
+                # separator of replies
+                self.__inst.read_bytes(1)
+            if out is None:
+                blocks.append(self.__read_block())
+                continue
+            length = self.__read_block_length()
+            write, size = self.__buffer_writer(out[i])
+            if error is None and length > size:
+                error = ValueError('Buffer of %d bytes is too small for block %d of %d bytes' % (size, i, length))
+            if error is not None:
+                # drain the rest of the reply
+                self.__inst.read_bytes(length)
+            else:
+                self.__read_block_data(length, write, chunk_size)
+            blocks.append(length)
+        self.__read_termination()
+        if error is not None:
+            raise error
+        return blocks
+
+    @staticmethod
+    def __buffer_writer(out):
+        """
+        :param out: (writable bytes-like) buffer
+        :return: (tuple) (callable writing each chunk after the previous one in out, int size of out in bytes)
+        """
+        view = memoryview(out).cast('B')
+        position = [0]
+
+        def write(chunk):
+            view[position[0]:position[0] + len(chunk)] = chunk
+            position[0] += len(chunk)
+        return write, view.nbytes
+
+    def __read_termination(self):
         """
-        Close the session of visa resource
+        Read the termination after a binary block, nothing if read termination is empty.
         """
-        self.__inst.close()
+        termination = self.__inst.read_termination
+        if termination:
+            self.__inst.read_bytes(len(termination.encode(self.__inst.encoding)))
 
+    def __read_block(self, write=None, chunk_size=CHUNK_SIZE, max_length=None):
+        """
+        Read an IEEE 488.2 definite length block.
+        :param write: (callable|None) called with each chunk of data, the data is returned in one piece if None
+        :param max_length: (int|None) max length of block, the block is drained and ValueError is raised if exceeded
+        :return: (bytes) data, or (int) length of block if write is given
+        """
+        length = self.__read_block_length()
+        if write is None:
+            return self.__inst.read_bytes(length)
+        if max_length is not None and length > max_length:
+            self.__inst.read_bytes(length)
+            self.__read_termination()
+            raise ValueError('Buffer of %d bytes is too small for the block of %d bytes' % (max_length, length))
+        self.__read_block_data(length, write, chunk_size)
+        return length
+
+    def __read_block_length(self):
+        """
+        Read the header of an IEEE 488.2 definite length block.
+        :return: (int) length of block
+        """
+        header = self.__inst.read_bytes(2)
+        if header[:1] != b'#' or not b'1' <= header[1:2] <= b'9':
+            raise ValueError('Reply is not an IEEE 488.2 definite length block: %r' % header)
+        return int(self.__inst.read_bytes(int(header[1:2])))
+
+    def __read_block_data(self, length, write, chunk_size=CHUNK_SIZE):
+        """
+        Read the data of a block in chunks.
+        """
+        remaining = length
+        while remaining:
+            chunk = self.__inst.read_bytes(min(chunk_size, remaining))
+            write(chunk)
+            remaining -= len(chunk)
+
+    def locked(self):
+        """
+        Lock the session for a sequence of operations, used as: with instrument.locked(): ...
+        Other threads (and other slot objects of the same frame) wait until the with block exits.
+        :return: (SessionLock) the session lock
+        """
+        return self.__session.lock
+
+    def get_lock_stats(self):
+        """
+        Get contention statistics of the session lock, to see where threads queue up.
+        :return: (dict) see SessionLock.stats
+        """
+        return self.__session.lock.stats()
+
+    def compound_query(self, *cmds):
+        """
+        Send several SCPI queries in one compound message and read back all the replies in one round trip.
+        :param cmds: (str) SCPI queries
+        :return: (list of str) replies of each query
+        """
+        with self.batch() as batch:
+            futures = [batch.query(cmd) for cmd in cmds]
+            batch.flush()
+        return [future.result() for future in futures]
+
+    @contextmanager
+    def batch(self):
+        """
+        Batch mode for SCPI instruments. Used as: with instrument.batch(): ...
+        Inside the with block, commands are buffered and joined with ';' into one write, which is sent when
+        the block exits or when a reply is needed. A query sends the buffered commands with itself in one
+        compound message and returns its reply as usual. batch.query() buffers a query and returns a future
+        of its reply instead.
+        The batch belongs to the shared session, so slot objects of one frame can be batched together.
+        Buffered messages are discarded if an exception is raised in the block.
+        :return: (CommandBatch) the active batch
+        """
+        session = self.__session
+        with session.lock:
+            if session.batch is not None:
+                # nested batch, join the outer one
+                yield session.batch
+                return
+            batch = session.batch = CommandBatch(self.__inst, instrument=self)
+            try:
+                yield batch
+                batch.flush()
+            except BaseException:
+                batch.discard()
+                raise
+            finally:
+                session.batch = None
+
+    def close(self):
+        """
+        Close the session of visa resource. The shared session is closed when the last instrument using it is closed.
+        """
+        if self.__session is not None:
+            self.__session.release()
+            self.__session = None
@@ -1,39 +1,64 @@
-from .AQ2200_215 import ModelAQ2200_215
-from .AQ2200_221 import ModelAQ2200_221
-from .AQ2200_311A import ModelAQ2200_311A
-from .AQ2200_331 import ModelAQ2200_331
-from .AQ2200_342 import ModelAQ2200_342
-from .AQ6150 import ModelAQ6150
-from .AQ6370 import ModelAQ6370
-from .ATS535 import ModelATS535
-from .BTF10011 import ModelBTF10011
-from .E3631A import ModelE3631A
-from .E3633A import ModelE3633A
-from .EPS1000 import ModelEPS1000
-from .M81571A import Model81571A
-from .M8163A import Model81635A
-from .M8292A import ModelM8292A
-from .MAP200_mVoaC1 import ModelMAP200_mVoaC1
-from .MC711 import ModelMC711
-from .MC811 import ModelMC811
-from .MPC202 import ModelMPC202
-from .MSO5000 import ModelMSO5000
-from .MSOX6000 import ModelMSOX6000
-from .MT3065 import ModelMT3065
-from .N4392A import ModelN4392A
-from .N7744A import ModelN7744A
-from .N7752A import ModelN7752A
-from .N7764A import ModelN7764A
-from .NSW import ModelNSW
-from .OTF930 import ModelOTF930
-from .OTF970 import ModelOTF970
-from .OTF980 import ModelOTF980
-from .PDLE101 import ModelPDLE101
-from .PMD1000 import ModelPMD1000
-from .PSY101 import ModelPSY101
-from .PSY201 import ModelPSY201
-from .TC3625 import ModelTC3625
-from .WaveAnalyzer1500S import ModelWaveAnalyzer1500S
-from .WaveShaper4000A import ModelWaveShaper4000A
-from .XTA50 import ModelXTA50
-from .AT5524 import ModelAT5524
+"""
+Instrument models, loaded lazily: a model module is imported at the first access of its class, such as
+models.ModelN7744A, so that importing pyinst does not import all the models and their dependencies.
+"""
+import importlib
+
+# class name => module name
+_model_modules = {
+    'ModelAQ2200_215': 'AQ2200_215',
+    'ModelAQ2200_221': 'AQ2200_221',
+    'ModelAQ2200_311A': 'AQ2200_311A',
+    'ModelAQ2200_331': 'AQ2200_331',
+    'ModelAQ2200_342': 'AQ2200_342',
+    'ModelAQ6150': 'AQ6150',
+    'ModelAQ6370': 'AQ6370',
+    'ModelATS535': 'ATS535',
+    'ModelBTF10011': 'BTF10011',
+    'ModelE3631A': 'E3631A',
+    'ModelE3633A': 'E3633A',
+    'ModelEPS1000': 'EPS1000',
+    'Model81571A': 'M81571A',
+    'Model81635A': 'M8163A',
+    'ModelM8292A': 'M8292A',
+    'ModelMAP200_mVoaC1': 'MAP200_mVoaC1',
+    'ModelMC711': 'MC711',
+    'ModelMC811': 'MC811',
+    'ModelMPC202': 'MPC202',
+    'ModelMSO5000': 'MSO5000',
+    'ModelMSOX6000': 'MSOX6000',
+    'ModelMT3065': 'MT3065',
+    'ModelN4392A': 'N4392A',
+    'ModelN7744A': 'N7744A',
+    'ModelN7752A': 'N7752A',
+    'ModelN7764A': 'N7764A',
+    'ModelNSW': 'NSW',
+    'ModelOTF930': 'OTF930',
+    'ModelOTF970': 'OTF970',
+    'ModelOTF980': 'OTF980',
+    'ModelPDLE101': 'PDLE101',
+    'ModelPMD1000': 'PMD1000',
+    'ModelPSY101': 'PSY101',
+    'ModelPSY201': 'PSY201',
+    'ModelTC3625': 'TC3625',
+    'ModelWaveAnalyzer1500S': 'WaveAnalyzer1500S',
+    'ModelWaveShaper4000A': 'WaveShaper4000A',
+    'ModelXTA50': 'XTA50',
+    'ModelAT5524': 'AT5524',
+}
+
+__all__ = list(_model_modules)
+
+
+def __getattr__(name):
+    try:
+        module_name = _model_modules[name]
+    except KeyError:
+        raise AttributeError('module %r has no attribute %r' % (__name__, name))
+    cls = getattr(importlib.import_module('.' + module_name, __name__), name)
+    globals()[name] = cls
+    return cls
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,245 @@
+"""
+Background sampling of optical power meters, shared by all the consumers of the readings.
+"""
+import threading
+import time
+from collections import deque
+from .constants import OpticalUnit
+from .instrument_types import TypeOPM
+
+__all__ = ['PowerMonitor']
+
+
+class PowerMonitor(object):
+    """
+    Sample one or more OPM channels on a background thread at a target rate, and keep the timestamped readings in
+    a fixed-size ring buffer. Rolling statistics over the buffer and snapshots are got without touching the
+    instruments:
+
+        with PowerMonitor([opm1, opm2], rate=20, size=1000) as monitor:
+            ...
+            timestamp, values = monitor.latest()
+            stats = monitor.stats()
+
+    Channels of the same model and frame which support read_all_powers (such as N77xx, AQ2200) are read in one
+    query.
+    """
+
+    def __init__(self, opms, rate=10.0, size=1000, unit=OpticalUnit.DBM.value):
+        """
+        :param opms: (TypeOPM|list of TypeOPM) OPM channels to sample
+        :param rate: (float) target sampling rate in Hz
+        :param size: (int) capacity of the ring buffer, also the window of rolling statistics
+        :param unit: (int) value of <enum 'OpticalUnit'>, unit of the readings
+        """
+        if isinstance(opms, TypeOPM):
+            opms = [opms]
+        opms = list(opms)
+        if not opms:
+            raise ValueError('opms should not be empty')
+        for opm in opms:
+            if not isinstance(opm, TypeOPM):
+                raise TypeError('opms should be instances of TypeOPM')
+        if not isinstance(rate, (int, float)) or rate <= 0:
+            raise ValueError('rate should be a positive number')
+        if not isinstance(size, int) or size < 1:
+            raise ValueError('size should be a positive int')
+        if unit not in (OpticalUnit.DBM.value, OpticalUnit.W.value):
+            raise ValueError('Invalid optical unit: %r' % unit)
+        self.opms = opms
+        self.rate = rate
+        self.size = size
+        self.unit = unit
+        self.errors = 0
+        self.last_error = None
+        self.__readers = self.__group_readers(opms)
+        self.__lock = threading.Lock()
+        self.__thread = None
+        self.__stop = threading.Event()
+        self.__reset_buffer()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    # sampling
+    def __group_readers(self, opms):
+        """
+        :return: (list of tuple) (callable returning values, list of column indexes)
+        """
+        readers = []
+        frames = {}  # (model class, resource name) => (first opm, [frame channel], [column])
+        for i, opm in enumerate(opms):
+            if type(opm).read_all_powers is not TypeOPM.read_all_powers:
+                key = (type(opm), opm.resource_name)
+                frames.setdefault(key, (opm, [], []))
+                frames[key][1].append((opm.slot, opm.channel))
+                frames[key][2].append(i)
+            else:
+                get_value = opm.get_dbm_value if self.unit == OpticalUnit.DBM.value else opm.get_w_value
+                readers.append((lambda get_value=get_value: [get_value()], [i]))
+        for opm, channels, columns in frames.values():
+            readers.append((lambda opm=opm, channels=channels: opm.read_all_powers(channels, self.unit)[1], columns))
+        return readers
+
+    def sample(self):
+        """
+        Read all the channels once, and append the readings to the buffer.
+        :return: (tuple) (float timestamp, numpy.ndarray values)
+        """
+        import numpy as np
+        values = np.empty(len(self.opms))
+        start = time.time()
+        for read, columns in self.__readers:
+            values[columns] = read()
+        timestamp = (start + time.time())/2
+        with self.__lock:
+            self.__append(timestamp, values)
+        return timestamp, values
+
+    def __run(self):
+        period = 1.0/self.rate
+        next_time = time.monotonic()
+        while not self.__stop.is_set():
+            try:
+                self.sample()
+            except Exception as e:
+                self.errors += 1
+                self.last_error = e
+            next_time += period
+            delay = next_time - time.monotonic()
+            if delay < 0:
+                # cannot keep up with the rate, do not try to catch up
+                next_time = time.monotonic()
+                delay = 0
+            self.__stop.wait(delay)
+
+    def start(self):
+        """
+        Start sampling on the background thread.
+        """
+        if self.is_running():
+            return
+        self.__stop.clear()
+        self.__thread = threading.Thread(target=self.__run, name='PowerMonitor', daemon=True)
+        self.__thread.start()
+
+    def stop(self, timeout=None):
+        """
+        Stop sampling and wait for the background thread to exit.
+        """
+        self.__stop.set()
+        if self.__thread is not None:
+            self.__thread.join(timeout)
+            self.__thread = None
+
+    def is_running(self):
+        return self.__thread is not None and self.__thread.is_alive()
+
+    # ring buffer and rolling statistics
+    def __reset_buffer(self):
+        import numpy as np
+        n = len(self.opms)
+        self.__times = np.zeros(self.size)
+        self.__values = np.zeros((self.size, n))
+        self.__count = 0  # number of samples in the buffer
+        self.__total = 0  # number of samples ever appended
+        self.__sum = np.zeros(n)
+        self.__sum_sq = np.zeros(n)
+        # monotonic queues of (sample number, value) for rolling min / max of each channel
+        self.__min_queues = [deque() for _ in range(n)]
+        self.__max_queues = [deque() for _ in range(n)]
+
+    def clear(self):
+        """
+        Drop all the readings.
+        """
+        with self.__lock:
+            self.__reset_buffer()
+
+    def __append(self, timestamp, values):
+        index = self.__total % self.size
+        if self.__count == self.size:
+            old = self.__values[index]
+            self.__sum -= old
+            self.__sum_sq -= old*old
+        else:
+            self.__count += 1
+        self.__times[index] = timestamp
+        self.__values[index] = values
+        self.__sum += values
+        self.__sum_sq += values*values
+        total = self.__total
+        oldest = total - self.__count + 1
+        for i, value in enumerate(values.tolist()):
+            for queue, replaces in ((self.__min_queues[i], float.__ge__), (self.__max_queues[i], float.__le__)):
+                while queue and replaces(queue[-1][1], value):
+                    queue.pop()
+                queue.append((total, value))
+                if queue[0][0] < oldest:
+                    queue.popleft()
+        self.__total = total + 1
+        if self.__total % self.size == 0:
+            # recompute the sums once per buffer length, so that rounding errors do not accumulate
+            self.__sum = self.__values.sum(axis=0)
+            self.__sum_sq = (self.__values*self.__values).sum(axis=0)
+
+    def __ordered(self, n):
+        """
+        :return: (tuple) (times, values) of the last n samples, oldest first
+        """
+        import numpy as np
+        end = self.__total % self.size
+        indexes = np.arange(end - n, end) % self.size
+        return self.__times[indexes], self.__values[indexes]
+
+    def latest(self):
+        """
+        :return: (tuple) (float timestamp, numpy.ndarray values) of the last sample, (None, None) if no sample
+        """
+        with self.__lock:
+            if not self.__count:
+                return None, None
+            index = (self.__total - 1) % self.size
+            return float(self.__times[index]), self.__values[index].copy()
+
+    def snapshot(self, samples=None, seconds=None):
+        """
+        Copy of the readings in a window.
+        :param samples: (int|None) only the last samples
+        :param seconds: (float|None) only the samples of the last seconds
+        :return: (tuple) (numpy.ndarray timestamps, numpy.ndarray values of shape (samples, channels)), oldest first
+        """
+        import numpy as np
+        with self.__lock:
+            n = self.__count if samples is None else min(samples, self.__count)
+            times, values = self.__ordered(n)
+        if seconds is not None and len(times):
+            start = np.searchsorted(times, times[-1] - seconds, side='left')
+            times, values = times[start:], values[start:]
+        return times, values
+
+    def stats(self):
+        """
+        Rolling statistics of each channel over the buffer, in O(1).
+        :return: (dict) {"count": int, "mean", "std", "min", "max": numpy.ndarray of each channel}, values are nan if
+            there is no sample
+        """
+        import numpy as np
+        with self.__lock:
+            n = self.__count
+            if not n:
+                nan = np.full(len(self.opms), np.nan)
+                return {"count": 0, "mean": nan, "std": nan.copy(), "min": nan.copy(), "max": nan.copy()}
+            mean = self.__sum/n
+            variance = np.maximum(self.__sum_sq/n - mean*mean, 0)
+            return {
+                "count": n,
+                "mean": mean,
+                "std": np.sqrt(variance),
+                "min": np.array([q[0][1] for q in self.__min_queues]),
+                "max": np.array([q[0][1] for q in self.__max_queues]),
+            }
@@ -0,0 +1,276 @@
+"""
+Per-command latency profiler of instrument I/O.
+
+    from pyinst import profiling
+    profiling.enable()
+    ...  # talk to instruments
+    print(profiling.format_report())
+
+Every write/read/query of the visa, serial, usb and http transports is recorded with its command text, the calling
+method of the model, bytes transferred and wall time, and aggregated per model, method and kind of operation. Fixed
+delays in models (time.sleep) are recorded as kind and transport 'sleep', so that they are not counted in the I/O
+time of a transport. Callbacks added by add_hook receive every record.
+When disabled, the overhead is one check of a module flag per operation.
+"""
+import inspect
+import math
+import os
+import sys
+import threading
+import time
+from functools import wraps
+
+__all__ = []
+
+enabled = False
+_hooks = []
+_stats = {}  # (model, method, kind) => _Stat
+_lock = threading.Lock()
+_this_file = os.path.normcase(os.path.abspath(__file__))
+_method_codes = {}  # (class, code) => if code is a method of class, see _is_method_code
+
+
+class _Stat(object):
+
+    def __init__(self, transport):
+        self.transport = transport
+        self.count = 0
+        self.total_time = 0.0
+        self.min_time = float('inf')
+        self.max_time = 0.0
+        self.delay_time = 0.0
+        self.bytes = 0
+        self.histogram = {}  # bucket => count, bucket n holds durations in [2**n, 2**(n+1)) us
+
+    def add(self, duration, nbytes, delay):
+        self.count += 1
+        self.total_time += duration
+        self.min_time = min(self.min_time, duration)
+        self.max_time = max(self.max_time, duration)
+        self.delay_time += delay
+        self.bytes += nbytes
+        bucket = int(math.floor(math.log2(duration*1e6))) if duration > 1e-6 else 0
+        self.histogram[bucket] = self.histogram.get(bucket, 0) + 1
+
+
+def enable(reset_stats=False):
+    """
+    Start recording instrument I/O.
+    :param reset_stats: (bool) if clear the statistics recorded before.
+    """
+    global enabled
+    if reset_stats:
+        reset()
+    enabled = True
+
+
+def disable():
+    """
+    Stop recording instrument I/O. Recorded statistics are kept.
+    """
+    global enabled
+    enabled = False
+
+
+def reset():
+    """
+    Clear recorded statistics.
+    """
+    with _lock:
+        _stats.clear()
+
+
+def add_hook(callback):
+    """
+    Add a callback called with every record (dict) while profiling is enabled, see record for its keys.
+    """
+    if callback not in _hooks:
+        _hooks.append(callback)
+
+
+def remove_hook(callback):
+    if callback in _hooks:
+        _hooks.remove(callback)
+
+
+def _calling_method(instrument):
+    """
+    Name of the outermost method of instrument in the call stack, such as 'get_dbm_value'.
+    """
+    name = None
+    frame = sys._getframe(2)
+    while frame is not None:
+        if os.path.normcase(frame.f_code.co_filename) != _this_file and \
+                frame.f_code.co_argcount and frame.f_locals.get('self') is instrument:
+            # frames of decorator wrappers are skipped, the decorated method has its own frame
+            if _is_method_code(type(instrument), frame.f_code):
+                name = frame.f_code.co_name
+        elif name is not None:
+            break
+        frame = frame.f_back
+    return name
+
+
+def _is_method_code(cls, code):
+    """
+    If code is the code of a method of cls, unwrapped from its decorators (made with functools.wraps). False for
+    the code of decorator wrappers.
+    """
+    key = (cls, code)
+    result = _method_codes.get(key)
+    if result is None:
+        name = code.co_name
+        if name.startswith('__') and not name.endswith('__'):
+            # private method, with mangled name
+            names = ['_%s%s' % (base.__name__.lstrip('_'), name) for base in cls.__mro__]
+        else:
+            names = [name]
+        result = False
+        for attr_name in names:
+            attr = inspect.getattr_static(cls, attr_name, None)
+            if isinstance(attr, property):
+                attr = attr.fget
+            attr = getattr(attr, '__func__', attr)
+            if callable(attr) and getattr(inspect.unwrap(attr), '__code__', None) is code:
+                result = True
+                break
+        _method_codes[key] = result
+    return result
+
+
+def _size(data):
+    if data is None:
+        return 0
+    if isinstance(data, str):
+        return len(data.encode('utf-8', 'replace'))
+    nbytes = getattr(data, 'nbytes', None)  # numpy array, memoryview
+    if nbytes is not None:
+        return nbytes
+    if isinstance(data, (list, tuple)) and data and isinstance(data[0], (bytes, str)):
+        return sum(_size(i) for i in data)
+    try:
+        return len(data)
+    except TypeError:
+        return 0
+
+
+def record(instrument, transport, kind, text, nbytes, duration, delay=0.0):
+    """
+    Record one I/O operation.
+    :param instrument: model object doing the operation
+    :param transport: (str) 'visa'|'serial'|'usb'|'http', or 'sleep' for fixed delays recorded by sleep
+    :param kind: (str) 'write'|'read'|'query'|'sleep'...
+    :param text: (str|None) command text, url...
+    :param nbytes: (int) bytes transferred
+    :param duration: (float) wall time in s
+    :param delay: (float) part of duration spent in fixed delay, such as visa query_delay
+    """
+    model = type(instrument).__name__
+    method = _calling_method(instrument)
+    with _lock:
+        key = (model, method, kind)
+        stat = _stats.get(key)
+        if stat is None:
+            stat = _stats[key] = _Stat(transport)
+        stat.add(duration, nbytes, delay)
+    if _hooks:
+        event = {
+            "time": time.time(),
+            "transport": transport,
+            "model": model,
+            "resource_name": getattr(instrument, 'resource_name', None),
+            "method": method,
+            "kind": kind,
+            "text": text,
+            "bytes": nbytes,
+            "duration": duration,
+            "delay": delay
+        }
+        for hook in list(_hooks):
+            hook(event)
+
+
+def call(instrument, transport, kind, text, func, *args, **kwargs):
+    """
+    Call func(*args, **kwargs) and record it. The bytes of text and of the return value are counted.
+    :param delay: (float, keyword only) fixed delay included in the call
+    :return: return value of func
+    """
+    delay = kwargs.pop('delay', 0.0)
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    duration = time.perf_counter() - start
+    record(instrument, transport, kind, text, _size(text) + _size(result), duration, delay)
+    return result
+
+
+def profiled(transport, kind):
+    """
+    Decorator for I/O methods of models, such as: @profiling.profiled('serial', 'write').
+    The first argument is recorded as command text if it is str or bytes.
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(self, *args, **kwargs):
+            if not enabled:
+                return func(self, *args, **kwargs)
+            text = args[0] if args and isinstance(args[0], (str, bytes)) else None
+            return call(self, transport, kind, text, func, self, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def sleep(instrument, seconds):
+    """
+    time.sleep which is recorded as kind 'sleep' of instrument when profiling is enabled. The transport of the record
+    is 'sleep' too, the delay is not I/O of the transport of the instrument.
+    """
+    if not enabled:
+        return time.sleep(seconds)
+    start = time.perf_counter()
+    time.sleep(seconds)
+    duration = time.perf_counter() - start
+    record(instrument, 'sleep', 'sleep', None, 0, duration, duration)
+
+
+def report():
+    """
+    Get aggregated statistics, sorted by total time.
+    :return: (list of dict) {"model", "method", "kind", "transport", "count", "total_time", "mean_time", "min_time",
+        "max_time", "delay_time", "bytes", "histogram"}, time in s, histogram is {str "<n>us" => count}, where the
+        bucket holds durations in [n, 2n) us. "transport" is 'visa'|'serial'|'usb'|'http', or 'sleep' for the fixed
+        delays recorded by sleep; filter it out to total the I/O time per transport.
+    """
+    with _lock:
+        items = list(_stats.items())
+    result = []
+    for (model, method, kind), stat in items:
+        result.append({
+            "model": model,
+            "method": method,
+            "kind": kind,
+            "transport": stat.transport,
+            "count": stat.count,
+            "total_time": stat.total_time,
+            "mean_time": stat.total_time/stat.count,
+            "min_time": stat.min_time,
+            "max_time": stat.max_time,
+            "delay_time": stat.delay_time,
+            "bytes": stat.bytes,
+            "histogram": {'%dus' % 2**bucket: count for bucket, count in sorted(stat.histogram.items())}
+        })
+    result.sort(key=lambda i: i["total_time"], reverse=True)
+    return result
+
+
+def format_report():
+    """
+    :return: (str) report as a text table
+    """
+    lines = ['{:<24} {:<24} {:<6} {:>7} {:>10} {:>10} {:>10} {:>10} {:>10}'.format(
+        'model', 'method', 'kind', 'count', 'total(ms)', 'mean(ms)', 'max(ms)', 'delay(ms)', 'bytes')]
+    for i in report():
+        lines.append('{:<24} {:<24} {:<6} {:>7d} {:>10.3f} {:>10.3f} {:>10.3f} {:>10.3f} {:>10d}'.format(
+            i["model"], str(i["method"]), i["kind"], i["count"], i["total_time"]*1e3, i["mean_time"]*1e3,
+            i["max_time"]*1e3, i["delay_time"]*1e3, i["bytes"]))
+    return '\n'.join(lines)
@@ -0,0 +1,232 @@
+"""
+Registry of instrument models, indexed by instrument type, brand, model and capability.
+
+It is built from the generated manifest models/manifest.json, so that looking up models does not import them.
+Models missing in the manifest (newly added without updating it) and models registered by register_model are
+inspected from their classes. Update the manifest after adding or changing a model:
+
+    python -c "from pyinst import registry; registry.build_manifest()"
+"""
+import copy
+import json
+import os.path
+import threading
+from .constants import InstrumentType
+from . import models
+
+__all__ = ['find_models', 'get_model_info', 'register_model']
+
+MANIFEST_PATH = os.path.join(os.path.dirname(__file__), 'models', 'manifest.json')
+
+_lock = threading.RLock()
+_entries = None  # class name => model info, see inspect_model
+_indexes = None  # index name => {key => tuple(class name)}
+_classes = {}  # class name => class of models registered by register_model
+_cache = {}  # cached exports, cleared when the registry changes
+
+
+def _type_classes(model_cls):
+    return [c for c in model_cls.__mro__ if c.__name__.startswith('Type')]
+
+
+def _is_implemented(model_cls, type_cls, name):
+    """
+    If method name of type_cls is really implemented by model_cls: overridden by a class which is not an instrument
+    type, or the default implementation of the instrument type does not raise NotImplementedError.
+    """
+    for c in model_cls.__mro__:
+        if name in c.__dict__:
+            owner = c
+            break
+    else:
+        return False
+    if owner not in _type_classes(model_cls):
+        return True
+    code = getattr(type_cls.__dict__[name], '__code__', None)
+    return code is not None and '_raise_not_implemented' not in code.co_names
+
+
+def inspect_model(model_cls, class_name=None, module=None):
+    """
+    Get the registry information of a model class.
+    :param model_cls: (type) model class
+    :param class_name: (str) name in models, the __name__ of model_cls if None
+    :param module: (str) module name in models, such as 'N7744A'
+    :return: (dict) {"class_name", "module", "model", "brand", "params", "details", "types", "capabilities"}
+        types are names of InstrumentType, capabilities are implemented methods of instrument types, as
+        "<type>.<method>", such as "OPM.get_power_value"
+    """
+    types = []
+    capabilities = []
+    for type_cls in _type_classes(model_cls):
+        type_str = type_cls.__name__.replace('Type', '')
+        types.append(type_str)
+        for name, attr in type_cls.__dict__.items():
+            if name.startswith('_') or not callable(attr):
+                continue
+            if _is_implemented(model_cls, type_cls, name):
+                capabilities.append('%s.%s' % (type_str, name))
+    model = model_cls.model
+    return {
+        "class_name": class_name or model_cls.__name__,
+        "module": module or model_cls.__module__.rsplit('.', 1)[-1],
+        "model": list(model) if isinstance(model, (tuple, list)) else model,
+        "brand": model_cls.brand,
+        "params": model_cls.params,
+        "details": model_cls.details,
+        "types": types,
+        "capabilities": capabilities
+    }
+
+
+def build_manifest(filepath=MANIFEST_PATH):
+    """
+    Import all the models and write their information to the manifest file.
+    :param filepath: (str) path of the manifest json file
+    :return: (list of dict) manifest entries, see inspect_model
+    """
+    entries = [inspect_model(getattr(models, i), i, models._model_modules[i]) for i in models.__all__]
+    with open(filepath, 'w', encoding='utf-8') as f:
+        json.dump(entries, f, indent=2, ensure_ascii=False)
+        f.write('\n')
+    return entries
+
+
+def _load():
+    """
+    Build the entries and indexes at first use.
+    """
+    global _entries, _indexes
+    with _lock:
+        if _entries is not None:
+            return
+        entries = {}
+        try:
+            with open(MANIFEST_PATH, encoding='utf-8') as f:
+                for entry in json.load(f):
+                    entries[entry["class_name"]] = entry
+        except FileNotFoundError:
+            pass
+        for i in models.__all__:
+            if i not in entries:
+                entries[i] = inspect_model(getattr(models, i), i, models._model_modules[i])
+        for i, model_cls in _classes.items():
+            entries[i] = inspect_model(model_cls, i)
+        indexes = {'type': {}, 'brand': {}, 'model': {}, 'capability': {}}
+        for i, entry in entries.items():
+            model = entry["model"]
+            keys = {
+                'type': entry["types"],
+                'brand': [entry["brand"].upper()],
+                'model': [m.upper() for m in (model if isinstance(model, list) else [model])],
+                'capability': entry["capabilities"] + sorted({c.split('.', 1)[1] for c in entry["capabilities"]}),
+            }
+            for index, values in keys.items():
+                for value in values:
+                    indexes[index].setdefault(value, [])
+                    if i not in indexes[index][value]:
+                        indexes[index][value].append(i)
+        _indexes = {index: {k: tuple(v) for k, v in d.items()} for index, d in indexes.items()}
+        _entries = entries
+        _cache.clear()
+
+
+def register_model(model_cls, class_name=None):
+    """
+    Register a model class defined outside of pyinst.models, so that it can be found in the registry.
+    :param model_cls: (type) model class, sub class of BaseInstrument
+    :param class_name: (str) name in the registry, the __name__ of model_cls if None
+    """
+    if not isinstance(model_cls, type):
+        raise TypeError('model_cls should be a class')
+    global _entries, _indexes
+    with _lock:
+        _classes[class_name or model_cls.__name__] = model_cls
+        _entries = None
+        _indexes = None
+        _cache.clear()
+
+
+def get_model_class(class_name):
+    """
+    Get model class by class name. Models are imported at this call.
+    :param class_name: (str) such as 'ModelN7744A'
+    :return: (type) model class
+    """
+    try:
+        return _classes[class_name]
+    except KeyError:
+        return getattr(models, class_name)
+
+
+def get_model_info(class_name):
+    """
+    Get the registry information of a model, without importing it.
+    :param class_name: (str) such as 'ModelN7744A'
+    :return: (dict) see inspect_model
+    """
+    _load()
+    try:
+        return copy.deepcopy(_entries[class_name])
+    except KeyError:
+        raise ValueError('Unknown model class: %r' % class_name)
+
+
+def find_models(instrument_type=None, brand=None, model=None, capability=None):
+    """
+    Find models by instrument type, brand, model and capability. Conditions which are None are ignored, all the
+    models are returned if no condition is given.
+    :param instrument_type: (InstrumentType|str) such as InstrumentType.OPM or 'OPM'
+    :param brand: (str) brand, case insensitive
+    :param model: (str) model string, case insensitive, such as 'N7744A'
+    :param capability: (str) implemented method, "<type>.<method>" such as 'OPM.get_power_value' or only the method
+        name such as 'get_power_value'
+    :return: (tuple of str) class names, in the order of the registry
+    """
+    _load()
+    if isinstance(instrument_type, InstrumentType):
+        instrument_type = instrument_type.name
+    conditions = (('type', instrument_type), ('brand', brand and brand.upper()), ('model', model and model.upper()),
+                  ('capability', capability))
+    result = None
+    for index, key in conditions:
+        if key is None:
+            continue
+        names = _indexes[index].get(key, ())
+        result = names if result is None else tuple(i for i in result if i in names)
+    return tuple(_entries) if result is None else result
+
+
+def get_instrument_lib(detailed=True):
+    """
+    Get instrument model lib classified by type, see functions.get_instrument_lib.
+    """
+    _load()
+    key = ('lib', detailed)
+    with _lock:
+        if key not in _cache:
+            model_lib = {i.name: [] for i in InstrumentType}
+            for entry in _entries.values():
+                model_str = entry["model"]
+                if isinstance(model_str, list):
+                    model_str = '/'.join(model_str)
+                for type_str in entry["types"]:
+                    if detailed:
+                        model_lib[type_str].append({'model': model_str, 'brand': entry["brand"],
+                                                    'class_name': entry["class_name"], 'params': entry["params"],
+                                                    'details': entry["details"]})
+                    else:
+                        model_lib[type_str].append(model_str)
+            _cache[key] = model_lib
+        return copy.deepcopy(_cache[key])
+
+
+def export_json():
+    """
+    :return: (str) json of all the registry entries, cached until the registry changes
+    """
+    _load()
+    with _lock:
+        if 'json' not in _cache:
+            _cache['json'] = json.dumps(list(_entries.values()), ensure_ascii=False)
+        return _cache['json']
@@ -0,0 +1,46 @@
+from ._SimulatedDevice import SimulatedDevice, handles, dbm_to_unit
+
+
+class SimAQ2200(SimulatedDevice):
+    """
+    Simulated Yokogawa AQ2200 multi application test system frame, with sensor and attenuator modules in its slots.
+    input_power: (dict) (slot, channel) => optical power in dBm at the input, default_input_power if not in it.
+    """
+    idn = 'YOKOGAWA,AQ2211,SIM00001,1.0'
+    default_input_power = -10.0
+    defaults = (
+        (r'(SENS|OUTP)\d+:CHAN\d+:POW:UNIT', 0),
+        (r'SENS\d+:CHAN\d+:POW:ATIM', 0.1),
+        (r'OUTP\d+:CHAN\d+:ATIM', 0.1),
+        (r'(SENS\d+:CHAN\d+:POW|INP\d+:CHAN\d+):WAV', 1550e-9),
+        (r'SENS\d+:CHAN\d+:CORR', 0.0),
+        (r'OUTP\d+:CHAN\d+:POW:OFFS', 0.0),
+        (r'OUTP\d+:CHAN\d+', 0),
+        (r'INP\d+:CHAN\d+:ATT', 0.0),
+        (r'INP\d+:CHAN\d+:OFFS', 0.0),
+    )
+
+    def __init__(self, resource_name, model='AQ2211'):
+        super(SimAQ2200, self).__init__(resource_name)
+        self.idn = 'YOKOGAWA,%s,SIM00001,1.0' % model
+        self.input_power = {}
+
+    def power_dbm(self, slot, channel):
+        """
+        Measured power in dBm, with attenuation, calibration offset and noise.
+        """
+        prefix = '%d:CHAN%d' % (slot, channel)
+        power = self.input_power.get((slot, channel), self.default_input_power)
+        if self.get_setting('OUTP' + prefix):
+            power -= self.get_setting('INP%s:ATT' % prefix) + self.get_setting('INP%s:OFFS' % prefix)
+        power += self.get_setting('SENS%s:CORR' % prefix) + self.get_setting('OUTP%s:POW:OFFS' % prefix)
+        return self.measure(power)
+
+    def power_unit(self, slot, channel):
+        prefix = '%d:CHAN%d:POW:UNIT' % (slot, channel)
+        return self.settings.get('OUTP' + prefix, self.get_setting('SENS' + prefix))
+
+    @handles(r'(FETC|READ)(\d+):CHAN(\d+)(:SCAL)?:POW\?')
+    def _fetch_power(self, match, args):
+        slot, channel = int(match.group(2)), int(match.group(3))
+        return '{:+.8E}'.format(dbm_to_unit(self.power_dbm(slot, channel), self.power_unit(slot, channel)))
@@ -0,0 +1,40 @@
+from ._SimulatedDevice import SimulatedDevice, handles, dbm_to_unit
+from ..constants import LIGHT_SPEED
+
+
+class SimAQ6150(SimulatedDevice):
+    """
+    Simulated Yokogawa AQ6150/AQ6151 optical wavelength meter, measuring a single peak.
+    wavelength: (float) wavelength of input signal in nm
+    power: (float) power of input signal in dBm
+    wavelength_noise: (float) standard deviation of measured wavelength in nm
+    """
+    idn = 'YOKOGAWA,AQ6150,SIM00001,1.0'
+    defaults = (
+        (r'INIT:CONT', 0),
+        (r'UNIT:POW', 0),
+    )
+
+    def __init__(self, resource_name, model='AQ6150'):
+        super(SimAQ6150, self).__init__(resource_name)
+        self.idn = 'YOKOGAWA,%s,SIM00001,1.0' % model
+        self.wavelength = 1550.0
+        self.power = -5.0
+        self.wavelength_noise = 0.0
+
+    def measured_wavelength(self):
+        if self.wavelength_noise:
+            return self.wavelength + self.random.gauss(0, self.wavelength_noise)
+        return self.wavelength
+
+    @handles(r'(MEAS|FETC|READ):POW:WAV\?')
+    def _measure_wavelength(self, match, args):
+        return '{:+.10E}'.format(self.measured_wavelength()*1e-9)
+
+    @handles(r'(MEAS|FETC|READ):POW:FREQ\?')
+    def _measure_frequency(self, match, args):
+        return '{:+.10E}'.format(LIGHT_SPEED/self.measured_wavelength()*1e12)
+
+    @handles(r'(MEAS|FETC|READ):POW\?')
+    def _measure_power(self, match, args):
+        return '{:+.8E}'.format(dbm_to_unit(self.measure(self.power), self.get_setting('UNIT:POW')))
@@ -0,0 +1,252 @@
+import time
+import math
+import zlib
+import numpy as np
+from ._SimulatedDevice import SimulatedDevice, handles, parse_value, format_value, is_frequency
+from ._SimulatedResource import binary_block
+from ..constants import LIGHT_SPEED
+
+_C = LIGHT_SPEED*1e3  # m/s
+
+# 1x1 pixel 24 bit BMP, as screen capture
+_BMP = (b'BM\x3a\x00\x00\x00\x00\x00\x00\x00\x36\x00\x00\x00\x28\x00\x00\x00\x01\x00\x00\x00\x01\x00\x00\x00'
+        b'\x01\x00\x18\x00\x00\x00\x00\x00\x04\x00\x00\x00\x13\x0b\x00\x00\x13\x0b\x00\x00\x00\x00\x00\x00'
+        b'\x00\x00\x00\x00\xff\xff\xff\x00')
+
+_CATEGORIES = {'WDM': 11, 'DFBLD': 5, 'FPLD': 6, 'SMSR': 1}
+
+
+class SimAQ6370(SimulatedDevice):
+    """
+    Simulated Yokogawa AQ6370 optical spectrum analyzer.
+    signals: (list of tuple) (wavelength in nm, peak power in dBm, linewidth in nm) of input signals
+    noise_floor: (float) noise floor in dBm
+    sweep_time: (float) time of one sweep in s
+    """
+    idn = 'YOKOGAWA,AQ6370D,SIM00001,01.01'
+    defaults = (
+        (r'SENS:SWE:POIN', 1001),
+        (r'SENS:SWE:POIN:AUTO', 0),
+        (r'SENS:BWID(:RES)?', 0.02e-9),
+        (r'SENS:SENS', 'MID'),
+        (r'INIT:SMOD', 1),
+        (r'CALC:AUTO', 0),
+        (r'CALC:PAR:WDM:DTYP', 0),
+        (r'CALC:PAR:WDM:REL', 0),
+        (r'TRAC:ACT', 'TRA'),
+        (r'TRAC:ATTR:TR[A-G]', 0),
+        (r'UNIT:X', 0),
+        (r'CAL:ZERO', 1),
+    )
+
+    def __init__(self, resource_name, model='AQ6370D'):
+        super(SimAQ6370, self).__init__(resource_name)
+        self.idn = 'YOKOGAWA,%s,SIM00001,01.01' % model
+        self.signals = [(1550.0, -5.0, 0.01)]
+        self.noise_floor = -65.0
+        self.sweep_time = 0.0
+        self.start = 1545e-9
+        self.stop = 1555e-9
+        self.data_format = 'ASC'
+        self.category = 'WDM'
+        self.files = {}
+        self.__sweep_start = None
+        self.__rng = np.random.default_rng(zlib.crc32(resource_name.encode()))
+
+    # wavelength range
+    def __parse_wavelength(self, args):
+        value = parse_value(args)
+        return _C/value if is_frequency(args) else value
+
+    @handles(r'SENS:WAV:(STAR|STOP|CENT|SPAN)')
+    def _set_range(self, match, args):
+        item = match.group(1)
+        if item == 'SPAN':
+            value = parse_value(args)
+            center = (self.start + self.stop)/2
+            if is_frequency(args):
+                value = value*center**2/_C
+            self.start, self.stop = center - value/2, center + value/2
+        elif item == 'CENT':
+            span = self.stop - self.start
+            center = self.__parse_wavelength(args)
+            self.start, self.stop = center - span/2, center + span/2
+        else:
+            value = self.__parse_wavelength(args)
+            # start frequency is the stop wavelength
+            if (item == 'STAR') != is_frequency(args):
+                self.start = value
+            else:
+                self.stop = value
+            if self.start > self.stop:
+                self.start, self.stop = self.stop, self.start
+
+    @handles(r'SENS:WAV:(STAR|STOP|CENT|SPAN)\?')
+    def _get_range(self, match, args):
+        values = {
+            'STAR': self.start,
+            'STOP': self.stop,
+            'CENT': (self.start + self.stop)/2,
+            'SPAN': self.stop - self.start
+        }
+        return format_value(values[match.group(1)])
+
+    # sweep
+    @handles(r'INIT')
+    def _init(self, match, args):
+        self.__sweep_start = time.monotonic()
+
+    @handles(r'ABOR')
+    def _abort(self, match, args):
+        self.__sweep_start = None
+
+    def sweep_completed(self):
+        return self.__sweep_start is not None and time.monotonic() - self.__sweep_start >= self.sweep_time
+
+    @handles(r'STAT:OPER:EVEN\?')
+    def _operation_event(self, match, args):
+        # event register, cleared by reading. bit 0: sweep completed
+        if self.sweep_completed():
+            self.__sweep_start = None
+            return '1'
+        return '0'
+
+    def get_status_byte(self):
+        # bit 7: summary of the enabled operation events
+        operation = int(self.sweep_completed()) & int(self.get_setting('STAT:OPER:ENAB', 0))
+        return self.status_byte | (0x80 if operation else 0)
+
+    @handles(r'STAT:OPER:COND\?')
+    def _operation_condition(self, match, args):
+        return '0' if self.__sweep_start is None or self.sweep_completed() else '1'
+
+    # traces
+    @handles(r'FORM(:DATA)?')
+    def _set_format(self, match, args):
+        value = args.upper().replace(' ', '')
+        self.data_format = 'REAL,64' if value == 'REAL' else value
+
+    @handles(r'FORM(:DATA)?\?')
+    def _get_format(self, match, args):
+        return self.data_format
+
+    def sampling_points(self):
+        return int(self.get_setting('SENS:SWE:POIN'))
+
+    def frequency_mode(self):
+        """
+        If the X-axis is in frequency, then sampling points are linear in frequency.
+        """
+        return int(self.get_setting('UNIT:X')) == 1
+
+    def trace_x(self):
+        """
+        :return: (numpy.ndarray) wavelength in m, or frequency in Hz in frequency mode
+        """
+        if self.frequency_mode():
+            return np.linspace(_C/self.stop, _C/self.start, self.sampling_points())
+        return np.linspace(self.start, self.stop, self.sampling_points())
+
+    def trace_y(self):
+        """
+        :return: (numpy.ndarray) level in dBm
+        """
+        x = self.trace_x()
+        x = (_C/x if self.frequency_mode() else x)*1e9
+        resolution = self.get_setting('SENS:BWID:RES', self.get_setting('SENS:BWID'))*1e9
+        linear = np.full(x.shape, 10**(self.noise_floor/10))
+        for wavelength, power, width in self.signals:
+            width = max(width, resolution)
+            linear += 10**(power/10)*np.exp(-4*math.log(2)*((x - wavelength)/width)**2)
+        y = 10*np.log10(linear)
+        if self.noise:
+            y += self.__rng.normal(0, self.noise, y.shape)
+        return y
+
+    def format_trace(self, values):
+        if self.data_format.startswith('REAL'):
+            dtype = '<f4' if self.data_format.endswith('32') else '<f8'
+            return binary_block(values.astype(dtype).tobytes())
+        return ','.join('%.8E' % v for v in values)
+
+    @handles(r'TRAC(:DATA)?:(X|Y)\?')
+    def _trace_data(self, match, args):
+        params = [p.strip() for p in args.split(',')] if args else ['TRA']
+        values = self.trace_x() if match.group(2) == 'X' else self.trace_y()
+        if len(params) >= 3:
+            # 1 based, inclusive range of sampling points
+            values = values[int(params[1]) - 1:int(params[2])]
+        return self.format_trace(values)
+
+    @handles(r'TRAC(:DATA)?:SNUM\?')
+    def _trace_sampling_points(self, match, args):
+        return str(self.sampling_points())
+
+    @handles(r'TRAC:DEL(:ALL)?')
+    def _delete_trace(self, match, args):
+        pass
+
+    # analysis
+    @handles(r'CALC:CAT')
+    def _set_category(self, match, args):
+        value = args.strip().upper()
+        for name, code in _CATEGORIES.items():
+            if value in (name, str(code)):
+                self.category = name
+                return
+        self.error(-224, 'Illegal parameter value')
+
+    @handles(r'CALC:CAT\?')
+    def _get_category(self, match, args):
+        return str(_CATEGORIES[self.category])
+
+    @handles(r'CALC(:IMM)?')
+    def _calculate(self, match, args):
+        pass
+
+    def peaks(self):
+        """
+        :return: (list of tuple) (wavelength in m, level in dBm) of signals in the range, sorted by wavelength
+        """
+        return sorted((w*1e-9, self.measure(p)) for w, p, width in self.signals if self.start <= w*1e-9 <= self.stop)
+
+    @handles(r'CALC:DATA\?')
+    def _analysis_data(self, match, args):
+        peaks = self.peaks() or [((self.start + self.stop)/2, self.noise_floor)]
+        strongest = max(peaks, key=lambda i: i[1])
+        width = max([w*1e-9 for _, _, w in self.signals] + [self.get_setting('SENS:BWID:RES', 0.02e-9)])
+        if self.category == 'WDM':
+            values = [len(peaks)]
+            ref_wl, ref_lvl = peaks[0]
+            for wl, lvl in peaks:
+                values += [wl, lvl, wl - ref_wl, lvl - ref_lvl, self.noise_floor, lvl - self.noise_floor]
+        elif self.category == 'DFBLD':
+            side = sorted(p for _, p in peaks)[-2] if len(peaks) > 1 else self.noise_floor
+            values = [width, strongest[0], strongest[1], 0.0, strongest[1] - side]
+        elif self.category == 'FPLD':
+            total = 10*math.log10(sum(10**(p/10) for _, p in peaks))
+            center = sum(w for w, _ in peaks)/len(peaks)
+            values = [width, strongest[0], strongest[1], center, total, len(peaks)]
+        else:
+            side = sorted(p for _, p in peaks)[-2] if len(peaks) > 1 else self.noise_floor
+            values = [strongest[0], strongest[1], strongest[0], side, 0.0, strongest[1] - side]
+        return ','.join(format_value(v) for v in values)
+
+    # file
+    @handles(r'MMEM:STOR:GRAP')
+    def _store_graphics(self, match, args):
+        filename = args.split(',')[2].strip().strip('"')
+        self.files[filename.upper() + '.BMP'] = _BMP
+
+    @handles(r'MMEM:DATA\?')
+    def _file_data(self, match, args):
+        filename = args.split(',')[0].strip().strip('"').upper()
+        try:
+            return binary_block(self.files[filename])
+        except KeyError:
+            self.error(-256, 'File name not found')
+            return None
+
+    @handles(r'MMEM:DEL')
+    def _delete_file(self, match, args):
+        self.files.pop(args.split(',')[0].strip().strip('"').upper(), None)
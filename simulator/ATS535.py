@@ -0,0 +1,30 @@
+from ._SimulatedDevice import SimulatedDevice, handles
+
+
+class SimATS535(SimulatedDevice):
+    """
+    Simulated Temptronic ATS-535 thermostream, whose air temperature always follows the set point.
+    """
+    idn = 'TEMPTRONIC,ATS-535,SIM00001,1.0'
+    defaults = (
+        (r'SETP', 25.0),
+        (r'SETN', 1),
+        (r'RAMP', 10.0),
+        (r'HEAD', 0),
+        (r'DUTM', 0),
+    )
+
+    def __init__(self, resource_name, model='ATS535'):
+        super(SimATS535, self).__init__(resource_name)
+
+    @handles(r'TEMP\?')
+    def _temperature(self, match, args):
+        return '%.1f' % self.measure(self.get_setting('SETP'))
+
+    @handles(r'SETP\?')
+    def _set_point(self, match, args):
+        return '%.1f' % self.get_setting('SETP')
+
+    @handles(r'RSTO')
+    def _reset_operator(self, match, args):
+        pass
@@ -0,0 +1,60 @@
+from ._SimulatedDevice import SimulatedDevice, handles, parse_value, format_value
+
+
+class SimE36xx(SimulatedDevice):
+    """
+    Simulated Keysight E36xx DC power supply, such as E3631A, E3633A, driving a resistive load.
+    load_resistance: (float) resistance of load in ohm
+    """
+    idn = 'Agilent Technologies,E3633A,SIM00001,1.0'
+    defaults = (
+        (r'OUTP', 0),
+        (r'VOLT', 0.0),
+        (r'CURR', 1.0),
+        (r'VOLT:PROT', 22.0),
+        (r'CURR:PROT', 10.5),
+        (r'(VOLT|CURR):PROT:STAT', 1),
+        (r'INST:NSEL', 1),
+        (r'VOLT:RANG', 'P20V'),
+    )
+
+    def __init__(self, resource_name, model='E3633A'):
+        super(SimE36xx, self).__init__(resource_name)
+        self.idn = 'Agilent Technologies,%s,SIM00001,1.0' % model
+        self.load_resistance = 100.0
+
+    def output(self):
+        """
+        :return: (tuple) (voltage in V, current in A) at the load
+        """
+        if not self.get_setting('OUTP'):
+            return 0.0, 0.0
+        voltage = self.get_setting('VOLT')
+        current = abs(voltage)/self.load_resistance
+        limit = self.get_setting('CURR')
+        if current > limit:
+            # constant current mode
+            current = limit
+            voltage = current*self.load_resistance*(1 if voltage >= 0 else -1)
+        return voltage, current
+
+    @handles(r'MEAS(:VOLT)?(:DC)?\?')
+    def _measure_voltage(self, match, args):
+        return format_value(self.measure(self.output()[0]))
+
+    @handles(r'MEAS:CURR(:DC)?\?')
+    def _measure_current(self, match, args):
+        return format_value(self.measure(self.output()[1]))
+
+    @handles(r'(VOLT|CURR):PROT:TRIP\?')
+    def _protection_tripped(self, match, args):
+        return '0'
+
+    @handles(r'(VOLT|CURR):PROT:CLE')
+    def _clear_protection(self, match, args):
+        pass
+
+    @handles(r'VOLT:RANG')
+    def _set_range(self, match, args):
+        value = parse_value(args)
+        self.set_setting('VOLT:RANG', {'HIGH': 'P20V', 'LOW': 'P8V'}.get(str(value).upper(), value))
@@ -0,0 +1,85 @@
+import time
+import struct
+from ._SimulatedDevice import SimulatedDevice, handles, parse_value, dbm_to_unit
+from ._SimulatedResource import binary_block
+
+
+class SimN77xx(SimulatedDevice):
+    """
+    Simulated Keysight N77xx multi-port power meter / VOA, such as N7744A, N7752A, N7764A.
+    input_power: (dict) slot => optical power in dBm at the input of the slot, default_input_power if not in it.
+
+    The logging function (:SENS<n>:FUNC:PAR:LOGG, :SENS<n>:FUNC:STAT LOGG,STAR) completes after data points x
+    averaging time, and :SENS<n>:FUNC:RES? returns the samples in W as little endian float32 binary block.
+    """
+    idn = 'Keysight Technologies,N7744A,SIM00001,V1.0'
+    default_input_power = -10.0
+    defaults = (
+        (r'SENS\d+:POW:UNIT', 0),
+        (r'SENS\d+:POW:ATIM', 0.1),
+        (r'(SENS\d+:POW|INP\d+):WAV', 1550e-9),
+        (r'SENS\d+:CORR', 0.0),
+        (r'OUTP\d+', 0),
+        (r'OUTP\d+:POW:OFFS', 0.0),
+        (r'INP\d+:ATT', 0.0),
+        (r'INP\d+:OFFS', 0.0),
+    )
+
+    def __init__(self, resource_name, model='N7744A'):
+        super(SimN77xx, self).__init__(resource_name)
+        self.idn = 'Keysight Technologies,%s,SIM00001,V1.0' % model
+        self.input_power = {}
+        self.logging = {}  # slot => [data points, averaging time in s, start time or None]
+
+    def power_dbm(self, slot):
+        """
+        Measured power of slot in dBm, with attenuation, calibration offset and noise.
+        """
+        power = self.input_power.get(slot, self.default_input_power)
+        if self.get_setting('OUTP%d' % slot):
+            power -= self.get_setting('INP%d:ATT' % slot) + self.get_setting('INP%d:OFFS' % slot)
+        power += self.get_setting('SENS%d:CORR' % slot) + self.get_setting('OUTP%d:POW:OFFS' % slot)
+        return self.measure(power)
+
+    @handles(r'(FETC|READ)(\d+)(:CHAN\d+)?(:SCAL)?:POW\?')
+    def _fetch_power(self, match, args):
+        slot = int(match.group(2))
+        unit = self.get_setting('SENS%d:POW:UNIT' % slot)
+        return '{:+.8E}'.format(dbm_to_unit(self.power_dbm(slot), unit))
+
+    # logging function
+    def __logging(self, slot):
+        return self.logging.setdefault(slot, [100, 0.0001, None])
+
+    @handles(r'SENS(\d+):FUNC:PAR:LOGG')
+    def _set_logging_parameter(self, match, args):
+        points, avg_time = [parse_value(i) for i in args.split(',')]
+        logging = self.__logging(int(match.group(1)))
+        logging[0], logging[1] = int(points), float(avg_time)
+
+    @handles(r'SENS(\d+):FUNC:PAR:LOGG\?')
+    def _get_logging_parameter(self, match, args):
+        points, avg_time, _ = self.__logging(int(match.group(1)))
+        return '%d,%s' % (points, '{:+.8E}'.format(avg_time))
+
+    @handles(r'SENS(\d+):FUNC:STAT')
+    def _set_function_state(self, match, args):
+        function, action = [i.strip().upper() for i in args.split(',')]
+        logging = self.__logging(int(match.group(1)))
+        logging[2] = time.monotonic() if action.startswith('STAR') else None
+
+    @handles(r'SENS(\d+):FUNC:STAT\?')
+    def _get_function_state(self, match, args):
+        points, avg_time, start = self.__logging(int(match.group(1)))
+        if start is None:
+            return 'NONE,COMPLETE'
+        if time.monotonic() - start < points*avg_time:
+            return 'LOGGING_STABILITY,PROGRESS'
+        return 'LOGGING_STABILITY,COMPLETE'
+
+    @handles(r'SENS(\d+):FUNC:RES\?')
+    def _function_result(self, match, args):
+        slot = int(match.group(1))
+        points = self.__logging(slot)[0]
+        values = [dbm_to_unit(self.power_dbm(slot), 1) for _ in range(points)]
+        return binary_block(struct.pack('<%df' % points, *values))
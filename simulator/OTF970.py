@@ -0,0 +1,61 @@
+from ._SimulatedDevice import SimulatedDevice, handles, parse_value, format_value, is_frequency, dbm_to_unit
+from ..constants import LIGHT_SPEED
+
+
+class SimOTF970(SimulatedDevice):
+    """
+    Simulated Santec OTF-970 tunable filter.
+    signal_wavelength: (float) wavelength of input signal in nm
+    signal_power: (float) power of input signal in dBm
+    """
+    idn = 'SANTEC,OTF-970,SIM00001,1.0'
+    defaults = (
+        (r'WAV', 1550e-9),
+        (r'BAND', 1e-9),
+        (r'OFFS', 0.0),
+        (r'OFFS:BAND', 0.0),
+        (r'POW:UNIT', 0),
+        (r'(WAV|BAND):STAT', 0),
+        (r'PS', 0),
+    )
+    limits = (
+        (r'WAV', (1530e-9, 1610e-9)),
+        (r'FREQ', (LIGHT_SPEED/1610*1e12, LIGHT_SPEED/1530*1e12)),
+        (r'BAND', (0.08e-9, 4.0e-9)),
+        (r'OFFS', (-1e-9, 1e-9)),
+        (r'OFFS:BAND', (-0.5e-9, 0.5e-9)),
+    )
+
+    def __init__(self, resource_name, model='OTF-970'):
+        super(SimOTF970, self).__init__(resource_name)
+        self.signal_wavelength = 1550.0
+        self.signal_power = 0.0
+
+    @handles(r'FREQ')
+    def _set_frequency(self, match, args):
+        value = parse_value(args)
+        if not is_frequency(args):
+            value *= 1e12  # THz by default
+        self.set_setting('WAV', LIGHT_SPEED*1e3/value)
+
+    @handles(r'FREQ\?')
+    def _get_frequency(self, match, args):
+        if args:
+            min_value, max_value = dict(self.limits)['FREQ']
+            return format_value(min_value if args.upper().startswith('MIN') else max_value)
+        return format_value(LIGHT_SPEED*1e3/self.get_setting('WAV'))
+
+    @handles(r'PS')
+    def _peak_search(self, match, args):
+        # the peak search completes at once, and tunes the filter to the signal
+        if parse_value(args):
+            self.set_setting('WAV', self.signal_wavelength*1e-9)
+        self.set_setting('PS', 1)
+
+    @handles(r'POW\?')
+    def _power(self, match, args):
+        wavelength = (self.get_setting('WAV') + self.get_setting('OFFS'))*1e9
+        bandwidth = (self.get_setting('BAND') + self.get_setting('OFFS:BAND'))*1e9
+        # flat top pass band with 40 dB rejection
+        power = self.signal_power - (4.0 if abs(wavelength - self.signal_wavelength) <= bandwidth/2 else 40.0)
+        return format_value(dbm_to_unit(self.measure(power), self.get_setting('POW:UNIT')))
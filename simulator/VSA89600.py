@@ -0,0 +1,48 @@
+from ._SimulatedDevice import SimulatedDevice, handles
+
+
+class SimVSA89600(SimulatedDevice):
+    """
+    Simulated Keysight 89600 VSA software running an optical modulation analyzer, such as N4392A, M8292A.
+    table: (list of tuple) (name, value, unit) of the trace table, the same for all traces
+    """
+    idn = 'Keysight Technologies,89601B,SIM00001,22.0'
+    defaults = (
+        (r'CDEM:FILT', '"RootRaisedCosine"'),
+        (r'CDEM:FILT:REF', '"RaisedCosine"'),
+        (r'CDEM:FILT:ABT', 0.35),
+        (r'CDEM:COMP:EQU', 0),
+        (r'CDEM:COMP:EQU:LENG', 21),
+        (r'CDEM:COMP:EQU:CONV', 1e-8),
+        (r'CDEM:COMP:EQU:MODE', 'RUN'),
+        (r'CDEM:RLEN', 1000),
+    )
+
+    def __init__(self, resource_name, model='N4392A'):
+        super(SimVSA89600, self).__init__(resource_name)
+        self.idn = 'Keysight Technologies,%s,SIM00001,22.0' % model
+        self.table = [
+            ('EVM', 3.2, '%'),
+            ('MagErr', 2.1, '%'),
+            ('PhaseErr', 1.5, 'deg'),
+            ('FreqErr', 125e3, 'Hz'),
+            ('IQOffset', -35.0, 'dB'),
+            ('SNR', 28.5, 'dB'),
+        ]
+        self.running = True
+
+    @handles(r'INIT:(RES|ABOR)')
+    def _run(self, match, args):
+        self.running = match.group(1) == 'RES'
+
+    @handles(r'TRAC(\d+):DATA:TABL:NAME\?')
+    def _table_names(self, match, args):
+        return ','.join('"%s"' % name for name, value, unit in self.table)
+
+    @handles(r'TRAC(\d+):DATA:TABL:UNIT\?')
+    def _table_units(self, match, args):
+        return ','.join('"%s"' % unit for name, value, unit in self.table)
+
+    @handles(r'TRAC(\d+):DATA:TABL\?')
+    def _table_values(self, match, args):
+        return ','.join('{:.6E}'.format(value*(1 + self.measure(0.0))) for name, value, unit in self.table)
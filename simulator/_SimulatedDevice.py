@@ -0,0 +1,283 @@
+import re
+import math
+import random
+from collections import deque
+
+_MISSING = object()
+
+# SI factor of unit suffix, upper case
+UNITS = {
+    'NM': 1e-9, 'UM': 1e-6, 'M': 1.0,
+    'THZ': 1e12, 'GHZ': 1e9, 'MHZ': 1e6, 'KHZ': 1e3, 'HZ': 1.0,
+    'S': 1.0, 'MS': 1e-3, 'US': 1e-6, 'NS': 1e-9,
+    'DB': 1.0, 'DBM': 1.0,
+    'W': 1.0, 'MW': 1e-3, 'UW': 1e-6, 'NW': 1e-9,
+    'V': 1.0, 'MV': 1e-3, 'A': 1.0, 'MA': 1e-3,
+}
+FREQUENCY_UNITS = ('THZ', 'GHZ', 'MHZ', 'KHZ', 'HZ')
+
+_number_re = re.compile(r'\s*([-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?)\s*([A-Za-z]*)\s*$')
+_keyword_re = re.compile(r'([A-Z*]+)(\d*)$')
+
+
+def short_keyword(keyword):
+    """
+    Short form of a SCPI keyword: first 4 characters, or 3 if the 4th is a vowel. Numeric suffix is kept.
+    :param keyword: (str) upper case keyword, such as 'MEASURE', 'TRACE1'
+    :return: (str) such as 'MEAS', 'TRAC1'
+    """
+    m = _keyword_re.match(keyword)
+    if not m:
+        return keyword
+    word, suffix = m.groups()
+    if len(word) > 4:
+        word = word[:3] if word[3] in 'AEIOU' else word[:4]
+    return word + suffix
+
+
+def normalize_header(header):
+    """
+    Normalize a SCPI header to upper case short form, without the leading ':'.
+    :param header: (str) such as ':sens1:pow:atim?', ':MEASure:POWer:FREQuency?'
+    :return: (str) such as 'SENS1:POW:ATIM?', 'MEAS:POW:FREQ?'
+    """
+    header = header.strip().lstrip(':').upper()
+    query = header.endswith('?')
+    if query:
+        header = header[:-1]
+    header = ':'.join(short_keyword(k) for k in header.split(':'))
+    return header + '?' if query else header
+
+
+def parse_value(text):
+    """
+    Parse a parameter of SCPI command.
+    :param text: (str) such as '1', '1550NM', '-3.5dB', 'ON', '"Gaussian"'
+    :return: (int|float|str) int if text is an integer without unit, float in SI unit if a number, 1/0 for ON/OFF,
+        otherwise the text itself.
+    """
+    m = _number_re.match(text)
+    if m:
+        number, unit = m.groups()
+        unit = unit.upper()
+        if not unit and re.match(r'[-+]?\d+$', number):
+            return int(number)
+        if not unit or unit in UNITS:
+            return float(number)*UNITS.get(unit, 1.0)
+    upper = text.strip().upper()
+    if upper == 'ON':
+        return 1
+    if upper == 'OFF':
+        return 0
+    return text.strip()
+
+
+def format_value(value):
+    """
+    Format a value as SCPI response.
+    """
+    if isinstance(value, bool):
+        return str(int(value))
+    if isinstance(value, int):
+        return str(value)
+    if isinstance(value, float):
+        return '{:+.8E}'.format(value)
+    return str(value)
+
+
+def is_frequency(text):
+    """
+    If a numeric parameter has frequency unit.
+    """
+    m = _number_re.match(text)
+    return bool(m) and m.group(2).upper() in FREQUENCY_UNITS
+
+
+def handles(pattern):
+    """
+    Decorator of device methods handling SCPI commands.
+    The method is called as method(self, match, args), where match is the re match of the normalized header
+    (see normalize_header) and args is the parameter text. The return value (str|bytes|None) is the response.
+    :param pattern: (str) regex matching the whole normalized header, such as r'FETC(\\d+):POW\\?'
+    """
+    def decorator(func):
+        func.scpi_pattern = re.compile(pattern)
+        return func
+    return decorator
+
+
+class SimulatedDevice(object):
+    """
+    Base class of simulated SCPI devices.
+
+    Commands are dispatched to the methods decorated by handles. Other commands are stored as settings keyed by
+    normalized header and read back by the query of the same header, so that any set/get pair of a model works.
+    A query of a setting never written returns the default value of class attribute defaults, if any, otherwise
+    it gets no response (the read times out) and an error is put in the error queue, like a real instrument.
+
+    Timing and noise are configured by attributes, see configure:
+        latency: (float) processing time in s of each message
+        jitter: (float) standard deviation in s of the latency
+        command_latency: (dict) normalized header => extra processing time in s, such as {'INIT': 0.5}
+        transfer_rate: (float|None) bytes/s of the bus, None for no transfer time
+        noise: (float) standard deviation of measured values, in dB for optical power
+    """
+    idn = 'SIMULATOR,DEVICE,SIM00000,1.0'
+    defaults = ()  # (regex of normalized header, default value)
+    limits = ()  # (regex of normalized header, (min, max)), for queries such as ':WAV? MIN'
+
+    latency = 0.0
+    jitter = 0.0
+    transfer_rate = None
+    noise = 0.0
+
+    def __init__(self, resource_name):
+        self.resource_name = resource_name
+        self.settings = {}
+        self.errors = deque()
+        self.command_latency = {}
+        self.status_byte = 0
+        self.random = random.Random(resource_name)
+        self.__defaults = [(re.compile(p), v) for p, v in self.defaults]
+        self.__limits = [(re.compile(p), v) for p, v in self.limits]
+        self.__handlers = []
+        seen = set()
+        for cls in type(self).__mro__:
+            for name, func in vars(cls).items():
+                if name not in seen and hasattr(func, 'scpi_pattern'):
+                    seen.add(name)
+                    self.__handlers.append((func.scpi_pattern, getattr(self, name)))
+
+    def configure(self, **kwargs):
+        """
+        Set timing and noise attributes, such as device.configure(latency=0.002, jitter=0.0005, noise=0.01).
+        """
+        for key, value in kwargs.items():
+            if key not in ('latency', 'jitter', 'transfer_rate', 'noise', 'command_latency'):
+                raise AttributeError('Invalid simulator option: %r' % key)
+            setattr(self, key, value)
+        return self
+
+    def processing_time(self, headers):
+        """
+        Time to process a message of commands.
+        :param headers: (list of str) normalized headers of the message
+        :return: (float) time in s
+        """
+        t = self.latency
+        if self.jitter:
+            t += self.random.gauss(0, self.jitter)
+        for header in headers:
+            t += self.command_latency.get(header.rstrip('?'), 0.0)
+        return max(t, 0.0)
+
+    def measure(self, value):
+        """
+        Add measurement noise to value.
+        """
+        if self.noise:
+            value += self.random.gauss(0, self.noise)
+        return value
+
+    def get_setting(self, key, default=_MISSING):
+        try:
+            return self.settings[key]
+        except KeyError:
+            pass
+        for regex, value in self.__defaults:
+            if regex.fullmatch(key):
+                return value
+        return default
+
+    def set_setting(self, key, value):
+        self.settings[key] = value
+
+    def get_status_byte(self):
+        """
+        Status byte, sub classes may compute the summary bits from their state.
+        """
+        return self.status_byte
+
+    def service_requested(self):
+        """
+        If the device requests service: a bit of the status byte is enabled by *SRE.
+        """
+        return bool(self.get_status_byte() & int(self.get_setting('*SRE', 0)) & ~0x40)
+
+    def error(self, code, message):
+        self.errors.append('%d,"%s"' % (code, message))
+
+    def handle(self, cmd):
+        """
+        Handle one SCPI command.
+        :param cmd: (str) command, such as ':SENS1:POW:UNIT 0', '*IDN?'
+        :return: (str|bytes|None) response, None if no response
+        """
+        cmd = cmd.strip()
+        m = re.match(r'(\S+)\s*(.*)$', cmd, re.S)
+        if not m:
+            return None
+        header = normalize_header(m.group(1))
+        args = m.group(2).strip()
+        for regex, handler in self.__handlers:
+            match = regex.fullmatch(header)
+            if match:
+                return handler(match, args)
+        if header.endswith('?'):
+            key = header[:-1]
+            if args.upper() in ('MIN', 'MAX', 'MINIMUM', 'MAXIMUM'):
+                for regex, (min_value, max_value) in self.__limits:
+                    if regex.fullmatch(key):
+                        return format_value(min_value if args.upper().startswith('MIN') else max_value)
+            value = self.get_setting(key)
+            if value is _MISSING:
+                self.error(-113, 'Undefined header')
+                return None
+            return format_value(value)
+        self.set_setting(header, parse_value(args))
+        return None
+
+    # IEEE 488.2 common commands
+    @handles(r'\*IDN\?')
+    def _idn(self, match, args):
+        return self.idn
+
+    @handles(r'\*OPC\?')
+    def _opc(self, match, args):
+        return '1'
+
+    @handles(r'\*(OPC|WAI|CLS)')
+    def _no_op(self, match, args):
+        if match.group(1) == 'CLS':
+            self.errors.clear()
+            self.status_byte = 0
+
+    @handles(r'\*RST')
+    def _reset(self, match, args):
+        self.settings.clear()
+
+    @handles(r'\*(ESR|STB)\?')
+    def _status(self, match, args):
+        return str(self.get_status_byte() if match.group(1) == 'STB' else 0)
+
+    @handles(r'SYST:ERR(:NEXT)?\?')
+    def _system_error(self, match, args):
+        return self.errors.popleft() if self.errors else '0,"No error"'
+
+
+def dbm_to_unit(value, unit):
+    """
+    :param value: (float) power in dBm
+    :param unit: (int) 0 for dBm, 1 for W
+    :return: (float) power in unit
+    """
+    if int(unit) == 1:
+        return 10**(value/10)/1000
+    return value
+
+
+def sum_dbm(*values):
+    """
+    Sum of powers in dBm.
+    """
+    return 10*math.log10(sum(10**(v/10) for v in values))
@@ -0,0 +1,198 @@
+import time
+import struct
+from collections import namedtuple
+import numpy as np
+import pyvisa
+from ._SimulatedDevice import normalize_header
+
+ResourceInfo = namedtuple('ResourceInfo', ['interface_type', 'interface_board_number', 'resource_class',
+                                           'resource_name', 'alias'])
+
+
+def split_message(message, separator=';'):
+    """
+    Split a compound message into commands. Separators inside quoted strings are ignored.
+    :param message: (str) message
+    :return: (list of str) commands
+    """
+    cmds = []
+    start = 0
+    quote = None
+    for i, c in enumerate(message):
+        if quote:
+            if c == quote:
+                quote = None
+        elif c in '"\'':
+            quote = c
+        elif c == separator:
+            cmds.append(message[start:i])
+            start = i + 1
+    cmds.append(message[start:])
+    return [cmd for cmd in cmds if cmd.strip()]
+
+
+def binary_block(data):
+    """
+    Make an IEEE 488.2 definite length block.
+    :param data: (bytes) data
+    :return: (bytes) block, such as b'#18abcdefgh'
+    """
+    length = str(len(data))
+    return ('#%d%s' % (len(length), length)).encode() + data
+
+
+class SimulatedResource(object):
+    """
+    A simulated visa resource, which has the interface of pyvisa MessageBasedResource used by VisaInstrument.
+    Messages are executed by a SimulatedDevice, with the simulated processing and transfer time.
+    """
+
+    def __init__(self, device, resource_name, read_termination='\n', write_termination='\n', timeout=2000,
+                 open_timeout=0, query_delay=0.0, encoding='ascii', **kwargs):
+        self.device = device
+        self.resource_name = resource_name
+        self.read_termination = read_termination
+        self.write_termination = write_termination
+        self.timeout = timeout
+        self.query_delay = query_delay
+        self.encoding = encoding
+        self.__attributes = {}
+        self.__output = b''
+        self.__closed = False
+
+    @property
+    def resource_info(self):
+        return ResourceInfo('SIM', 0, 'INSTR', self.resource_name, None)
+
+    def __check_open(self):
+        if self.__closed:
+            raise pyvisa.VisaIOError(pyvisa.constants.StatusCode.error_invalid_object)
+
+    def __transfer(self, nbytes):
+        rate = self.device.transfer_rate
+        if rate:
+            time.sleep(nbytes/rate)
+
+    def set_visa_attribute(self, name, state):
+        self.__attributes[name] = state
+        return pyvisa.constants.StatusCode.success
+
+    def get_visa_attribute(self, name):
+        return self.__attributes.get(name)
+
+    def write_raw(self, message):
+        """
+        :param message: (bytes) message
+        :return: (int) bytes written
+        """
+        self.__check_open()
+        self.__transfer(len(message))
+        text = message.decode(self.encoding)
+        if self.write_termination and text.endswith(self.write_termination):
+            text = text[:-len(self.write_termination)]
+        cmds = split_message(text)
+        delay = self.device.processing_time([normalize_header(cmd.split(None, 1)[0]) for cmd in cmds])
+        if delay:
+            time.sleep(delay)
+        replies = []
+        for cmd in cmds:
+            reply = self.device.handle(cmd)
+            if reply is not None:
+                replies.append(reply if isinstance(reply, bytes) else reply.encode(self.encoding))
+        if replies:
+            # replies of a compound query are sent back in one message
+            self.__output = b';'.join(replies) + (self.read_termination or '').encode(self.encoding)
+        return len(message)
+
+    def write(self, message, termination=None, encoding=None):
+        termination = self.write_termination if termination is None else termination
+        return self.write_raw((message + (termination or '')).encode(encoding or self.encoding))
+
+    def read_raw(self, size=None):
+        """
+        Read all the pending response.
+        :return: (bytes) response
+        """
+        self.__check_open()
+        if not self.__output:
+            raise pyvisa.VisaIOError(pyvisa.constants.StatusCode.error_timeout)
+        data, self.__output = self.__output, b''
+        self.__transfer(len(data))
+        return data
+
+    def read_bytes(self, count, chunk_size=None, break_on_termchar=False):
+        """
+        Read exactly count bytes of the pending response.
+        :return: (bytes) data
+        """
+        self.__check_open()
+        if len(self.__output) < count:
+            raise pyvisa.VisaIOError(pyvisa.constants.StatusCode.error_timeout)
+        data, self.__output = self.__output[:count], self.__output[count:]
+        self.__transfer(len(data))
+        return data
+
+    def read(self, termination=None, encoding=None):
+        termination = self.read_termination if termination is None else termination
+        text = self.read_raw().decode(encoding or self.encoding)
+        if termination and text.endswith(termination):
+            text = text[:-len(termination)]
+        return text
+
+    def query(self, message, delay=None):
+        self.write(message)
+        delay = self.query_delay if delay is None else delay
+        if delay > 0:
+            time.sleep(delay)
+        return self.read()
+
+    def read_binary_values(self, datatype='f', is_big_endian=False, container=list, header_fmt='ieee',
+                           expect_termination=True, data_points=None, chunk_size=None):
+        """
+        Read an IEEE 488.2 block and decode it, like pyvisa.
+        """
+        data = self.read_raw()
+        if not data.startswith(b'#'):
+            raise ValueError('Response is not an IEEE 488.2 block: %r' % data[:20])
+        n = int(data[1:2])
+        length = int(data[2:2+n])
+        offset = 2 + n
+        block = data[offset:offset+length]
+        if datatype == 's':
+            return block
+        endianness = '>' if is_big_endian else '<'
+        count = length//struct.calcsize(datatype)
+        if container is np.array or container is np.ndarray:
+            return np.frombuffer(block, np.dtype(endianness + datatype), count)
+        return container(struct.unpack('%s%d%s' % (endianness, count, datatype), block))
+
+    def query_binary_values(self, message, datatype='f', is_big_endian=False, container=list, delay=None,
+                            header_fmt='ieee', expect_termination=True, data_points=None, chunk_size=None):
+        self.write(message)
+        delay = self.query_delay if delay is None else delay
+        if delay > 0:
+            time.sleep(delay)
+        return self.read_binary_values(datatype, is_big_endian, container, header_fmt, expect_termination,
+                                       data_points, chunk_size)
+
+    def read_stb(self):
+        return self.device.get_status_byte()
+
+    def wait_for_srq(self, timeout=25000):
+        """
+        Wait until the device requests service, see SimulatedDevice.service_requested.
+        :param timeout: (int|None) timeout in ms, None to wait forever
+        """
+        self.__check_open()
+        deadline = None if timeout is None else time.monotonic() + timeout/1000
+        while not self.device.service_requested():
+            if deadline is not None and time.monotonic() > deadline:
+                raise pyvisa.VisaIOError(pyvisa.constants.StatusCode.error_timeout)
+            time.sleep(0.001)
+        self.read_stb()
+
+    def clear(self):
+        self.__output = b''
+
+    def close(self):
+        self.__closed = True
@@ -0,0 +1,137 @@
+"""
+SCPI level instrument simulator, to run models without hardware.
+
+A visa resource name starting with 'SIM::' opens a simulated resource instead of a real one:
+
+    opm = ModelN7744A('SIM::N7744A::1', 1)
+    opm.get_power_value()
+
+The second field of the resource name is the simulated model. Resources with the same name share one simulated
+device, whose state (settings, input signals, timing) can be accessed by get_device:
+
+    device = simulator.get_device('SIM::N7744A::1')
+    device.configure(latency=0.002, jitter=0.0002, noise=0.01)
+    device.input_power[1] = -3.0
+"""
+import threading
+from ._SimulatedDevice import SimulatedDevice, handles, normalize_header
+from ._SimulatedResource import SimulatedResource
+from .N77xx import SimN77xx
+from .AQ2200 import SimAQ2200
+from .AQ6150 import SimAQ6150
+from .AQ6370 import SimAQ6370
+from .E36xx import SimE36xx
+from .OTF970 import SimOTF970
+from .VSA89600 import SimVSA89600
+from .ATS535 import SimATS535
+
+__all__ = ['SimulatedDevice', 'SimulatedResource', 'handles', 'is_simulated', 'open_resource', 'get_device',
+           'register_device', 'configure', 'reset', 'list_models']
+
+PREFIX = 'SIM::'
+
+# simulated model => device class
+_device_classes = {
+    'N7744A': SimN77xx,
+    'N7752A': SimN77xx,
+    'N7764A': SimN77xx,
+    'AQ2200': SimAQ2200,
+    'AQ2211': SimAQ2200,
+    'AQ2212': SimAQ2200,
+    'AQ6150': SimAQ6150,
+    'AQ6151': SimAQ6150,
+    'AQ6370': SimAQ6370,
+    'AQ6370C': SimAQ6370,
+    'AQ6370D': SimAQ6370,
+    'E3631A': SimE36xx,
+    'E3633A': SimE36xx,
+    'OTF970': SimOTF970,
+    'OTF-970': SimOTF970,
+    'VSA89600': SimVSA89600,
+    'N4392A': SimVSA89600,
+    'M8292A': SimVSA89600,
+    'ATS535': SimATS535,
+    'ATS-535': SimATS535,
+}
+_devices = {}  # resource name => SimulatedDevice
+_devices_lock = threading.Lock()
+_defaults = {}  # default options of new devices, see configure
+
+
+def is_simulated(resource_name):
+    """
+    If resource_name is a simulated resource, such as 'SIM::N7744A::1'.
+    """
+    return resource_name.upper().startswith(PREFIX)
+
+
+def register_device(model, device_class):
+    """
+    Register a simulated device class for a model.
+    :param model: (str) model in resource name, such as 'N7744A'
+    :param device_class: (type) sub class of SimulatedDevice, which is created as device_class(resource_name, model)
+    """
+    if not issubclass(device_class, SimulatedDevice):
+        raise TypeError('device_class should be a sub class of SimulatedDevice')
+    _device_classes[model.upper()] = device_class
+
+
+def list_models():
+    """
+    :return: (list of str) simulated models
+    """
+    return sorted(_device_classes.keys())
+
+
+def get_device(resource_name):
+    """
+    Get the simulated device of resource_name, created at first access.
+    :param resource_name: (str) such as 'SIM::N7744A::1'
+    :return: (SimulatedDevice) simulated device
+    """
+    if not is_simulated(resource_name):
+        raise ValueError('Not a simulated resource: %r' % resource_name)
+    key = resource_name.upper()
+    with _devices_lock:
+        device = _devices.get(key)
+        if device is None:
+            model = key[len(PREFIX):].split('::')[0]
+            try:
+                device_class = _device_classes[model]
+            except KeyError:
+                raise ValueError('No simulated device for model %r, available: %s' % (model, list_models()))
+            device = _devices[key] = device_class(resource_name, model)
+            device.configure(**_defaults)
+        return device
+
+
+def open_resource(resource_name, **options):
+    """
+    Open a simulated visa resource, used as rm.open_resource.
+    :param resource_name: (str) such as 'SIM::N7744A::1'
+    :param options: read_termination, write_termination, timeout, query_delay, encoding...
+    :return: (SimulatedResource) simulated resource
+    """
+    return SimulatedResource(get_device(resource_name), resource_name, **options)
+
+
+def configure(resource_name=None, **kwargs):
+    """
+    Set timing and noise options of simulated devices, see SimulatedDevice.configure.
+    :param resource_name: (str) configure the device of resource_name, or all the existing and new devices if None.
+    """
+    if resource_name is not None:
+        return get_device(resource_name).configure(**kwargs)
+    with _devices_lock:
+        for device in _devices.values():
+            device.configure(**kwargs)
+        _defaults.update(kwargs)
+
+
+def reset():
+    """
+    Drop all the simulated devices and default options. Devices are created again with initial state at next access.
+    """
+    with _devices_lock:
+        _devices.clear()
+        _defaults.clear()
@@ -0,0 +1,122 @@
+import asyncio
+import gc
+import time
+import unittest
+from unittest import mock
+from .. import aio, simulator
+from ..aio import AsyncInstrument
+from ..models.N7744A import ModelN7744A
+
+
+class TestAsyncInstrument(unittest.TestCase):
+
+    def setUp(self):
+        self.opm = ModelN7744A('SIM::N7744A::1', 1)
+
+    def tearDown(self):
+        self.opm.close()
+        simulator.reset()
+
+    def logged_io(self, resource, log):
+        """
+        Log the writes and reads reaching the simulated resource of a session.
+        """
+        write_raw, read_raw = resource.write_raw, resource.read_raw
+
+        def logged_write_raw(message):
+            log.append('write')
+            return write_raw(message)
+
+        def logged_read_raw(size=None):
+            log.append('read')
+            return read_raw(size)
+        for name, side_effect in (('write_raw', logged_write_raw), ('read_raw', logged_read_raw)):
+            patcher = mock.patch.object(resource, name, side_effect=side_effect)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_thread_bound_methods(self):
+        ainst = AsyncInstrument(self.opm)
+        for name in ('write_query', 'read', 'read_binary'):
+            with self.assertRaises(AttributeError):
+                getattr(ainst, name)
+
+    def test_run_blocking_sequence(self):
+        ainst = AsyncInstrument(self.opm)
+        inst = ainst.instrument
+
+        async def main():
+            reply = await ainst.run_blocking(lambda: (inst.write_query('*IDN?'), inst.read())[1])
+            return reply, await ainst.idn
+        reply, idn = asyncio.run(main())
+        self.assertEqual(reply, idn)
+        self.assertFalse(self.opm.session.pending_reply)
+
+    def test_same_session_serialized(self):
+        simulator.get_device('SIM::N7744A::1').configure(latency=0.005)
+        opm2 = ModelN7744A('SIM::N7744A::1', 2)
+        self.addCleanup(opm2.close)
+        log = []
+        self.logged_io(self.opm.session.resource, log)
+        ainsts = [AsyncInstrument(self.opm), AsyncInstrument(opm2)]
+        intervals = []
+
+        def sequence(inst):
+            start = time.perf_counter()
+            inst.write_query(':FETC%d:POW?' % inst.slot)
+            reply = inst.read()
+            intervals.append((start, time.perf_counter()))
+            return reply
+
+        async def main():
+            calls = []
+            for ainst in ainsts * 3:
+                calls.append(ainst.get_power_value())
+                calls.append(ainst.run_blocking(sequence, ainst.instrument))
+            await asyncio.gather(*calls)
+        asyncio.run(main())
+        self.assertEqual(log, ['write', 'read'] * 12)
+        # the calls run one at a time, not only their I/O
+        intervals.sort()
+        for (_, end), (start, _) in zip(intervals, intervals[1:]):
+            self.assertLessEqual(end, start)
+
+    def test_different_sessions_overlap(self):
+        opm2 = ModelN7744A('SIM::N7744A::2', 1)
+        self.addCleanup(opm2.close)
+        intervals = []
+
+        def slow_query(inst):
+            start = time.perf_counter()
+            inst.query(':FETC1:POW?')
+            time.sleep(0.05)
+            intervals.append((start, time.perf_counter()))
+
+        async def main():
+            await asyncio.gather(*[AsyncInstrument(i).run_blocking(slow_query, i) for i in (self.opm, opm2)])
+        asyncio.run(main())
+        (start1, end1), (start2, end2) = intervals
+        self.assertLess(max(start1, start2), min(end1, end2))
+
+    def test_async_locks_are_weak(self):
+        async def main():
+            opm = ModelN7744A('SIM::N7744A::2', 1)
+            ainst = AsyncInstrument(opm)
+            await ainst.get_power_value()
+            locks = aio._async_locks[asyncio.get_running_loop()]
+            count = len(locks)
+            opm.close()
+            del opm, ainst
+            # the executor thread may still refer to the last call for a moment
+            for _ in range(100):
+                gc.collect()
+                if not locks:
+                    break
+                await asyncio.sleep(0.01)
+            return count, len(locks)
+
+        self.assertEqual(asyncio.run(main()), (1, 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,125 @@
+import unittest
+import numpy as np
+from .. import simulator
+from ..models.AQ6370 import ModelAQ6370
+
+
+class TestAnalysisData(unittest.TestCase):
+
+    def setUp(self):
+        self.osa = ModelAQ6370('SIM::AQ6370::1')
+        self.device = simulator.get_device('SIM::AQ6370::1')
+
+    def tearDown(self):
+        self.osa.close()
+        simulator.reset()
+
+    def test_parse_wdm(self):
+        data = '2,1.55E-06,-5.0,0.0,0.0,-60.0,55.0,1.5508E-06,-7.0,8.0E-10,-2.0,-61.0,54.0'
+        result = self.osa.parse_analysis_data('WDM', data)
+        self.assertEqual(result['ch_num'], 2)
+        self.assertEqual(set(result), {'ch_num', 'center_wl', 'peak_lvl', 'offset_wl', 'offset_lvl', 'noise', 'snr'})
+        np.testing.assert_allclose(result['center_wl'], [1.55e-6, 1.5508e-6])
+        np.testing.assert_allclose(result['snr'], [55.0, 54.0])
+
+    def test_parse_wdm_relation(self):
+        self.osa.command(':CALC:PAR:WDM:REL 1')
+        result = self.osa.parse_analysis_data('WDM', '1,1.55E-06,-5.0,0.0,0.0,-60.0,55.0')
+        self.assertIn('spacing', result)
+        self.assertIn('lvl_diff', result)
+
+    def test_parse_wdm_invalid(self):
+        with self.assertRaises(ValueError):
+            self.osa.parse_analysis_data('WDM', '2,1.55E-06,-5.0,0.0,0.0,-60.0,55.0')
+
+    def test_parse_other(self):
+        result = self.osa.parse_analysis_data('DFBLD', '2.0E-11,1.55E-06,-5.0,0.0,40.0')
+        self.assertEqual(result, {'spec_wd': 2e-11, 'peak_wl': 1.55e-6, 'peak_lvl': -5.0, 'mode_ofst': 0.0,
+                                  'smsr': 40.0})
+        with self.assertRaises(ValueError):
+            self.osa.parse_analysis_data('DFBLD', '2.0E-11,1.55E-06')
+
+    def test_analysis_results(self):
+        self.device.signals = [(1550.0, -5.0, 0.01), (1550.8, -7.0, 0.01)]
+        self.osa.set_analysis_cat('WDM')
+        self.osa.sweep('SINGLE', wait=True)
+        result = self.osa.get_analysis_results()
+        self.assertEqual(result['ch_num'], 2)
+        self.assertEqual(len(result['center_wl']), 2)
+
+    def test_display_type_cached(self):
+        self.assertEqual(self.osa.get_wdm_display_type(), (0, 0))
+        # changed on the front panel: still cached
+        self.device.set_setting('CALC:PAR:WDM:REL', 1)
+        self.assertEqual(self.osa.get_wdm_display_type(), (0, 0))
+        self.osa.clear_wdm_display_type()
+        self.assertEqual(self.osa.get_wdm_display_type(), (0, 1))
+
+    def test_display_type_invalidated(self):
+        other = ModelAQ6370('SIM::AQ6370::1')
+        try:
+            self.assertEqual(self.osa.get_wdm_display_type(), (0, 0))
+            other.command(':CALC:PAR:WDM:REL 1')
+            self.assertEqual(self.osa.get_wdm_display_type(), (0, 1))
+            self.osa.analysis_setting('WDM', 'TH', 20)
+            self.assertNotIn('wdm_display_type', self.osa.session.state)
+            self.osa.get_wdm_display_type()
+            self.osa.query(':CALC:PAR:WDM:DTYP?')
+            self.assertIn('wdm_display_type', self.osa.session.state)
+            self.osa.command('*RST')
+            self.assertNotIn('wdm_display_type', self.osa.session.state)
+        finally:
+            other.close()
+
+
+class TestTraces(unittest.TestCase):
+
+    def setUp(self):
+        self.osa = ModelAQ6370('SIM::AQ6370::1')
+
+    def tearDown(self):
+        self.osa.close()
+        simulator.reset()
+
+    def test_get_traces(self):
+        x, y = self.osa.get_traces(['TRA', 'TRB'])
+        x_a, y_a = self.osa.get_trace('TRA')
+        np.testing.assert_allclose(x, x_a)
+        np.testing.assert_array_equal(y[0], y_a)
+        self.assertEqual(y.shape, (2, len(x_a)))
+
+    def test_get_traces_reuse(self):
+        x, y = self.osa.get_traces(['TRA', 'TRB'])
+        expected = x.copy(), y.copy()
+        x.fill(0)
+        y.fill(0)
+        x_out, out = self.osa.get_traces(['TRA', 'TRB'], out=y, x_out=x)
+        self.assertIs(x_out, x)
+        self.assertIs(out, y)
+        np.testing.assert_allclose(x, expected[0])
+        np.testing.assert_array_equal(y, expected[1])
+
+    def test_get_traces_float32(self):
+        x, y = self.osa.get_traces(['TRA', 'TRB'])
+        x32, y32 = self.osa.get_traces(['TRA', 'TRB'], dtype='float32', out=np.empty(y.shape, dtype='float32'))
+        self.assertEqual(y32.dtype, np.float32)
+        np.testing.assert_allclose(y32, y, rtol=1e-6)
+        np.testing.assert_allclose(x32, x, rtol=1e-6)
+
+    def test_get_traces_invalid_out(self):
+        with self.assertRaises(ValueError):
+            self.osa.get_traces(['TRA', 'TRB'], out=np.empty((2, 10)))
+        x, y = self.osa.get_traces(['TRA'])
+        with self.assertRaises(ValueError):
+            self.osa.get_traces(['TRA'], out=np.empty((1, len(x)*2))[:, ::2])
+
+    def test_blocks_into_small_buffer(self):
+        cmd = ':FORM:DATA REAL,64;:TRACE:Y? TRA;:TRACE:Y? TRB;:FORM:DATA ASC'
+        with self.assertRaises(ValueError):
+            self.osa.query_binary_blocks(cmd, 2, out=[bytearray(8), bytearray(8)])
+        # the whole reply is drained
+        self.assertTrue(self.osa.query('*IDN?').startswith('YOKOGAWA'))
+
+
+if __name__ == '__main__':
+    unittest.main()
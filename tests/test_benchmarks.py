@@ -0,0 +1,55 @@
+import os
+import shutil
+import tempfile
+import unittest
+from ..benchmarks import runner
+
+
+def results(**cases):
+    return {"meta": {"python": "3", "platform": "host", "repeat": 1}, "cases": cases}
+
+
+def result(round_trips=1, wall_time=0.001):
+    return {"round_trips": round_trips, "writes": 0, "bytes": 10, "wall_time": wall_time,
+            "wall_time_min": wall_time, "allocations": 100}
+
+
+class TestBaseline(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.dir)
+        self.path = os.path.join(self.dir, 'baseline.json')
+
+    def test_counters_only(self):
+        runner.save_baseline(results(a=result()), self.path)
+        baseline = runner.load_baseline(self.path)
+        self.assertEqual(baseline["cases"], {"a": {"round_trips": 1, "writes": 0, "bytes": 10}})
+        self.assertNotIn("platform", baseline["meta"])
+        # wall time is not compared without timing in the baseline
+        self.assertEqual(runner.compare(results(a=result(wall_time=1.0)), baseline), [])
+        regressions = runner.compare(results(a=result(round_trips=2)), baseline)
+        self.assertEqual([(r["case"], r["metric"]) for r in regressions], [("a", "round_trips")])
+
+    def test_update(self):
+        runner.save_baseline(results(a=result(), b=result()), self.path)
+        with open(self.path) as f:
+            saved = f.read()
+        runner.save_baseline(results(a=result(wall_time=0.5)), self.path)
+        with open(self.path) as f:
+            self.assertEqual(f.read(), saved)
+        runner.save_baseline(results(a=result(round_trips=2)), self.path)
+        cases = runner.load_baseline(self.path)["cases"]
+        self.assertEqual(cases["a"]["round_trips"], 2)
+        self.assertIn("b", cases)
+
+    def test_timing(self):
+        runner.save_baseline(results(a=result()), self.path, timing=True)
+        baseline = runner.load_baseline(self.path)
+        self.assertIn("wall_time", baseline["cases"]["a"])
+        regressions = runner.compare(results(a=result(wall_time=1.0)), baseline)
+        self.assertEqual({r["metric"] for r in regressions}, {"wall_time", "wall_time_min"} & set(runner.THRESHOLDS))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,42 @@
+import threading
+import unittest
+from .. import discovery, simulator
+from ..models.N7744A import ModelN7744A
+
+
+class TestProbeOpenedSession(unittest.TestCase):
+
+    def setUp(self):
+        discovery.clear_cache()
+
+    def tearDown(self):
+        discovery.clear_cache()
+        simulator.reset()
+
+    def test_busy_session(self):
+        opm = ModelN7744A('SIM::N7744A::1', 1)
+        self.addCleanup(opm.close)
+        locked = threading.Event()
+        done = threading.Event()
+
+        def hold():
+            with opm.locked():
+                locked.set()
+                done.wait()
+
+        thread = threading.Thread(target=hold)
+        thread.start()
+        try:
+            locked.wait()
+            descriptor, = discovery.discover(['SIM::N7744A::1'], timeout=50)
+            self.assertIsNotNone(descriptor.error)
+        finally:
+            done.set()
+            thread.join()
+        # the busy result is not cached
+        descriptor, = discovery.discover(['SIM::N7744A::1'], timeout=50)
+        self.assertEqual(descriptor.class_name, 'ModelN7744A')
+
+
+if __name__ == '__main__':
+    unittest.main()
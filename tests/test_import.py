@@ -0,0 +1,29 @@
+import os
+import subprocess
+import sys
+import unittest
+
+PACKAGE = __name__.rsplit('.', 2)[0]
+PACKAGE_PARENT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def run_python(code):
+    return subprocess.run([sys.executable, '-c', code], cwd=PACKAGE_PARENT, stdout=subprocess.PIPE,
+                          stderr=subprocess.STDOUT, universal_newlines=True, check=True).stdout
+
+
+class TestImport(unittest.TestCase):
+
+    def test_lazy_imports(self):
+        out = run_python('import sys, {0}; print(sorted(m for m in ("pyvisa", "serial", "requests", "numpy") '
+                         'if m in sys.modules))'.format(PACKAGE))
+        self.assertEqual(out.strip(), '[]')
+
+    def test_models_not_imported(self):
+        out = run_python('import sys, {0}; print([m for m in sys.modules if m.startswith("{0}.models.") '
+                         'and not m.split(".")[-1].startswith("_")])'.format(PACKAGE))
+        self.assertEqual(out.strip(), '[]')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+import time
+import unittest
+from unittest import mock
+import numpy as np
+from .. import simulator
+from ..monitor import PowerMonitor
+from ..models.N7744A import ModelN7744A
+
+
+class TestPowerMonitor(unittest.TestCase):
+
+    def setUp(self):
+        self.device = simulator.get_device('SIM::N7744A::1')
+        self.device.configure(noise=0)
+        self.opms = [ModelN7744A('SIM::N7744A::1', 1), ModelN7744A('SIM::N7744A::1', 2)]
+
+    def tearDown(self):
+        for opm in self.opms:
+            opm.close()
+        simulator.reset()
+
+    def feed(self, monitor, powers):
+        for p1, p2 in powers:
+            self.device.input_power.update({1: p1, 2: p2})
+            monitor.sample()
+
+    def test_rolling_stats(self):
+        monitor = PowerMonitor(self.opms, size=5)
+        rng = np.random.default_rng(0)
+        powers = rng.uniform(-30, 0, (23, 2)).round(3)
+        for i in range(len(powers)):
+            self.feed(monitor, powers[i:i + 1])
+            window = powers[max(0, i - 4):i + 1]
+            stats = monitor.stats()
+            self.assertEqual(stats["count"], len(window))
+            np.testing.assert_allclose(stats["min"], window.min(axis=0))
+            np.testing.assert_allclose(stats["max"], window.max(axis=0))
+            np.testing.assert_allclose(stats["mean"], window.mean(axis=0))
+            np.testing.assert_allclose(stats["std"], window.std(axis=0), atol=1e-6)
+
+    def test_ring_buffer(self):
+        monitor = PowerMonitor(self.opms, size=4)
+        self.assertEqual(monitor.latest(), (None, None))
+        self.assertTrue(np.isnan(monitor.stats()["mean"]).all())
+        powers = [(-float(i), -10.0 - i) for i in range(6)]
+        self.feed(monitor, powers)
+        times, values = monitor.snapshot()
+        np.testing.assert_allclose(values, powers[2:])
+        self.assertTrue((np.diff(times) >= 0).all())
+        timestamp, latest = monitor.latest()
+        self.assertEqual(timestamp, times[-1])
+        np.testing.assert_allclose(latest, powers[-1])
+        np.testing.assert_allclose(monitor.snapshot(samples=2)[1], powers[-2:])
+        self.assertEqual(len(monitor.snapshot(seconds=0)[0]), 1)
+        monitor.clear()
+        self.assertEqual(monitor.stats()["count"], 0)
+
+    def test_frame_read_in_one_query(self):
+        monitor = PowerMonitor(self.opms)
+        resource = self.opms[0].session.resource
+        with mock.patch.object(resource, 'query', wraps=resource.query) as query:
+            monitor.sample()
+        self.assertEqual(query.call_count, 1)
+        self.assertEqual(query.call_args[0][0].upper().count('FETC'), 2)
+
+    def test_background_thread(self):
+        with PowerMonitor(self.opms, rate=200, size=100) as monitor:
+            deadline = time.monotonic() + 5
+            while monitor.stats()["count"] < 3 and time.monotonic() < deadline:
+                time.sleep(0.01)
+            self.assertTrue(monitor.is_running())
+        self.assertFalse(monitor.is_running())
+        self.assertGreaterEqual(monitor.stats()["count"], 3)
+        self.assertEqual(monitor.errors, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
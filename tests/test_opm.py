@@ -0,0 +1,54 @@
+import unittest
+import numpy as np
+from .. import simulator
+from ..models.N7744A import ModelN7744A
+from ..models.AQ2200_215 import ModelAQ2200_215
+
+
+class TestReadAllPowers(unittest.TestCase):
+
+    def tearDown(self):
+        simulator.reset()
+
+    def test_n77xx_all_slots(self):
+        device = simulator.get_device('SIM::N7744A::1')
+        device.configure(noise=0)
+        device.input_power.update({1: -1.0, 2: -2.0, 3: -3.0, 4: -4.0})
+        opm = ModelN7744A('SIM::N7744A::1', 1)
+        self.addCleanup(opm.close)
+        timestamp, values = opm.read_all_powers()
+        np.testing.assert_allclose(values, [-1.0, -2.0, -3.0, -4.0])
+        timestamp, values = opm.read_all_powers([3, 1])
+        np.testing.assert_allclose(values, [-3.0, -1.0])
+        timestamp, values = opm.read_all_powers([(2, 1)])
+        np.testing.assert_allclose(values, [-2.0])
+        with self.assertRaises(ValueError):
+            opm.read_all_powers([(2, 2)])
+
+    def test_aq2200_channels(self):
+        device = simulator.get_device('SIM::AQ2211::1')
+        device.configure(noise=0)
+        device.input_power.update({(1, 1): -1.0, (2, 2): -2.0})
+        opm = ModelAQ2200_215('SIM::AQ2211::1', 1)
+        self.addCleanup(opm.close)
+        timestamp, values = opm.read_all_powers([1, (2, 2)])
+        np.testing.assert_allclose(values, [-1.0, -2.0])
+        with self.assertRaises(ValueError):
+            opm.read_all_powers([])
+
+    def test_aq2200_opened_channels(self):
+        device = simulator.get_device('SIM::AQ2211::1')
+        device.configure(noise=0)
+        device.input_power.update({(1, 1): -1.0, (3, 1): -3.0})
+        opm3 = ModelAQ2200_215('SIM::AQ2211::1', 3)
+        opm1 = ModelAQ2200_215('SIM::AQ2211::1', 1)
+        self.addCleanup(opm1.close)
+        timestamp, values = opm1.read_all_powers()
+        np.testing.assert_allclose(values, [-1.0, -3.0])
+        opm3.close()
+        timestamp, values = opm1.read_all_powers()
+        np.testing.assert_allclose(values, [-1.0])
+
+
+if __name__ == '__main__':
+    unittest.main()
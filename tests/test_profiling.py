@@ -0,0 +1,57 @@
+import unittest
+from .. import profiling
+from ..models.N7744A import ModelN7744A
+from ..models.AQ2200_311A import ModelAQ2200_311A
+
+
+class TestCallingMethod(unittest.TestCase):
+
+    def setUp(self):
+        profiling.enable(reset_stats=True)
+
+    def tearDown(self):
+        profiling.disable()
+        profiling.reset()
+
+    def methods(self):
+        return {i["method"] for i in profiling.report()}
+
+    def test_method(self):
+        opm = ModelN7744A('SIM::N7744A::1', 1)
+        try:
+            opm.get_power_value()
+        finally:
+            opm.close()
+        self.assertEqual(self.methods(), {'get_power_value'})
+
+    def test_decorated_method(self):
+        opm = ModelN7744A('SIM::N7744A::1', 1)
+        try:
+            opm.enable_state_cache()
+            opm.set_wavelength(1550)
+        finally:
+            opm.close()
+        self.assertEqual(self.methods(), {'set_wavelength'})
+
+    def test_stacked_decorators(self):
+        voa = ModelAQ2200_311A('SIM::AQ2211::1', 1)
+        try:
+            voa.set_att(3)
+        finally:
+            voa.close()
+        self.assertEqual(self.methods(), {'set_att'})
+
+    def test_sleep_transport(self):
+        opm = ModelN7744A('SIM::N7744A::1', 1)
+        try:
+            opm.get_power_value()
+            profiling.sleep(opm, 0)
+        finally:
+            opm.close()
+        transports = {i["kind"]: i["transport"] for i in profiling.report()}
+        self.assertEqual(transports['sleep'], 'sleep')
+        self.assertNotEqual(transports['query'], 'sleep')
+
+
+if __name__ == '__main__':
+    unittest.main()
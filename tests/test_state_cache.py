@@ -0,0 +1,171 @@
+import time
+import unittest
+from unittest import mock
+from .. import simulator
+from ..models.N7744A import ModelN7744A
+from ..models.N7764A import ModelN7764A
+from ..models.AQ2200_215 import ModelAQ2200_215
+from ..models.OTF970 import ModelOTF970
+
+
+class CacheTestCase(unittest.TestCase):
+    """
+    Count the commands received by the simulated device of an instrument.
+    """
+    resource_name = None
+
+    def setUp(self):
+        self.device = simulator.get_device(self.resource_name)
+        self.cmds = []
+        handle = self.device.handle
+
+        def counted_handle(cmd):
+            self.cmds.append(cmd.strip().lstrip(':').upper())
+            return handle(cmd)
+        patcher = mock.patch.object(self.device, 'handle', counted_handle)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        simulator.reset()
+
+    def count(self, prefix):
+        return len([cmd for cmd in self.cmds if cmd.startswith(prefix.upper())])
+
+
+class TestOPMCache(CacheTestCase):
+    resource_name = 'SIM::N7744A::1'
+
+    def setUp(self):
+        super(TestOPMCache, self).setUp()
+        self.opm = ModelN7744A(self.resource_name, 1)
+        self.addCleanup(self.opm.close)
+
+    def test_disabled(self):
+        self.opm.set_wavelength(1550)
+        self.opm.set_wavelength(1550)
+        self.assertEqual(self.count('SENS1:POW:WAV '), 2)
+        self.assertIsNone(self.opm.get_state_cache_info())
+
+    def test_setter_skip(self):
+        self.opm.enable_state_cache()
+        self.opm.set_wavelength(1550)
+        self.opm.set_wavelength(1550)
+        self.assertEqual(self.count('SENS1:POW:WAV '), 1)
+        self.assertEqual(self.opm.get_wavelength(), 1550)
+        self.assertEqual(self.count('SENS1:POW:WAV?'), 0)
+        self.opm.set_wavelength(1310)
+        self.assertEqual(self.count('SENS1:POW:WAV '), 2)
+        info = self.opm.get_state_cache_info()
+        self.assertEqual((info['hits'], info['misses']), (2, 2))
+
+    def test_invalidate(self):
+        self.opm.enable_state_cache()
+        self.opm.set_wavelength(1550)
+        self.opm.invalidate('wavelength')
+        self.opm.set_wavelength(1550)
+        self.assertEqual(self.count('SENS1:POW:WAV '), 2)
+        self.opm.invalidate()
+        self.assertEqual(self.opm.get_state_cache_info()['keys'], [])
+
+    def test_ttl(self):
+        self.opm.enable_state_cache(ttl=0.05)
+        self.opm.set_wavelength(1550)
+        self.opm.get_wavelength()
+        self.assertEqual(self.count('SENS1:POW:WAV?'), 0)
+        time.sleep(0.1)
+        self.opm.get_wavelength()
+        self.assertEqual(self.count('SENS1:POW:WAV?'), 1)
+
+    def test_getter_cached(self):
+        self.opm.enable_state_cache()
+        unit = self.opm.get_power_unit()
+        self.assertEqual(self.opm.get_power_unit(), unit)
+        self.assertEqual(self.count('SENS1:POW:UNIT?'), 1)
+
+    def test_cached_none(self):
+        self.opm.enable_state_cache()
+        self.opm._set_cached_state('power_unit', None)
+        value, unit = self.opm.get_power()
+        self.assertIsNone(unit)
+        self.assertEqual(self.count('SENS1:POW:UNIT?'), 0)
+        self.assertEqual(self.opm.get_state_cache_info()['hits'], 1)
+
+
+class TestNormalize(CacheTestCase):
+    resource_name = 'SIM::AQ2211::1'
+
+    def test_normalize(self):
+        opm = ModelAQ2200_215(self.resource_name, 1)
+        self.addCleanup(opm.close)
+        opm.enable_state_cache()
+        opm.set_wavelength(1550.01)
+        opm.set_wavelength(1549.98)
+        self.assertEqual(self.count('SENS1:CHAN1:POW:WAV '), 1)
+        self.assertEqual(opm.get_wavelength(), 1550.0)
+        opm.set_wavelength(1550.06)
+        self.assertEqual(self.count('SENS1:CHAN1:POW:WAV '), 2)
+
+
+class TestInvalidates(CacheTestCase):
+    resource_name = 'SIM::N7764A::1'
+
+    def test_offset_invalidates_att(self):
+        voa = ModelN7764A(self.resource_name, 1)
+        self.addCleanup(voa.close)
+        voa.enable_state_cache()
+        voa.set_att(3)
+        voa.set_offset(1)
+        self.assertNotIn('att', voa.get_state_cache_info()['keys'])
+        voa.set_att(3)
+        self.assertEqual(self.count('INP1:ATT '), 2)
+
+
+class TestOTFInvalidates(CacheTestCase):
+    resource_name = 'SIM::OTF970::1'
+
+    def test_wavelength_frequency(self):
+        otf = ModelOTF970(self.resource_name)
+        self.addCleanup(otf.close)
+        otf.enable_state_cache()
+        # ranges queried at init
+        del self.cmds[:]
+        otf.set_wavelength(1550)
+        frequency = otf.get_frequency()
+        self.assertEqual(self.count('FREQ?'), 1)
+        otf.set_wavelength(1551)
+        self.assertNotEqual(otf.get_frequency(), frequency)
+        self.assertEqual(self.count('FREQ?'), 2)
+        otf.set_frequency(193.5)
+        otf.get_wavelength()
+        self.assertEqual(self.count('WAV?'), 1)
+        otf.get_frequency()
+        self.assertEqual(self.count('FREQ?'), 2)
+
+    def test_peak_search(self):
+        otf = ModelOTF970(self.resource_name)
+        self.addCleanup(otf.close)
+        otf.enable_state_cache()
+        self.device.signal_wavelength = 1552.0
+        otf.set_wavelength(1550)
+        otf.peak_search(1552, 2)
+        self.assertAlmostEqual(otf.get_wavelength(), 1552.0)
+        # the filter is moved back although 1550 was the last value set
+        otf.set_wavelength(1550)
+        self.assertEqual(self.count('WAV '), 2)
+        self.assertAlmostEqual(otf.get_wavelength(), 1550.0)
+
+    def test_wavelength_offset(self):
+        otf = ModelOTF970(self.resource_name)
+        self.addCleanup(otf.close)
+        otf.enable_state_cache()
+        otf.set_wavelength(1550)
+        otf.get_frequency()
+        otf.set_wavelength_offset(0.1)
+        self.assertEqual(otf.get_state_cache_info()['keys'], [])
+        otf.set_wavelength(1550)
+        self.assertEqual(self.count('WAV '), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
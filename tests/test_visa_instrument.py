@@ -0,0 +1,157 @@
+import threading
+import unittest
+from unittest import mock
+import pyvisa
+from .. import simulator
+from ..models import _VisaInstrument
+from ..models._VisaInstrument import VisaSession, join_commands, split_reply
+from ..models.N7744A import ModelN7744A
+
+
+class TestSession(unittest.TestCase):
+
+    def tearDown(self):
+        simulator.reset()
+
+    def test_shared_and_ref_counted(self):
+        opm1 = ModelN7744A('SIM::N7744A::1', 1)
+        opm2 = ModelN7744A('SIM::N7744A::1', 2)
+        session = opm1.session
+        self.assertIs(opm2.session, session)
+        self.assertEqual(session.ref_count, 2)
+        opm1.close()
+        self.assertEqual(session.ref_count, 1)
+        self.assertIs(VisaSession.get_opened('SIM::N7744A::1'), session)
+        opm2.query('*IDN?')
+        opm2.close()
+        self.assertIsNone(VisaSession.get_opened('SIM::N7744A::1'))
+        with self.assertRaises(pyvisa.VisaIOError):
+            session.resource.query('*IDN?')
+
+    def test_different_options(self):
+        session = VisaSession.acquire('SIM::N7744A::1', timeout=2000)
+        try:
+            with self.assertRaises(ValueError):
+                VisaSession.acquire('SIM::N7744A::1', timeout=5000)
+            self.assertEqual(session.ref_count, 1)
+        finally:
+            session.release()
+
+    def test_open_outside_registry_lock(self):
+        opening = threading.Event()
+        proceed = threading.Event()
+        open_resource = _VisaInstrument.open_resource
+
+        def slow_open(resource_name, **options):
+            if resource_name == 'SIM::N7744A::SLOW':
+                opening.set()
+                proceed.wait(5)
+            return open_resource(resource_name, **options)
+
+        results = []
+        with mock.patch.object(_VisaInstrument, 'open_resource', slow_open):
+            threads = [threading.Thread(target=lambda: results.append(VisaSession.acquire('SIM::N7744A::SLOW')))
+                       for _ in range(2)]
+            threads[0].start()
+            self.assertTrue(opening.wait(5))
+            threads[1].start()
+            # another resource is opened while the slow one is still opening
+            session = VisaSession.acquire('SIM::N7744A::2')
+            session.release()
+            proceed.set()
+            for t in threads:
+                t.join(5)
+        self.assertEqual(len(results), 2)
+        self.assertIs(results[0], results[1])
+        self.assertEqual(results[0].ref_count, 2)
+        for session in results:
+            session.release()
+        self.assertIsNone(VisaSession.get_opened('SIM::N7744A::SLOW'))
+
+    def test_failed_open(self):
+        with self.assertRaises(ValueError):
+            VisaSession.acquire('SIM::NO_MODEL::1')
+        self.assertIsNone(VisaSession.get_opened('SIM::NO_MODEL::1'))
+
+
+class TestBatch(unittest.TestCase):
+
+    def setUp(self):
+        self.opm = ModelN7744A('SIM::N7744A::1', 1)
+
+    def tearDown(self):
+        self.opm.close()
+        simulator.reset()
+
+    def test_join_commands(self):
+        self.assertEqual(join_commands(['SENS1:POW:WAV 1550NM', '*OPC?', ':READ1:POW?']),
+                         ':SENS1:POW:WAV 1550NM;*OPC?;:READ1:POW?')
+
+    def test_split_reply(self):
+        self.assertEqual(split_reply('1;"a;b";+1.0E-3', 3), ['1', '"a;b"', '+1.0E-3'])
+        self.assertEqual(split_reply('a;b', 1), ['a;b'])
+        with self.assertRaises(ValueError):
+            split_reply('1;2', 3)
+
+    def test_batch_replies(self):
+        device = simulator.get_device('SIM::N7744A::1')
+        with self.opm.batch() as batch:
+            futures = [batch.query('*IDN?'), batch.query('*OPC?')]
+            self.assertFalse(futures[0].done())
+        self.assertEqual(futures[0].result(), self.opm.query('*IDN?'))
+        self.assertEqual(futures[1].result().strip(), '1')
+        self.assertIsNotNone(device)
+
+    def test_compound_query(self):
+        replies = self.opm.compound_query('*IDN?', '*OPC?')
+        self.assertEqual(replies, [self.opm.query('*IDN?'), self.opm.query('*OPC?')])
+
+    def test_batch_discarded_on_error(self):
+        with self.assertRaises(RuntimeError):
+            with self.opm.batch() as batch:
+                future = batch.query('*IDN?')
+                raise RuntimeError
+        self.assertTrue(future.cancelled())
+        self.assertIsNone(self.opm.session.batch)
+
+
+class TestWriteQuery(unittest.TestCase):
+
+    def setUp(self):
+        self.opm1 = ModelN7744A('SIM::N7744A::1', 1)
+        self.opm2 = ModelN7744A('SIM::N7744A::1', 2)
+
+    def tearDown(self):
+        self.opm1.close()
+        self.opm2.close()
+        simulator.reset()
+
+    def test_lock_held_until_read(self):
+        lock = self.opm1.session.lock
+        self.opm1.write_query('*IDN?')
+        self.assertTrue(self.opm1.session.pending_reply)
+        acquired = []
+        t = threading.Thread(target=lambda: acquired.append(lock.acquire(timeout=0.05)))
+        t.start()
+        t.join()
+        self.assertEqual(acquired, [False])
+        idn = self.opm1.read()
+        self.assertFalse(self.opm1.session.pending_reply)
+        t = threading.Thread(target=lambda: acquired.append(self.opm2.query('*IDN?')))
+        t.start()
+        t.join(5)
+        self.assertEqual(acquired[-1], idn)
+
+    def test_lock_released_by_failed_read(self):
+        self.opm1.write_query('*CLS')
+        with self.assertRaises(pyvisa.VisaIOError):
+            self.opm1.read()
+        self.assertFalse(self.opm1.session.pending_reply)
+        t = threading.Thread(target=self.opm2.query, args=('*IDN?',))
+        t.start()
+        t.join(5)
+        self.assertFalse(t.is_alive())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,51 @@
+import unittest
+import numpy as np
+from ..models.WaveAnalyzer1500S import decode_scan_data
+
+
+class TestDecodeScanData(unittest.TestCase):
+
+    def assertSpectrum(self, result, freq, power):
+        np.testing.assert_allclose(result[0], freq)
+        np.testing.assert_allclose(result[1], power)
+
+    def test_text_with_header(self):
+        content = b'WaveAnalyzer scan\r\nfreq power\r\n193000000 -10000\r\n193000100 -12500\r\n'
+        self.assertSpectrum(decode_scan_data(content), [193.0, 193.0001], [-10.0, -12.5])
+
+    def test_separators(self):
+        content = '193000000,-10000;193000100 ,\t-12500\n'
+        self.assertSpectrum(decode_scan_data(content), [193.0, 193.0001], [-10.0, -12.5])
+
+    def test_descending_frequency(self):
+        content = b'193000100 -12500\n193000000 -10000\n'
+        self.assertSpectrum(decode_scan_data(content), [193.0, 193.0001], [-10.0, -12.5])
+
+    def test_json(self):
+        expected = ([193.0, 193.0001], [-10.0, -12.5])
+        self.assertSpectrum(decode_scan_data(b'{"frequency": [193000000, 193000100], "power": [-10000, -12500]}'),
+                            *expected)
+        self.assertSpectrum(decode_scan_data(b'{"freq": [193000000, 193000100], "power": [-10000, -12500]}'),
+                            *expected)
+        self.assertSpectrum(decode_scan_data(b'[[193000000, -10000], [193000100, -12500]]'), *expected)
+        with self.assertRaises(ValueError):
+            decode_scan_data(b'{"x": [1], "y": [2]}')
+
+    def test_empty(self):
+        freq, power = decode_scan_data(b'header only\n')
+        self.assertEqual(freq.size, 0)
+        self.assertEqual(power.size, 0)
+
+    def test_bad_token(self):
+        for content in (b'193000000 -10000\n193000100 x\n', b'193000000 -10000\n193000100 -12500abc\n',
+                        b'193000000 -10000\nnan? -1\n'):
+            with self.assertRaises(ValueError):
+                decode_scan_data(content)
+
+    def test_odd_values(self):
+        with self.assertRaises(ValueError):
+            decode_scan_data(b'193000000 -10000\n193000100\n')
+
+
+if __name__ == '__main__':
+    unittest.main()
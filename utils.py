@@ -2,40 +2,63 @@ import math
 from .constants import LIGHT_SPEED
 
 
+def _as_array(value, name):
+    """
+    Convert a sequence or numpy array to float numpy array, numpy is imported at the first call.
+    """
+    if isinstance(value, (str, bytes)) or value is None:
+        raise TypeError('%s should be a number (int or float), a sequence of numbers or a numpy array.' % name)
+    import numpy as np
+    try:
+        return np.asarray(value, dtype=float)
+    except (TypeError, ValueError):
+        raise TypeError('%s should be a number (int or float), a sequence of numbers or a numpy array.' % name)
+
+
 def w_to_dbm(value):
     """
     Convert optical power in watt to optical power in dbm
-    :param value: (float|int) optical power in watt.
-    :return: (float) optical power in dbm
+    :param value: (float|int|sequence|numpy.ndarray) optical power in watt.
+    :return: (float|numpy.ndarray) optical power in dbm, numpy.ndarray if value is not a number
     """
-    if not isinstance(value, (float, int)):
-        raise TypeError('value of optical power in watt should be a number (int or float).')
-    if value < 0:
+    if isinstance(value, (float, int)):
+        if value < 0:
+            raise ValueError('value of optical power in watt should >= 0')
+        dbm_value = 10*math.log(value*1000, 10)
+        dbm_value = float(dbm_value)
+        return dbm_value
+    import numpy as np
+    values = _as_array(value, 'value of optical power in watt')
+    if (values < 0).any():
         raise ValueError('value of optical power in watt should >= 0')
-    dbm_value = 10*math.log(value*1000, 10)
-    dbm_value = float(dbm_value)
-    return dbm_value
+    with np.errstate(divide='ignore'):
+        return 10*np.log10(values*1000)
 
 
 def dbm_to_w(value):
     """
     Convert optical power in dbm to power in watt
-    :param value: (float|int) optical power in dbm
-    :return: (float) optical power in watt
+    :param value: (float|int|sequence|numpy.ndarray) optical power in dbm
+    :return: (float|numpy.ndarray) optical power in watt, numpy.ndarray if value is not a number
     """
-    if not isinstance(value, (float, int)):
-        raise TypeError('value of optical power in watt should be a number (int or float).')
-    w_value = (10**(value/10))/1000
-    w_value = float(w_value)
-    return w_value
+    if isinstance(value, (float, int)):
+        w_value = (10**(value/10))/1000
+        w_value = float(w_value)
+        return w_value
+    return 10**(_as_array(value, 'value of optical power in dbm')/10)/1000
 
 
 def bw_in_nm_to_ghz(bw_in_nm, center_wl):
     """
     bw_in_nm: nm
     center_wl: nm
+    Both can be numbers, sequences or numpy arrays (broadcast), numpy.ndarray is returned if any of them is not a
+    number.
     """
     C = LIGHT_SPEED
+    if not (isinstance(bw_in_nm, (float, int)) and isinstance(center_wl, (float, int))):
+        bw_in_nm = _as_array(bw_in_nm, 'bw_in_nm')
+        center_wl = _as_array(center_wl, 'center_wl')
     bw_in_ghz = 1000 * (C/(center_wl-bw_in_nm/2) - C/(center_wl+bw_in_nm/2))
     return bw_in_ghz
 
@@ -44,24 +67,46 @@ def bw_in_ghz_to_nm(bw_in_ghz, center_freq):
     """
     bw_in_ghz: GHz
     center_freq: THz
+    Both can be numbers, sequences or numpy arrays (broadcast), numpy.ndarray is returned if any of them is not a
+    number.
     """
     C = LIGHT_SPEED
+    if not (isinstance(bw_in_ghz, (float, int)) and isinstance(center_freq, (float, int))):
+        bw_in_ghz = _as_array(bw_in_ghz, 'bw_in_ghz')
+        center_freq = _as_array(center_freq, 'center_freq')
     bw_in_nm = C/(center_freq-bw_in_ghz/2000) - C/(center_freq+bw_in_ghz/2000)
     return bw_in_nm
 
 
+# (lower limit of absolute value, prefix, exponent), see format_unit
+_PREFIXES = ((1, '', 0), (1e-3, 'm', 3), (1e-6, 'u', 6), (1e-9, 'n', 9))
+
+
 def format_unit(value, precision):
     """
     Format base unit to readable styles, suchas: 0.034 -> (34, 'm'), 2.3e-10 -> (230, 'p')
     m: 1E-3; u: 1E-6; n: 1E-9; p: 1E-12
-    :param value: (float|int) initial value in base unit
+    An array shares one prefix, selected by its maximum absolute value (nan is ignored), such as
+    [0.034, 0.0005] -> ([34, 0.5], 'm').
+    :param value: (float|int|sequence|numpy.ndarray) initial value in base unit
     :param precision: (int) decimal digits
-    :return: (tuple) (float:value, str:prefix)
+    :return: (tuple) (float|numpy.ndarray:value, str:prefix)
     """
-    if not isinstance(value, (float, int)):
-        raise TypeError('value should be a number (int or float).')
     if not isinstance(precision, int):
         raise TypeError('precision should be a int')
+    if not isinstance(value, (float, int)):
+        import numpy as np
+        values = _as_array(value, 'value')
+        finite = np.abs(values[np.isfinite(values)])
+        abs_max = finite.max() if finite.size else 0.0
+        for limit, prefix, exponent in _PREFIXES:
+            if abs_max >= limit:
+                break
+        else:
+            prefix, exponent = 'p', 12
+        if not exponent:
+            return values, prefix
+        return np.round(values*10**exponent, precision), prefix
     abs_value = abs(value)
     if abs_value < 1e-9:
         value = value*10**12